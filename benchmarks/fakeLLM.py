@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Union
+
+import requests
+from openai import OpenAI
+
+from scrapper.htmlReducer import estimate_tokens
+
+PAGE_PATTERN = re.compile(r'<page id="(\d+)" url="([^"]*)">\n(.*?)\n</page>', re.S)
+# "Jane Doe - BCBA" lines (optionally a markdown heading), as the site server writes them.
+MEMBER_PATTERN = re.compile(r"^(?:#+\s*)?([A-Z][a-z]+(?: [A-Z][\w'-]+){1,3}) - (.+)$", re.M)
+URL_PATTERN = re.compile(r"https?://[^\s\"'<>)\]]+")
+
+
+def read_members(text: str) -> list[dict]:
+    """
+    Returns the "Name - Position" lines of a page as team members.
+    """
+    members: dict[str, dict] = {}
+    for name, position in MEMBER_PATTERN.findall(text):
+        members.setdefault(name, {"name": name, "position": position.strip()})
+    return list(members.values())
+
+
+def answer(system: str, user: str) -> dict:
+    """
+    Deterministic answer to an extraction prompt.
+
+    Batched requests (tagged pages) get one entry per page, link prompts get
+    the URLs in the content and every other prompt gets the team members.
+    """
+    pages = PAGE_PATTERN.findall(user)
+    if pages:
+        return {
+            "pages": [
+                {"id": page_id, "team_members": read_members(text)} for page_id, _, text in pages
+            ]
+        }
+    if "links" in system.lower():
+        return {"content": list(dict.fromkeys(URL_PATTERN.findall(user)))}
+    return {"team_members": read_members(user)}
+
+
+class FakeLLMServer:
+    """
+    OpenAI-compatible chat completions endpoint with a configurable latency.
+
+    Each request sleeps `latency` seconds plus `latency_per_1k` seconds per
+    thousand estimated prompt tokens, then answers deterministically (see
+    `answer`). Requests are served concurrently, like the real API.
+    """
+
+    def __init__(
+        self, latency: float = 0.2, latency_per_1k: float = 0.0, host: str = "127.0.0.1", port: int = 0
+    ) -> None:
+        """
+        :param latency: Fixed seconds per request.
+        :param latency_per_1k: Additional seconds per 1000 prompt tokens.
+        :param host: Interface to listen on.
+        :param port: Port to listen on (0 picks a free one).
+        """
+        self.latency: float = latency
+        self.latency_per_1k: float = latency_per_1k
+        self.requests: int = 0
+        self.prompt_tokens: int = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                payload = json.dumps(server.complete(body)).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        """
+        Returns the API base URL to use as OPENAI_BASE_URL.
+        """
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def complete(self, body: dict) -> dict:
+        """
+        Answers one chat completion request.
+        """
+        messages = body.get("messages", [])
+        system = "\n".join(m["content"] for m in messages if m["role"] == "system")
+        user = "\n".join(m["content"] for m in messages if m["role"] != "system")
+        tokens = estimate_tokens(system + user)
+        with self._lock:
+            self.requests += 1
+            self.prompt_tokens += tokens
+        time.sleep(self.latency + self.latency_per_1k * tokens / 1000)
+        return {
+            "id": f"chatcmpl-{self.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": json.dumps(answer(system, user))},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {"prompt_tokens": tokens, "completion_tokens": 1, "total_tokens": tokens + 1},
+        }
+
+    def start(self) -> "FakeLLMServer":
+        """
+        Starts serving in a background thread.
+        """
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        """
+        Stops the server and releases its port.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+_client: Optional[OpenAI] = None
+_client_lock = threading.Lock()
+
+
+def fake_client() -> OpenAI:
+    """
+    Returns the OpenAI client (on OPENAI_BASE_URL) shared by the fake graphs.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = OpenAI(
+                api_key=os.getenv("OPENAI_API_KEY") or "benchmark",
+                base_url=os.getenv("OPENAI_BASE_URL"),
+                max_retries=0,
+            )
+        return _client
+
+
+class FakeSmartScraperGraph:
+    """
+    Stand-in for ScrapeGraphAI's SmartScraperGraph in benchmarks.
+
+    Sends one chat completion per source to the OPENAI_BASE_URL endpoint (the
+    FakeLLMServer), so benchmarks measure the pipeline around the graphs
+    rather than ScrapeGraphAI's own parsing and tokenizer downloads. URL
+    sources are loaded over HTTP first, as the graph would.
+    """
+
+    def __init__(self, prompt: str, source: Union[str, list[str]], config: Optional[dict] = None) -> None:
+        self.prompt: str = prompt
+        self.source: Union[str, list[str]] = source
+        self.config: dict = config or {}
+
+    def ask(self, source: str) -> dict:
+        """
+        Sends one source to the LLM and returns the parsed answer.
+        """
+        if source.startswith(("http://", "https://")) and "\n" not in source:
+            source = requests.get(source, timeout=20).text
+        response = fake_client().chat.completions.create(
+            model=self.config.get("llm", {}).get("model", "fake"),
+            response_format={"type": "json_object"},
+            messages=[
+                {"role": "system", "content": self.prompt},
+                {"role": "user", "content": source},
+            ],
+        )
+        return json.loads(response.choices[0].message.content or "{}")
+
+    def run(self) -> dict:
+        return self.ask(self.source)
+
+
+class FakeSmartScraperMultiGraph(FakeSmartScraperGraph):
+    """
+    Stand-in for SmartScraperMultiGraph: one request per source, answers merged.
+    """
+
+    def run(self) -> dict:
+        sources = self.source if isinstance(self.source, list) else [self.source]
+        members: list[dict] = []
+        for source in sources:
+            members.extend(self.ask(source).get("team_members", []))
+        return {"team_members": members}
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark of the command line.
+
+Imports a module (by default `main`) in fresh interpreters, optionally runs
+one of its commands, and reports the import wall time and which heavy
+dependencies got loaded. Selenium, ScrapeGraphAI (with LangChain), OpenAI,
+pyarrow, tqdm and requests/lxml each take from tens of milliseconds to
+seconds to import, so the CLI only loads them in the commands that use them.
+
+Usage:
+    python -m benchmarks.importTime
+    python -m benchmarks.importTime --module scrapper.TeamExtractor --runs 5
+    python -m benchmarks.importTime --command consolidate
+    python -m benchmarks.importTime --budget 0.5   # exits 1 over budget or on heavy imports
+"""
+
+import argparse
+import json
+import pathlib
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Optional, Union
+
+REPO_ROOT: pathlib.Path = pathlib.Path(__file__).resolve().parents[1]
+
+# Top-level packages that are slow to import (or pull in slow ones)
+HEAVY_MODULES: tuple = (
+    "langchain",
+    "langchain_core",
+    "lxml",
+    "openai",
+    "pyarrow",
+    "requests",
+    "scrapegraphai",
+    "selenium",
+    "tqdm",
+)
+
+# Runs in the child: times the import, optionally runs main(argv), reports sys.modules.
+PROBE: str = """
+import contextlib, io, json, sys, time
+sys.path.insert(0, {root!r})
+started = time.perf_counter()
+import {module} as module
+seconds = time.perf_counter() - started
+argv = {argv!r}
+if argv is not None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        module.main(argv)
+print(json.dumps({{"seconds": seconds, "modules": sorted(sys.modules)}}))
+"""
+
+
+def probe(
+    module: str = "main",
+    argv: Optional[list[str]] = None,
+    cwd: Optional[Union[str, pathlib.Path]] = None,
+) -> dict:
+    """
+    Imports `module` once in a fresh interpreter.
+
+    :param module: Module to import.
+    :param argv: If given, `module.main(argv)` runs after the import.
+    :param cwd: Working directory of the child (a temporary one if omitted).
+    :return: Dict with the import seconds and the heavy packages loaded.
+    """
+    with tempfile.TemporaryDirectory(prefix="aba-import-") as workdir:
+        completed = subprocess.run(
+            [sys.executable, "-c", PROBE.format(root=str(REPO_ROOT), module=module, argv=argv)],
+            cwd=str(cwd or workdir),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    loaded = {name.partition(".")[0] for name in result["modules"]}
+    return {
+        "seconds": result["seconds"],
+        "heavy": sorted(name for name in HEAVY_MODULES if name in loaded),
+    }
+
+
+def measure(
+    module: str = "main",
+    runs: int = 3,
+    argv: Optional[list[str]] = None,
+    cwd: Optional[Union[str, pathlib.Path]] = None,
+) -> dict:
+    """
+    Imports `module` in `runs` fresh interpreters.
+
+    :param module: Module to import.
+    :param runs: Number of interpreters.
+    :param argv: If given, `module.main(argv)` runs after each import.
+    :param cwd: Working directory of the children (a temporary one each if omitted).
+    :return: Dict with module, command, min and median import seconds and the
+             heavy packages loaded by any run.
+    """
+    results = [probe(module, argv, cwd) for _ in range(max(1, runs))]
+    seconds = [result["seconds"] for result in results]
+    return {
+        "module": module,
+        "command": argv,
+        "min": round(min(seconds), 4),
+        "median": round(statistics.median(seconds), 4),
+        "heavy": sorted({name for result in results for name in result["heavy"]}),
+    }
+
+
+def format_report(report: dict) -> str:
+    """
+    Renders a report as text.
+    """
+    target = report["module"]
+    if report["command"] is not None:
+        target += f" ({' '.join(report['command']) or 'run'})"
+    heavy = ", ".join(report["heavy"]) or "none"
+    return (
+        f"import {target}: min {report['min'] * 1000:.0f} ms, "
+        f"median {report['median'] * 1000:.0f} ms; heavy modules loaded: {heavy}"
+    )
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the import time of the CLI.")
+    parser.add_argument("--module", default="main", help="module to import")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to time")
+    parser.add_argument("--command", nargs="*", help="also run main() with these arguments")
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--budget", type=float, help="seconds; exit 1 above it or on heavy imports")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    report = measure(args.module, args.runs, args.command)
+    print(format_report(report))
+    if args.json:
+        pathlib.Path(args.json).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.budget is not None:
+        regressions: list[str] = []
+        if report["min"] > args.budget:
+            regressions.append(f"import took {report['min']:.3f}s (budget {args.budget:.3f}s)")
+        if report["heavy"]:
+            regressions.append(f"heavy modules loaded: {', '.join(report['heavy'])}")
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
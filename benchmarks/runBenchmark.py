@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark of the scraping pipeline.
+
+Runs `main.main()` (directory listing, team page discovery, extraction and
+consolidation) against a local SiteServer and a FakeLLMServer, in a fresh
+process and working directory, and reports throughput, per-stage latency
+percentiles, LLM usage, peak RSS and how many of the expected team members
+were found.
+
+Usage:
+    python -m benchmarks.runBenchmark --providers 500 --llm-latency 0.3
+    python -m benchmarks.runBenchmark --json report.json
+    python -m benchmarks.runBenchmark --compare report.json   # exits 1 on regressions
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import math
+import os
+import pathlib
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Callable, Optional
+
+from benchmarks.fakeLLM import FakeLLMServer
+from benchmarks.siteServer import SiteServer, SyntheticDirectory
+
+REPO_ROOT: pathlib.Path = pathlib.Path(__file__).resolve().parents[1]
+
+# Timed pipeline calls: (module, class, method, stage name).
+STAGES: tuple = (
+    ("scrapper.fetchBackend", "HttpFetchBackend", "scrape_listing", "listing"),
+    ("scrapper.ABATherapyScraper", "ABATherapyScraper", "get_company_pages", "discovery"),
+    ("scrapper.fetchBackend", "HttpFetchBackend", "fetch", "fetch"),
+    ("scrapper.TeamExtractor", "TeamExtractor", "plan_site", "plan"),
+    ("scrapper.batchExtractor", "BatchExtractor", "complete", "batch request"),
+    ("scrapper.TeamExtractor", "TeamExtractor", "extract_members", "extract"),
+    ("scrapper.TeamExtractor", "TeamExtractor", "run_graph", "graph request"),
+    ("scrapper.consolidation", "Consolidator", "build", "consolidate"),
+)
+
+# Stage changes below this many seconds are treated as noise by --compare.
+MIN_REGRESSION_SECONDS: float = 0.01
+
+
+def percentile(values: list[float], q: float) -> float:
+    """
+    Nearest-rank percentile of `values` (0 for an empty list).
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+class StageTimer:
+    """
+    Records how long every call of the instrumented methods takes.
+    """
+
+    def __init__(self) -> None:
+        self.calls: dict[str, list[tuple[float, float]]] = {}
+        self._lock = threading.Lock()
+
+    def wrap(self, owner: Any, name: str, stage: str) -> None:
+        """
+        Replaces `owner.name` with a timed version recorded under `stage`.
+        """
+        original: Callable = getattr(owner, name)
+        timer = self
+
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                with timer._lock:
+                    timer.calls.setdefault(stage, []).append((started, time.perf_counter()))
+
+        setattr(owner, name, timed)
+
+    def summary(self) -> dict[str, dict]:
+        """
+        Returns count, total, p50, p95 and max seconds per stage, and its span
+        (first call start to last call end).
+        """
+        stages: dict[str, dict] = {}
+        for stage, calls in self.calls.items():
+            durations = [end - start for start, end in calls]
+            stages[stage] = {
+                "count": len(calls),
+                "total": round(sum(durations), 4),
+                "p50": round(percentile(durations, 50), 4),
+                "p95": round(percentile(durations, 95), 4),
+                "max": round(max(durations), 4),
+                "span": round(max(e for _, e in calls) - min(s for s, _ in calls), 4),
+            }
+        return stages
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Peak resident set size of this process in MB (None where unsupported).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_pipeline(settings: dict) -> dict:
+    """
+    Runs `main.main()` once; meant to run in a fresh process.
+
+    :param settings: directory_url, llm_url, workdir and the env overrides in "env".
+    :return: Wall time, per-stage timings, output rows and peak RSS.
+    """
+    sys.path.insert(0, str(REPO_ROOT))
+    for name in ("WORK_QUEUE", "LLM_CACHE_BYPASS"):
+        os.environ.pop(name, None)
+    os.environ.update(settings["env"])
+    os.environ["OPENAI_BASE_URL"] = settings["llm_url"]
+    os.environ["OPENAI_API_KEY"] = "benchmark"
+    workdir = pathlib.Path(settings["workdir"])
+    workdir.mkdir(parents=True, exist_ok=True)
+    os.chdir(workdir)
+
+    import importlib
+
+    import main
+    from benchmarks.fakeLLM import FakeSmartScraperGraph, FakeSmartScraperMultiGraph
+    from scrapper import ABATherapyScraper, TeamExtractor
+
+    ABATherapyScraper.ABATherapyScraper.BASE_URL = settings["directory_url"]
+    TeamExtractor.SmartScraperGraph = FakeSmartScraperGraph
+    TeamExtractor.SmartScraperMultiGraph = FakeSmartScraperMultiGraph
+    timer = StageTimer()
+    for module, cls, method, stage in STAGES:
+        timer.wrap(getattr(importlib.import_module(module), cls), method, stage)
+
+    started = time.perf_counter()
+    with open(workdir / "run.log", "w", encoding="utf-8") as log:
+        with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+            main.main([])
+    seconds = time.perf_counter() - started
+
+    with open(workdir / "data" / "final_team_members.csv", encoding="utf-8", newline="") as f:
+        rows = max(0, sum(1 for _ in csv.reader(f)) - 1)
+    return {
+        "seconds": round(seconds, 3),
+        "stages": timer.summary(),
+        "rows": rows,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_benchmark(
+    directory: SyntheticDirectory,
+    llm_latency: float = 0.2,
+    llm_latency_per_1k: float = 0.0,
+    env: Optional[dict] = None,
+    recorded: Optional[str] = None,
+    workdir: Optional[str] = None,
+) -> dict:
+    """
+    Serves `directory`, runs the pipeline against it in a child process and
+    builds the report.
+
+    :param directory: The synthetic directory to serve.
+    :param llm_latency: Fake LLM seconds per request.
+    :param llm_latency_per_1k: Fake LLM seconds per 1000 prompt tokens.
+    :param env: Pipeline settings, e.g. {"EXTRACT_CONCURRENCY": "16"}.
+    :param recorded: Optional folder of recorded pages served ahead of the synthetic ones.
+    :param workdir: Working directory of the run (a temporary one if omitted).
+    :return: The report dict.
+    """
+    with contextlib.ExitStack() as stack:
+        sites = stack.enter_context(SiteServer(directory, recorded=recorded))
+        llm = stack.enter_context(FakeLLMServer(llm_latency, llm_latency_per_1k))
+        if workdir is None:
+            workdir = stack.enter_context(tempfile.TemporaryDirectory(prefix="aba-bench-"))
+        settings = {
+            "directory_url": sites.directory_url,
+            "llm_url": llm.base_url,
+            "workdir": workdir,
+            "env": {k: str(v) for k, v in (env or {}).items()},
+        }
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+            result = executor.submit(run_pipeline, settings).result()
+        expected = directory.expected_rows()
+        return {
+            "config": {
+                "providers": len(directory.providers),
+                "sites": len(directory.sites),
+                "llm_latency": llm_latency,
+                "llm_latency_per_1k": llm_latency_per_1k,
+                **settings["env"],
+            },
+            "seconds": result["seconds"],
+            "throughput": {
+                "providers_per_second": round(len(directory.providers) / result["seconds"], 2),
+                "sites_per_second": round(len(directory.sites) / result["seconds"], 2),
+            },
+            "stages": result["stages"],
+            "llm": {"requests": llm.requests, "prompt_tokens": llm.prompt_tokens},
+            "http_requests": sites.requests,
+            "rows": result["rows"],
+            "expected_rows": expected,
+            "recall": round(result["rows"] / expected, 3) if expected else 1.0,
+            "peak_rss_mb": result["peak_rss_mb"],
+        }
+
+
+def format_report(report: dict) -> str:
+    """
+    Renders a report as a plain text table.
+    """
+    lines = [
+        f"{report['config']['providers']} providers / {report['config']['sites']} sites "
+        f"in {report['seconds']:.2f}s "
+        f"({report['throughput']['providers_per_second']} providers/s, "
+        f"{report['throughput']['sites_per_second']} sites/s)",
+        f"LLM: {report['llm']['requests']} requests, ~{report['llm']['prompt_tokens']} prompt tokens; "
+        f"{report['http_requests']} site requests",
+        f"Output: {report['rows']}/{report['expected_rows']} rows (recall {report['recall']}); "
+        f"peak RSS {report['peak_rss_mb']} MB",
+        "",
+        f"{'stage':<14}{'count':>7}{'p50':>9}{'p95':>9}{'max':>9}{'total':>10}{'span':>9}",
+    ]
+    for stage, s in report["stages"].items():
+        lines.append(
+            f"{stage:<14}{s['count']:>7}{s['p50']:>9.3f}{s['p95']:>9.3f}"
+            f"{s['max']:>9.3f}{s['total']:>10.2f}{s['span']:>9.2f}"
+        )
+    return "\n".join(lines)
+
+
+def compare(report: dict, baseline: dict, tolerance: float = 0.2) -> list[str]:
+    """
+    Lists the regressions of `report` against a baseline report.
+
+    :param tolerance: Allowed relative slowdown (0.2 = 20%).
+    :return: One message per regression (empty when there are none).
+    """
+    regressions: list[str] = []
+
+    def slower(label: str, now: float, before: float) -> None:
+        if now > before * (1 + tolerance) and now - before > MIN_REGRESSION_SECONDS:
+            regressions.append(f"{label}: {before:.3f}s -> {now:.3f}s")
+
+    slower("total", report["seconds"], baseline["seconds"])
+    for stage, before in baseline["stages"].items():
+        now = report["stages"].get(stage)
+        if now is not None:
+            slower(f"{stage} p95", now["p95"], before["p95"])
+    if report["llm"]["requests"] > baseline["llm"]["requests"] * (1 + tolerance):
+        regressions.append(
+            f"LLM requests: {baseline['llm']['requests']} -> {report['llm']['requests']}"
+        )
+    if report["recall"] < baseline["recall"]:
+        regressions.append(f"recall: {baseline['recall']} -> {report['recall']}")
+    return regressions
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline end to end.")
+    parser.add_argument("--providers", type=int, default=200, help="directory entries")
+    parser.add_argument("--clinics-per-site", type=int, default=2, help="clinics sharing a site, at most")
+    parser.add_argument("--per-page", type=int, default=12, help="entries per listing page")
+    parser.add_argument("--structured-share", type=float, default=0.3, help="share of card team pages")
+    parser.add_argument("--long-share", type=float, default=0.1, help="share of long team pages")
+    parser.add_argument("--seed", type=int, default=7, help="seed of the synthetic directory")
+    parser.add_argument("--recorded", help="folder of recorded pages served ahead of synthetic ones")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="fake LLM seconds per request")
+    parser.add_argument(
+        "--llm-latency-per-1k", type=float, default=0.0, help="fake LLM seconds per 1000 prompt tokens"
+    )
+    parser.add_argument("--concurrency", type=int, help="EXTRACT_CONCURRENCY of the run")
+    parser.add_argument("--batch-tokens", type=int, help="BATCH_TOKENS of the run (0 disables batching)")
+    parser.add_argument("--workdir", help="keep the run's data/ and run.log in this folder")
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--compare", help="baseline report; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    directory = SyntheticDirectory(
+        providers=args.providers,
+        clinics_per_site=args.clinics_per_site,
+        per_page=args.per_page,
+        structured_share=args.structured_share,
+        long_share=args.long_share,
+        seed=args.seed,
+    )
+    env: dict = {}
+    if args.concurrency is not None:
+        env["EXTRACT_CONCURRENCY"] = args.concurrency
+    if args.batch_tokens is not None:
+        env["BATCH_TOKENS"] = args.batch_tokens
+    report = run_benchmark(
+        directory,
+        llm_latency=args.llm_latency,
+        llm_latency_per_1k=args.llm_latency_per_1k,
+        env=env,
+        recorded=args.recorded,
+        workdir=args.workdir,
+    )
+    print(format_report(report))
+    if args.json:
+        pathlib.Path(args.json).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.compare:
+        baseline = json.loads(pathlib.Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
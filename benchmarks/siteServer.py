@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+import pathlib
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Union
+
+FIRST_NAMES: tuple = (
+    "Amelia", "Benjamin", "Chloe", "Daniel", "Emma", "Felix", "Grace", "Henry",
+    "Isabel", "Jacob", "Karen", "Lucas", "Maria", "Nathan", "Olivia", "Peter",
+    "Quinn", "Rachel", "Samuel", "Teresa", "Victor", "Wendy", "Xavier", "Yvonne",
+)
+LAST_NAMES: tuple = (
+    "Anderson", "Brooks", "Carter", "Diaz", "Evans", "Foster", "Garcia", "Hughes",
+    "Ingram", "Jensen", "Keller", "Lopez", "Morgan", "Nguyen", "Ortiz", "Parker",
+    "Reyes", "Sullivan", "Turner", "Vargas", "Walker", "Young", "Zimmerman",
+)
+POSITIONS: tuple = (
+    "BCBA", "Clinical Director", "RBT", "Executive Director", "Office Manager",
+    "BCaBA", "Intake Coordinator", "Lead Behavior Technician", "Founder and CEO",
+)
+CITIES: tuple = (
+    "Austin, Texas", "Dallas, Texas", "Denver, Colorado", "Phoenix, Arizona",
+    "Atlanta, Georgia", "Raleigh, North Carolina", "Tampa, Florida",
+)
+BIO: str = (
+    "{first} joined our clinic after years of supporting children and families with "
+    "applied behavior analysis. {first} designs individualized programs, trains our "
+    "technicians and works closely with parents so that progress carries over to "
+    "home, school and the community."
+)
+
+# Markup of a team page: server-rendered cards (parsed without the LLM), short
+# paragraphs (batched LLM requests) or long biographies (per-site extraction).
+LAYOUT_CARDS: str = "cards"
+LAYOUT_TEXT: str = "text"
+LAYOUT_LONG: str = "long"
+
+
+def page_shell(title: str, nav: str, main: str) -> str:
+    """
+    Wraps page content in the header, navigation and footer every page shares.
+    """
+    return (
+        f"<!DOCTYPE html><html><head><title>{title}</title>"
+        "<script>window.dataLayer = window.dataLayer || [];</script></head><body>"
+        f"<header><nav>{nav}</nav></header><main>{main}</main>"
+        "<footer><p>Copyright 2024. All rights reserved.</p>"
+        "<p>Privacy Policy | Terms of Use</p></footer></body></html>"
+    )
+
+
+class SyntheticDirectory:
+    """
+    A deterministic ABA therapy directory and the provider websites it links to.
+
+    Providers are grouped into websites (several clinics may share one site).
+    Every website has a homepage linking to an "Our Team" page whose layout
+    decides which extraction path it takes. The generated members are known,
+    so a benchmark can check what the pipeline found against them.
+    """
+
+    def __init__(
+        self,
+        providers: int = 200,
+        clinics_per_site: int = 2,
+        per_page: int = 12,
+        members: tuple[int, int] = (3, 8),
+        structured_share: float = 0.3,
+        long_share: float = 0.1,
+        seed: int = 7,
+    ) -> None:
+        """
+        :param providers: Number of directory entries (clinics).
+        :param clinics_per_site: Clinics sharing one website, at most.
+        :param per_page: Entries per directory listing page.
+        :param members: Inclusive range of team members per website.
+        :param structured_share: Share of websites whose team page uses cards.
+        :param long_share: Share of websites whose team page has long biographies.
+        :param seed: Random seed; the same seed always yields the same directory.
+        """
+        self.per_page: int = max(1, per_page)
+        rng = random.Random(seed)
+        self.sites: list[dict] = []
+        self.providers: list[dict] = []
+        while len(self.providers) < providers:
+            index = len(self.sites)
+            draw = rng.random()
+            layout = (
+                LAYOUT_CARDS if draw < structured_share
+                else LAYOUT_LONG if draw < structured_share + long_share
+                else LAYOUT_TEXT
+            )
+            people: dict[str, str] = {}
+            for _ in range(rng.randint(*members)):
+                name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+                people.setdefault(name, rng.choice(POSITIONS))
+            site = {"slug": f"site-{index:05d}", "layout": layout, "members": people}
+            self.sites.append(site)
+            clinics = min(rng.randint(1, max(1, clinics_per_site)), providers - len(self.providers))
+            for clinic in range(clinics):
+                self.providers.append(
+                    {
+                        "slug": f"provider-{len(self.providers):05d}",
+                        "site": index,
+                        "name": f"Bright Steps ABA {index} - Clinic {clinic + 1}",
+                        "city": rng.choice(CITIES),
+                    }
+                )
+
+    def expected_rows(self) -> int:
+        """
+        Rows the consolidated output should hold: each site's members once per clinic.
+        """
+        clinics: dict[int, int] = {}
+        for provider in self.providers:
+            clinics[provider["site"]] = clinics.get(provider["site"], 0) + 1
+        return sum(len(self.sites[i]["members"]) * n for i, n in clinics.items())
+
+    def listing_page(self, base: str, number: int) -> str:
+        """
+        Renders directory listing page `number` (1-based).
+        """
+        start = (number - 1) * self.per_page
+        entries = self.providers[start : start + self.per_page]
+        if not entries:
+            return page_shell(
+                "ABA Therapy Directory", "",
+                '<div class="dp-dfg-no-results">No results found.</div>',
+            )
+        articles = "".join(
+            f'<article><h3 class="entry-title"><a href="{base}/aba-therapy/{p["slug"]}/">'
+            f'{p["name"]}</a></h3><div class="city-state">{p["city"]}</div></article>'
+            for p in entries
+        )
+        return page_shell(
+            "ABA Therapy Directory", "", f'<div class="dp-dfg-items">{articles}</div>'
+        )
+
+    def provider_page(self, base: str, slug: str) -> Optional[str]:
+        """
+        Renders a provider detail page with the provider website in its contact details.
+        """
+        provider = next((p for p in self.providers if p["slug"] == slug), None)
+        if provider is None:
+            return None
+        website = f'{base}/{self.sites[provider["site"]]["slug"]}/'
+        return (
+            '<html><body><div id="main-content"><div><div><div><div></div><div></div><div>'
+            "<div><div></div><div></div><div><div><div></div><div>"
+            f"<div> {website} </div>"
+            "</div></div></div></div></div></div></div></div></div></body></html>"
+        )
+
+    def site_page(self, base: str, slug: str, page: str) -> Optional[str]:
+        """
+        Renders the homepage, team page or a filler page of a provider website.
+        """
+        site = next((s for s in self.sites if s["slug"] == slug), None)
+        if site is None:
+            return None
+        root = f"{base}/{slug}"
+        nav = (
+            f'<a href="{root}/">Home</a><a href="{root}/about-us/">About Us</a>'
+            f'<a href="{root}/our-team/">Our Team</a><a href="{root}/services/">Services</a>'
+            f'<a href="{root}/contact/">Contact</a>'
+        )
+        if page == "our-team":
+            return page_shell("Our Team", nav, self.team_markup(site))
+        if page in ("", "about-us", "services", "contact"):
+            return page_shell(
+                slug, nav,
+                "<h1>Applied Behavior Analysis for every family</h1>"
+                "<p>We provide in-home, clinic and school based ABA therapy.</p>",
+            )
+        return None
+
+    @staticmethod
+    def team_markup(site: dict) -> str:
+        """
+        Renders the team roster of a site in its layout.
+        """
+        people = site["members"].items()
+        if site["layout"] == LAYOUT_CARDS:
+            cards = "".join(
+                f'<div class="team-card"><img src="/img/{i}.jpg" alt="">'
+                f'<h3>{name}</h3><p class="title">{position}</p></div>'
+                for i, (name, position) in enumerate(people)
+            )
+            return f'<h1>Meet Our Team</h1><div class="team-grid">{cards}</div>'
+        repeat = 12 if site["layout"] == LAYOUT_LONG else 1
+        entries = "".join(
+            f"<p>{name} - {position}</p>"
+            + f"<p>{' '.join([BIO.format(first=name.split()[0])] * repeat)}</p>"
+            for name, position in people
+        )
+        return f"<h1>Our Team</h1><div>{entries}</div>"
+
+
+class SiteServer:
+    """
+    Local HTTP server for the benchmark: the directory, provider detail pages
+    and provider websites of a SyntheticDirectory, plus optional recorded pages.
+
+    Recorded pages are files below `recorded`, served at their relative path
+    (`index.html` for directories) ahead of the synthetic pages; "{{BASE}}" in
+    them is replaced by the server's base URL so they can link to each other.
+    Every request is served on its own thread, like a real site under load.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[SyntheticDirectory] = None,
+        recorded: Optional[Union[str, pathlib.Path]] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """
+        :param directory: The synthetic directory to serve.
+        :param recorded: Optional folder of recorded pages.
+        :param host: Interface to listen on.
+        :param port: Port to listen on (0 picks a free one).
+        """
+        self.directory: SyntheticDirectory = directory or SyntheticDirectory()
+        self.recorded: Optional[pathlib.Path] = pathlib.Path(recorded) if recorded else None
+        self.requests: int = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                with server._lock:
+                    server.requests += 1
+                body = server.render(self.path.split("?")[0])
+                if body is None:
+                    self.send_error(404)
+                    return
+                payload = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        """
+        Returns the server's base URL, e.g. "http://127.0.0.1:8123".
+        """
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def directory_url(self) -> str:
+        """
+        Returns the URL of the first directory listing page.
+        """
+        return f"{self.base_url}/aba-therapy-directory/"
+
+    def read_recorded(self, path: str) -> Optional[str]:
+        """
+        Returns a recorded page for a request path, if there is one.
+        """
+        if self.recorded is None:
+            return None
+        target = (self.recorded / path.lstrip("/")).resolve()
+        if target.is_dir():
+            target = target / "index.html"
+        if not target.is_file() or self.recorded.resolve() not in target.parents:
+            return None
+        return target.read_text(encoding="utf-8").replace("{{BASE}}", self.base_url)
+
+    def render(self, path: str) -> Optional[str]:
+        """
+        Returns the page for a request path, or None for a 404.
+        """
+        recorded = self.read_recorded(path)
+        if recorded is not None:
+            return recorded
+        parts = [p for p in path.split("/") if p]
+        base = self.base_url
+        if parts[:1] == ["aba-therapy-directory"]:
+            if len(parts) == 1:
+                return self.directory.listing_page(base, 1)
+            if len(parts) == 3 and parts[1] == "page" and parts[2].isdigit():
+                return self.directory.listing_page(base, int(parts[2]))
+            return None
+        if len(parts) == 2 and parts[0] == "aba-therapy":
+            return self.directory.provider_page(base, parts[1])
+        if 1 <= len(parts) <= 2 and parts[0].startswith("site-"):
+            return self.directory.site_page(base, parts[0], parts[1] if len(parts) == 2 else "")
+        return None
+
+    def start(self) -> "SiteServer":
+        """
+        Starts serving in a background thread.
+        """
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        """
+        Stops the server and releases its port.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "SiteServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -7,36 +7,117 @@ This script orchestrates the extraction of team member information from ABA ther
 Workflow:
  1. Load or generate a list of provider contacts (Name, URL, Location).
  2. Discover company "team" pages for each provider.
- 3. Extract team member details (Name, Position, Location) from each team page.
+ 3. Extract team member details (Name, Position, Location) once per unique website.
  4. Consolidate all team members into a final CSV output.
+ 5. Link the rows of each person (clinics and name variants) to a stable person ID.
 
-Dependencies:
+Steps 1-3 run as one streaming pipeline (scrapper.pipeline.StreamingPipeline):
+contacts go to discovery and discovered pages to extraction as soon as they
+are known, with bounded queues between the stages (PIPELINE_QUEUE_SIZE).
+With WORK_QUEUE set, the steps run in phases over the shared queue instead.
+
+Dependencies (imported by the commands that need them):
   - selenium
   - tqdm
-  - scrapper.driverManager.ChromeDriverManager
+  - requests / lxml (HTTP fetch backend)
+  - scrapper.fetchBackend.HttpFetchBackend
+  - scrapper.driverPool.DriverPool
   - scrapper.ABATherapyScraper.ABATherapyScraper
   - scrapper.TeamExtractor.TeamExtractor
 
 Usage:
-  Ensure you have a `data/contacts_list.csv` file or allow the scraper to generate it.
-  Run the script:
-      python scraper_script_with_docs.py
+  Run every step (contacts_list.csv is generated if missing):
+      python main.py [--refresh] [--offline] [--arrow]
+  Or one step at a time:
+      python main.py directory [--offline]            # data/contacts_list.csv
+      python main.py discover [--offline]             # data/pages_list.csv
+      python main.py extract [--refresh] [--offline]  # members into data/results.sqlite
+      python main.py consolidate [--arrow]            # final CSVs, Parquet and Arrow
+  Selenium, ScrapeGraphAI, OpenAI, pyarrow and tqdm are imported by the
+  commands that use them, so e.g. `consolidate` only loads pyarrow.
 
 Outputs:
   - data/pages_list.csv         : Discovered team page URLs.
-  - data/team_members_*.json    : Raw JSON files per page.
+  - data/*_journal.jsonl        : Resumable progress of directory listing and page discovery.
+  - data/results.sqlite         : Contacts, pages, members and per-site status.
+  - data/llm_cache.sqlite       : Cached LLM results (set LLM_CACHE_BYPASS=1 to skip).
+  - data/archive/               : Compressed archive of every fetched page (replayed by --offline).
+  - data/metrics.json / .prom   : Counters, latency histograms, LLM tokens and cost of the run.
+  - data/traces.jsonl           : One span tree per provider, site and stage (appended per run).
   - data/final_team_members.csv : Consolidated team member info.
+  - data/final_team_members.parquet/ : The same rows as Parquet, partitioned by state (needs pyarrow).
+  - data/people.csv             : One row per person with a stable PersonId.
+  - data/person_clinics.csv     : Clinics linked to each PersonId.
 """
 
+from __future__ import annotations
+
+import argparse
 import csv
-import json
+import os
 import pathlib
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Optional, Union
+
+from scrapper.columnarExport import ColumnarExporter, columnar_available
+from scrapper.consolidation import Consolidator
+from scrapper.deduplication import Deduplicator
+from scrapper.discoveryJournal import DiscoveryJournal
+from scrapper.llmCache import LLMCache
+from scrapper.pageArchive import PageArchive
+from scrapper.pipeline import StreamingPipeline
+from scrapper.rateLimiter import RateLimiter
+from scrapper.resultStore import STATUS_DONE, ResultStore
+from scrapper.siteIndex import SiteIndex
+from scrapper.telemetry import Telemetry
+from scrapper.workQueue import (
+    STATUS_DONE as TASK_DONE,
+    STATUS_FAILED as TASK_FAILED,
+    WorkQueue,
+)
 
-from tqdm import tqdm
+if TYPE_CHECKING:
+    # Slow to import (Selenium, requests/lxml, ScrapeGraphAI, OpenAI): the
+    # commands below import them when they need them.
+    from scrapper.ABATherapyScraper import ABATherapyScraper
+    from scrapper.batchExtractor import BatchExtractor
+    from scrapper.driverManager import ChromeDriverManager
+    from scrapper.driverPool import BrowserlessPool, DriverPool
+    from scrapper.fetchBackend import HttpFetchBackend
+    from scrapper.TeamExtractor import TeamExtractor
 
-from scrapper.driverManager import ChromeDriverManager
-from scrapper.ABATherapyScraper import ABATherapyScraper
-from scrapper.TeamExtractor import TeamExtractor
+# Number of headless browsers used in parallel for team page discovery
+DISCOVERY_WORKERS: int = min(8, os.cpu_count() or 1)
+# Recycle each discovery browser after this many contacts
+DISCOVERY_PAGES_PER_DRIVER: int = 50
+# Give up on a contact after this many failed discovery attempts
+DISCOVERY_MAX_ATTEMPTS: int = 3
+# Number of websites whose team members are extracted at the same time
+EXTRACT_CONCURRENCY: int = int(os.getenv("EXTRACT_CONCURRENCY", "8"))
+# OpenAI account limits shared by every extraction (requests / tokens per minute)
+LLM_RPM: int = int(os.getenv("OPENAI_RPM", "500"))
+LLM_TPM: int = int(os.getenv("OPENAI_TPM", "200000"))
+# Token budget of one batched extraction request (0 disables batching)
+BATCH_TOKENS: int = int(os.getenv("BATCH_TOKENS", "12000"))
+# Largest reduced team page that is batched with others
+BATCH_PAGE_TOKENS: int = 1500
+# Shared work queue file: set WORK_QUEUE to let several worker processes or
+# hosts (sharing the file) work on one run; unset runs single-process.
+WORK_QUEUE: Optional[str] = os.getenv("WORK_QUEUE") or None
+# A claimed task returns to the queue if its worker stops heartbeating this long
+QUEUE_LEASE_SECONDS: float = 600
+# Delay before looking again for expired leases while other workers finish
+QUEUE_POLL_SECONDS: float = 5
+# Items waiting in front of each stage of the streaming pipeline (its backpressure bound)
+PIPELINE_QUEUE_SIZE: int = int(os.getenv("PIPELINE_QUEUE_SIZE", "64"))
+TASK_LIST: str = "list"
+TASK_DISCOVER: str = "discover"
+TASK_EXTRACT: str = "extract"
+# Key of the single listing task: one worker scrapes the directory for all of them
+DIRECTORY_TASK: str = "directory"
 
 
 def load_contacts_from_csv(
@@ -65,101 +146,1270 @@ def load_contacts_from_csv(
         for row in reader:
             # Expecting exactly three columns per row
             name, url, location = row
+            if [name, url, location] == ["Name", "Url", "Location"]:
+                # Skip the header written by save_contacts_to_csv
+                continue
             contacts.append(
                 {"Name": name.strip(), "Url": url.strip(), "Location": location.strip()}
             )
     return contacts
 
 
-def main() -> None:
+@contextmanager
+def discovery_pool(offline: bool) -> Iterator[Union[DriverPool, BrowserlessPool]]:
+    """
+    Provide the pool running `func(manager, item)` for team page discovery.
+
+    Online, items are spread over a pool of headless browsers; with
+    `run(func, item, lazy=True)` a browser is only started once `func` asks
+    for one, i.e. when the HTTP backend could not read a page. Offline, pages
+    come from the page archive only, so no browser is started and `func`
+    receives None instead of a driver manager.
+
+    Args:
+        offline (bool): Whether the run replays the page archive.
+
+    Yields:
+        Union[DriverPool, BrowserlessPool]: The pool (`run` one item or `map` many).
+    """
+    from scrapper import driverPool
+
+    pool_class = driverPool.BrowserlessPool if offline else driverPool.DriverPool
+    with pool_class(size=DISCOVERY_WORKERS, max_pages=DISCOVERY_PAGES_PER_DRIVER) as pool:
+        yield pool
+
+
+def batch_extract_sites(
+    team_extractor: TeamExtractor,
+    batch_extractor: BatchExtractor,
+    store: ResultStore,
+    sites: list,
+) -> tuple[list, dict[str, list[str]]]:
+    """
+    Extract sites whose team page is small with batched LLM requests.
+
+    Every site's top team page is fetched and reduced first. Structured team
+    data is stored directly, small pages are packed into shared requests, and
+    all other sites are left for the regular per-site extraction, together
+    with the candidate links found while planning.
+
+    Args:
+        team_extractor (TeamExtractor): Extractor used to find and reduce team pages.
+        batch_extractor (BatchExtractor): Extractor packing pages into one request.
+        store (ResultStore): Store receiving members and per-site status.
+        sites (list): Sites (from a SiteIndex) still to be extracted.
+
+    Returns:
+        tuple: The sites that still need the regular extraction, and their
+        candidate links by site URL (for extract_sites).
+    """
+    from tqdm import tqdm
+
+    def plan(site):
+        try:
+            return team_extractor.plan_site(site.url, BATCH_PAGE_TOKENS)
+        except Exception as e:
+            print(f"Could not plan {site.url}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, EXTRACT_CONCURRENCY)) as executor:
+        plans = list(
+            tqdm(executor.map(plan, sites), total=len(sites), desc="Planning batches", unit="site")
+        )
+
+    remaining: list = []
+    planned: dict[str, list[str]] = {}
+    small_pages: list[dict] = []
+    sites_by_key = {site.key: site for site in sites}
+    for site, site_plan in zip(sites, plans):
+        if site_plan is None:
+            remaining.append(site)
+        elif "members" in site_plan:
+            store.save_site_members(
+                site.key,
+                site.url,
+                site_plan["members"],
+                sources=team_extractor.sources.get(site.url),
+            )
+        elif "link" not in site_plan:
+            remaining.append(site)
+            planned[site.url] = site_plan["links"]
+        else:
+            planned[site.url] = site_plan["links"]
+            small_pages.append({"key": site.key, "url": site_plan["link"], "text": site_plan["text"]})
+
+    results = batch_extractor.extract(small_pages)
+    for page in small_pages:
+        site = sites_by_key[page["key"]]
+        outcome = results[page["key"]]
+        members = [{"Url": site.url, **member} for member in outcome["members"]]
+        if outcome["error"] or not team_extractor.is_roster(members):
+            # Let the regular extraction look at the site's other pages too.
+            remaining.append(site)
+        else:
+            store.save_site_members(site.key, site.url, members, sources=[page["url"]])
+    print(
+        f"Batched {len(small_pages)} small team pages into {batch_extractor.requests} requests; "
+        f"{len(remaining)} sites need per-site extraction."
+    )
+    return remaining, planned
+
+
+async def extract_sites(
+    team_extractor: TeamExtractor,
+    store: ResultStore,
+    sites: list,
+    concurrency: int,
+    planned: Optional[dict[str, list[str]]] = None,
+) -> None:
+    """
+    Extract the team members of many sites concurrently into the result store.
+
+    Each site is saved as soon as its extraction completes, so an interrupted
+    run keeps every finished site.
+
+    Args:
+        team_extractor (TeamExtractor): The extractor (with its shared rate limiter).
+        store (ResultStore): Store receiving members and per-site status.
+        sites (list): Sites (from a SiteIndex) still to be extracted.
+        concurrency (int): Maximum number of sites extracted at the same time.
+        planned (Optional[dict]): Candidate links by site URL, so they are not
+            discovered a second time.
+    """
+    from tqdm import tqdm
+
+    sites_by_url = {site.url: site for site in sites}
+    with tqdm(total=len(sites), desc="Extracting team members", unit="site") as progress:
+        async for outcome in team_extractor.extract_many(sites_by_url, concurrency, planned):
+            site = sites_by_url[outcome["url"]]
+            if outcome["error"]:
+                print(f"Error extracting {site.url}: {outcome['error']}")
+            store.save_site_members(
+                site.key,
+                site.url,
+                outcome["members"],
+                error=outcome["error"],
+                started_at=outcome["started_at"],
+                sources=team_extractor.sources.get(site.url),
+            )
+            progress.update(1)
+
+
+def site_changed(fetch_backend: HttpFetchBackend, store: ResultStore, site) -> bool:
+    """
+    Check whether an extracted site's pages changed since its extraction.
+
+    The homepage and the pages the members came from are re-checked with
+    conditional requests (ETag / Last-Modified) and content fingerprints.
+
+    Args:
+        fetch_backend (HttpFetchBackend): Backend recording page validators.
+        store (ResultStore): Store holding validators and each site's source pages.
+        site (Site): An extracted site (from a SiteIndex).
+
+    Returns:
+        bool: True if the site should be extracted again.
+    """
+    pages = [site.url] + [url for url in store.site_sources(site.key) if url != site.url]
+    # A page that cannot be fetched right now keeps its current results
+    return any(fetch_backend.fetch_if_changed(url) for url in pages)
+
+
+def changed_sites(fetch_backend: HttpFetchBackend, store: ResultStore, sites: list) -> list:
+    """
+    Find the already extracted sites whose pages changed since their extraction.
+
+    Args:
+        fetch_backend (HttpFetchBackend): Backend recording page validators.
+        store (ResultStore): Store holding validators and each site's source pages.
+        sites (list): Extracted sites (from a SiteIndex).
+
+    Returns:
+        list: The sites to extract again.
+    """
+    from tqdm import tqdm
+
+    with ThreadPoolExecutor(max_workers=max(1, EXTRACT_CONCURRENCY)) as executor:
+        checks = executor.map(lambda site: site_changed(fetch_backend, store, site), sites)
+        flags = list(tqdm(checks, total=len(sites), desc="Checking for changes", unit="site"))
+    return [site for site, flag in zip(sites, flags) if flag]
+
+
+def build_pipeline(
+    team_extractor: TeamExtractor,
+    fetch_backend: HttpFetchBackend,
+    store: ResultStore,
+    site_index: SiteIndex,
+    data_dir: pathlib.Path,
+    refresh: bool,
+    telemetry: Telemetry,
+    make_batch_extractor: Optional[Callable[[], BatchExtractor]] = None,
+    discover: Optional[Callable[[dict], dict]] = None,
+    on_page: Optional[Callable[[dict], None]] = None,
+) -> StreamingPipeline:
+    """
+    Build the streaming pipeline turning contacts (or known pages) into stored members.
+
+    Stages, each fed through a bounded queue as soon as the previous one yields:
+      - discover: finds each contact's website (skipped when `discover` is None,
+        i.e. when the pipeline is fed page dicts).
+      - route:    groups pages by site; each new site that still needs extraction
+        (or a change check with --refresh) moves on once.
+      - plan:     reads the site's top team page; structured data is stored directly
+        and small pages go to batching.
+      - batch:    packs small pages into shared LLM requests (flushed at the end).
+      - extract:  runs the per-site extraction for everything else.
+
+    Every site's members are saved as soon as they are known, so the pipeline
+    yields the keys of finished sites.
+
+    Args:
+        team_extractor (TeamExtractor): Extractor planning and extracting sites.
+        fetch_backend (HttpFetchBackend): Backend used for --refresh change checks.
+        store (ResultStore): Store receiving pages, members and per-site status.
+        site_index (SiteIndex): Index filled with every routed page.
+        data_dir (pathlib.Path): Directory holding legacy team_members_*.json files.
+        refresh (bool): Re-extract already extracted sites whose pages changed.
+        telemetry (Telemetry): Receives per-stage item counts.
+        make_batch_extractor (Optional[Callable]): Creates the BatchExtractor on the
+            first small page; None disables batching.
+        discover (Optional[Callable[[dict], dict]]): Turns a contact into its page dict.
+        on_page (Optional[Callable[[dict], None]]): Called with every routed page dict.
+
+    Returns:
+        StreamingPipeline: The pipeline; `run(items)` yields finished site keys.
+    """
+    batch: dict = {"extractor": None, "pages": [], "sites": {}, "links": {}}
+
+    def route(page: dict) -> list:
+        if on_page is not None:
+            on_page(page)
+        store.save_pages([page])
+        key = site_index.add(page)
+        if key is None or len(site_index.sites[key].pages) > 1:
+            return []
+        site = site_index.sites[key]
+        store.import_legacy_json(data_dir, [site])
+        if store.site_status(key) != STATUS_DONE:
+            return [{"site": site}]
+        if refresh:
+            return [{"site": site, "check": True}]
+        return []
+
+    def plan(work: dict) -> list:
+        site = work["site"]
+        if work.get("check") and not site_changed(fetch_backend, store, site):
+            return []
+        if make_batch_extractor is None:
+            return [work]
+        try:
+            site_plan = team_extractor.plan_site(site.url, BATCH_PAGE_TOKENS)
+        except Exception as e:
+            print(f"Could not plan {site.url}: {e}")
+            return [work]
+        if site_plan is None:
+            return [work]
+        if "members" in site_plan:
+            store.save_site_members(
+                site.key,
+                site.url,
+                site_plan["members"],
+                sources=team_extractor.sources.get(site.url),
+            )
+            return [{"site": site, "done": True}]
+        if "link" not in site_plan:
+            return [{"site": site, "links": site_plan["links"]}]
+        page = {"key": site.key, "url": site_plan["link"], "text": site_plan["text"]}
+        return [{"site": site, "page": page, "links": site_plan["links"]}]
+
+    def settle(pages: list[dict]) -> list:
+        results = batch["extractor"].extract(pages)
+        outputs: list = []
+        for page in pages:
+            site = batch["sites"].pop(page["key"])
+            outcome = results[page["key"]]
+            members = [{"Url": site.url, **member} for member in outcome["members"]]
+            if outcome["error"] or not team_extractor.is_roster(members):
+                # Let the regular extraction look at the site's other pages too.
+                outputs.append({"site": site, "links": batch["links"].pop(page["key"])})
+            else:
+                store.save_site_members(site.key, site.url, members, sources=[page["url"]])
+                batch["links"].pop(page["key"])
+                outputs.append({"site": site, "done": True})
+        return outputs
+
+    def collect(work: dict) -> list:
+        if "page" not in work:
+            return [work]
+        if batch["extractor"] is None:
+            batch["extractor"] = make_batch_extractor()
+        batch["sites"][work["site"].key] = work["site"]
+        batch["links"][work["site"].key] = work["links"]
+        batch["pages"].append(work["page"])
+        packed = batch["extractor"].pack(batch["pages"])
+        if len(packed) == 1:
+            return []
+        # Send every full batch; the last one keeps filling up.
+        batch["pages"] = packed[-1]
+        return settle([page for full in packed[:-1] for page in full])
+
+    def flush() -> list:
+        pages, batch["pages"] = batch["pages"], []
+        return settle(pages) if pages else []
+
+    def extract(work: dict) -> list:
+        site = work["site"]
+        if not work.get("done"):
+            started_at = time.time()
+            error: Optional[str] = None
+            members: list[dict] = []
+            try:
+                members = team_extractor.extract_members(site.url, work.get("links"))
+            except Exception as e:
+                error = str(e)
+                print(f"Error extracting {site.url}: {error}")
+            store.save_site_members(
+                site.key,
+                site.url,
+                members,
+                error=error,
+                started_at=started_at,
+                sources=team_extractor.sources.get(site.url),
+            )
+        return [site.key]
+
+    pipeline = StreamingPipeline(on_error=print_stage_error, telemetry=telemetry)
+    if discover is not None:
+        pipeline.stage(
+            "discover", lambda contact: [discover(contact)], DISCOVERY_WORKERS, PIPELINE_QUEUE_SIZE
+        )
+    pipeline.stage("route", route, 1, PIPELINE_QUEUE_SIZE)
+    pipeline.stage("plan", plan, EXTRACT_CONCURRENCY, PIPELINE_QUEUE_SIZE)
+    if make_batch_extractor is not None:
+        pipeline.stage("batch", collect, 1, PIPELINE_QUEUE_SIZE, flush=flush)
+    pipeline.stage("extract", extract, EXTRACT_CONCURRENCY, PIPELINE_QUEUE_SIZE)
+    return pipeline
+
+
+def drain_queue(
+    work_queue: WorkQueue, kind: str, handler: Callable[[list[dict]], None], claim_size: int
+) -> None:
+    """
+    Claim and process tasks of one kind until none are left for any worker.
+
+    While other workers still hold leases, this worker keeps polling so it
+    can take over tasks whose lease expires (e.g. after a worker crashed).
+
+    Args:
+        work_queue (WorkQueue): The shared work queue.
+        kind (str): Task kind to process.
+        handler (Callable): Processes a list of claimed tasks and completes or fails each.
+        claim_size (int): Number of tasks claimed at a time.
+    """
+    while True:
+        tasks = work_queue.claim(kind, claim_size)
+        if not tasks:
+            if work_queue.drained(kind):
+                return
+            time.sleep(QUEUE_POLL_SECONDS)
+            continue
+        with work_queue.keep_alive(kind, [task["key"] for task in tasks]):
+            handler(tasks)
+
+
+@contextmanager
+def open_fetch_backend(
+    data_dir: pathlib.Path, store: ResultStore, telemetry: Telemetry, offline: bool
+) -> Iterator[HttpFetchBackend]:
+    """
+    Provide the HTTP fetch backend shared by every step that reads web pages.
+
+    Pages are fetched over HTTP; a headless browser only starts if a page needs it.
+    ETag, Last-Modified and a content fingerprint of every page are recorded for
+    --refresh, and every page is archived once so later --offline runs can replay it.
+
+    Args:
+        data_dir (pathlib.Path): Directory holding the page archive.
+        store (ResultStore): Store receiving page validators.
+        telemetry (Telemetry): Receives fetch spans and counters.
+        offline (bool): Replay the page archive instead of using the network.
+
+    Yields:
+        HttpFetchBackend: The backend, closed together with its archive afterwards.
+    """
+    from scrapper.fetchBackend import HttpFetchBackend
+
+    page_archive = PageArchive(data_dir / "archive")
+    fetch_backend = HttpFetchBackend(
+        validators=store, archive=page_archive, offline=offline, telemetry=telemetry
+    )
+    try:
+        yield fetch_backend
+    finally:
+        fetch_backend.close()
+        page_archive.close()
+
+
+@contextmanager
+def llm_extraction(
+    data_dir: pathlib.Path, fetch_backend: HttpFetchBackend, telemetry: Telemetry
+) -> Iterator[tuple[TeamExtractor, Callable[[], BatchExtractor]]]:
+    """
+    Provide the team extractor and the batch extractor shared by the run.
+
+    LLM results are reused while the pages they came from are unchanged (set
+    LLM_CACHE_BYPASS=1 to force fresh results), and every LLM call goes through
+    one rate limiter. Batching, rate limiting, cache and HTML reduction
+    statistics are printed at the end.
+
+    Args:
+        data_dir (pathlib.Path): Directory holding the LLM cache.
+        fetch_backend (HttpFetchBackend): Backend reading the team pages.
+        telemetry (Telemetry): Receives LLM spans, tokens and cost.
+
+    Yields:
+        tuple: The TeamExtractor and a callable returning the BatchExtractor
+        (created on first use).
+    """
+    from scrapper.batchExtractor import BatchExtractor
+    from scrapper.TeamExtractor import TeamExtractor
+
+    llm_cache = LLMCache(
+        data_dir / "llm_cache.sqlite", bypass=os.getenv("LLM_CACHE_BYPASS") == "1"
+    )
+    limiter = RateLimiter(rpm=LLM_RPM, tpm=LLM_TPM)
+    team_extractor = TeamExtractor(
+        cache=llm_cache, fetcher=fetch_backend, limiter=limiter, telemetry=telemetry
+    )
+    batch_extractors: list[BatchExtractor] = []
+
+    def make_batch_extractor() -> BatchExtractor:
+        # Small team pages share one LLM request instead of paying for one each
+        if not batch_extractors:
+            batch_extractors.append(
+                BatchExtractor(
+                    max_tokens=BATCH_TOKENS, cache=llm_cache, limiter=limiter, telemetry=telemetry
+                )
+            )
+        return batch_extractors[0]
+
+    try:
+        yield team_extractor, make_batch_extractor
+
+        if batch_extractors:
+            print(f"Batched small team pages into {batch_extractors[0].requests} requests.")
+        print(
+            f"LLM rate limiter: {limiter.waited:.1f}s waited, "
+            f"{limiter.throttled} rate-limit pauses."
+        )
+        cache_stats = llm_cache.stats()
+        print(f"LLM cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses.")
+        reductions = team_extractor.reduction_stats
+        if reductions:
+            before = sum(r["tokens_before"] for r in reductions)
+            after = sum(r["tokens_after"] for r in reductions)
+            print(f"HTML reduction: ~{before} -> ~{after} tokens over {len(reductions)} pages.")
+    finally:
+        llm_cache.close()
+
+
+def list_contacts(
+    scraper: ABATherapyScraper,
+    data_dir: pathlib.Path,
+    store: ResultStore,
+    telemetry: Telemetry,
+    rescrape: bool = False,
+) -> Iterator[dict]:
+    """
+    Yield the provider contacts, saving each one to the result store.
+
+    Contacts come from `contacts_list.csv` if it exists. Otherwise the
+    directory is scraped page by page, replaying the listing pages already
+    journaled by an interrupted run. Each contact is written to
+    `contacts_list.csv.part` as it is yielded, and the file is renamed to the
+    CSV once the listing is complete. The journal is then retired (kept as
+    directory_journal.previous.jsonl) so the next listing reads the directory
+    again; `rescrape` retires a leftover journal up front as well.
+
+    Args:
+        scraper (ABATherapyScraper): Scraper of the directory listing.
+        data_dir (pathlib.Path): Directory holding the contacts CSV and journal.
+        store (ResultStore): Store receiving the contacts.
+        telemetry (Telemetry): Receives the "stage.directory" span.
+        rescrape (bool): Scrape the directory even if the CSV exists.
+
+    Yields:
+        dict: Contacts with 'Name', 'Url' and 'Location' keys.
+    """
+    contacts_csv = data_dir / "contacts_list.csv"
+    with telemetry.span("stage.directory"):
+        if contacts_csv.exists() and not rescrape:
+            for contact in load_contacts_from_csv(contacts_csv):
+                store.save_contacts([contact])
+                yield contact
+            return
+        journal_path = data_dir / "directory_journal.jsonl"
+        retired_path = journal_path.with_suffix(".previous.jsonl")
+        if rescrape and journal_path.exists():
+            journal_path.replace(retired_path)
+        directory_journal = DiscoveryJournal(journal_path)
+        contacts_part = contacts_csv.with_name(contacts_csv.name + ".part")
+        try:
+            with contacts_part.open("w", encoding="utf-8", newline="") as contacts_file:
+                contacts_writer = csv.DictWriter(
+                    contacts_file, fieldnames=["Name", "Url", "Location"]
+                )
+                contacts_writer.writeheader()
+                for contact in scraper.iter_contacts(journal=directory_journal):
+                    store.save_contacts([contact])
+                    contacts_writer.writerow(contact)
+                    yield contact
+        finally:
+            directory_journal.close()
+        contacts_part.replace(contacts_csv)
+        # The listing is complete: a later listing must read the directory again
+        journal_path.replace(retired_path)
+
+
+def read_pages(pages_csv: pathlib.Path) -> Iterator[dict]:
+    """
+    Yield the discovered pages of `pages_list.csv`.
+
+    Args:
+        pages_csv (pathlib.Path): Path to the pages CSV.
+
+    Yields:
+        dict: Pages with 'Name', 'Link', 'Location' and 'Url' keys.
+    """
+    with pages_csv.open("r", encoding="utf-8", newline="") as csv_file:
+        yield from csv.DictReader(csv_file)
+
+
+@contextmanager
+def discovery(
+    data_dir: pathlib.Path,
+    store: ResultStore,
+    telemetry: Telemetry,
+    fetch_backend: HttpFetchBackend,
+    offline: bool,
+) -> Iterator[tuple[Iterator[dict], Callable[[dict], dict], Callable[[dict], None]]]:
+    """
+    Set up team page discovery for the listed contacts.
+
+    Every contact's outcome is journaled as soon as it is known, so a restart
+    skips finished contacts and only retries failed ones. Discovered pages are
+    written next to `pages_list.csv` and renamed to it once every contact is
+    through; browser wait statistics are printed at the end.
+
+    Args:
+        data_dir (pathlib.Path): Directory holding the CSVs and journals.
+        store (ResultStore): Store receiving the contacts.
+        telemetry (Telemetry): Shared by the scrapers.
+        fetch_backend (HttpFetchBackend): Backend tried before a browser.
+        offline (bool): Replay the page archive instead of starting browsers.
+
+    Yields:
+        tuple: The contacts (see list_contacts), a callable turning a contact
+        into its page dict, and a callable recording a discovered page.
+    """
+    from scrapper.ABATherapyScraper import ABATherapyScraper
+    from scrapper.pageReadiness import PageReadiness
+
+    pages_csv = data_dir / "pages_list.csv"
+    # Shared so per-host load times are learned across every browser
+    readiness = PageReadiness()
+    scraper = ABATherapyScraper(backend=fetch_backend, readiness=readiness, telemetry=telemetry)
+    journal = DiscoveryJournal(
+        data_dir / "discovery_journal.jsonl", max_attempts=DISCOVERY_MAX_ATTEMPTS
+    )
+    pages_part = pages_csv.with_name(pages_csv.name + ".part")
+    try:
+        with discovery_pool(offline) as pool, pages_part.open(
+            "w", encoding="utf-8", newline=""
+        ) as pages_file:
+            pages_writer = csv.DictWriter(pages_file, fieldnames=["Name", "Link", "Location", "Url"])
+            pages_writer.writeheader()
+
+            def discover(
+                browser: Optional[Callable[[], ChromeDriverManager]], contact: dict
+            ) -> dict:
+                try:
+                    # HTTP first: a pooled browser is only taken if the backend misses
+                    page_info = ABATherapyScraper(
+                        backend=fetch_backend,
+                        readiness=readiness,
+                        telemetry=telemetry,
+                        driver_provider=browser,
+                    ).get_company_pages(contact)
+                except Exception as e:
+                    journal.record_failure(contact["Url"], str(e))
+                    raise
+                if page_info["Link"]:
+                    journal.record_success(contact["Url"], page_info)
+                else:
+                    journal.record_failure(contact["Url"], "no website found", page_info)
+                return page_info
+
+            def discover_contact(contact: dict) -> dict:
+                if not journal.is_settled(contact["Url"]):
+                    try:
+                        return pool.run(discover, contact, lazy=True)
+                    except Exception as e:
+                        print(f"Could not find the website of {contact['Url']}: {e}")
+                return journal.result(contact["Url"]) or {**contact, "Link": ""}
+
+            yield (
+                list_contacts(scraper, data_dir, store, telemetry),
+                discover_contact,
+                pages_writer.writerow,
+            )
+        pages_part.replace(pages_csv)
+    finally:
+        journal.close()
+        # Quit the Selenium driver of the listing, if one was started
+        scraper.close()
+
+    waits = readiness.summary()
+    if waits["count"]:
+        print(
+            f"Browser waits: {waits['count']} pages, {waits['timeouts']} timeouts, "
+            f"{waits['total_seconds']:.1f}s total, {waits['max_seconds']:.1f}s max"
+        )
+
+
+def print_stage_error(stage: str, item, error: Exception) -> None:
+    print(f"Error in pipeline stage {stage}: {error}")
+
+
+def report_pipeline(pipeline: StreamingPipeline, site_index: SiteIndex) -> None:
+    """
+    Print how the routed pages map to sites and each stage's item counts.
+
+    Args:
+        pipeline (StreamingPipeline): A pipeline that has run.
+        site_index (SiteIndex): The index of every page it saw.
+    """
+    pages = sum(len(site.pages) for site in site_index) + len(site_index.rejected)
+    print(
+        f"{pages} pages map to {len(site_index)} unique sites "
+        f"({len(site_index.rejected)} without a usable link)."
+    )
+    for name, stage in pipeline.stats().items():
+        print(
+            f"Stage {name}: {stage['in']} in, {stage['out']} out, {stage['errors']} errors, "
+            f"queue peak {stage['max_queued']}."
+        )
+
+
+def stream_sites(
+    source: Iterable[dict],
+    team_extractor: TeamExtractor,
+    fetch_backend: HttpFetchBackend,
+    store: ResultStore,
+    data_dir: pathlib.Path,
+    refresh: bool,
+    telemetry: Telemetry,
+    make_batch_extractor: Callable[[], BatchExtractor],
+    discover: Optional[Callable[[dict], dict]] = None,
+    on_page: Optional[Callable[[dict], None]] = None,
+) -> SiteIndex:
+    """
+    Run the streaming pipeline over contacts (with `discover`) or known pages.
+
+    Args:
+        source (Iterable[dict]): Contacts, or page dicts when `discover` is None.
+        team_extractor (TeamExtractor): Extractor planning and extracting sites.
+        fetch_backend (HttpFetchBackend): Backend used for --refresh change checks.
+        store (ResultStore): Store receiving pages, members and per-site status.
+        data_dir (pathlib.Path): Directory holding legacy team_members_*.json files.
+        refresh (bool): Re-extract already extracted sites whose pages changed.
+        telemetry (Telemetry): Receives the "stage.pipeline" span and item counts.
+        make_batch_extractor (Callable): Returns the shared BatchExtractor.
+        discover (Optional[Callable[[dict], dict]]): Turns a contact into its page dict.
+        on_page (Optional[Callable[[dict], None]]): Called with every routed page dict.
+
+    Returns:
+        SiteIndex: The index of every page that went through the pipeline.
+    """
+    from tqdm import tqdm
+
+    site_index = SiteIndex()
+    pipeline = build_pipeline(
+        team_extractor,
+        fetch_backend,
+        store,
+        site_index,
+        data_dir,
+        refresh=refresh,
+        telemetry=telemetry,
+        make_batch_extractor=make_batch_extractor if BATCH_TOKENS else None,
+        discover=discover,
+        on_page=on_page,
+    )
+    with telemetry.span("stage.pipeline"):
+        with tqdm(desc="Extracting team members", unit="site") as progress:
+            for _ in pipeline.run(source):
+                progress.update(1)
+    report_pipeline(pipeline, site_index)
+    return site_index
+
+
+def queue_sites(
+    data_dir: pathlib.Path,
+    store: ResultStore,
+    telemetry: Telemetry,
+    fetch_backend: HttpFetchBackend,
+    team_extractor: TeamExtractor,
+    make_batch_extractor: Callable[[], BatchExtractor],
+    offline: bool,
+    refresh: bool,
+) -> SiteIndex:
+    """
+    Run listing, discovery and extraction in phases over the shared WORK_QUEUE.
+
+    One worker lists the directory while the others wait for its contacts.
+    Extracted members are recorded with each task and copied into every
+    worker's store once the queue is drained, so each worker consolidates all
+    sites even when hosts do not share `data/`.
+
+    Args:
+        data_dir (pathlib.Path): Directory holding the CSVs and journals.
+        store (ResultStore): Store receiving contacts, pages, members and per-site status.
+        telemetry (Telemetry): Receives the stage spans.
+        fetch_backend (HttpFetchBackend): Backend shared by discovery and extraction.
+        team_extractor (TeamExtractor): Extractor of the claimed sites.
+        make_batch_extractor (Callable): Returns the shared BatchExtractor.
+        offline (bool): Replay the page archive instead of starting browsers.
+        refresh (bool): Re-extract already extracted sites whose pages changed.
+
+    Returns:
+        SiteIndex: The index of every discovered page.
+    """
+    import asyncio
+
+    from scrapper.ABATherapyScraper import ABATherapyScraper
+    from scrapper.pageReadiness import PageReadiness
+
+    # Shared so per-host load times are learned across every browser
+    readiness = PageReadiness()
+
+    work_queue = WorkQueue(
+        WORK_QUEUE, lease_seconds=QUEUE_LEASE_SECONDS, max_attempts=DISCOVERY_MAX_ATTEMPTS
+    )
+    print(f"Worker {work_queue.worker_id} joined the queue at {WORK_QUEUE}.")
+
+    # Step 1: Load or generate contacts_list.csv in the one worker claiming the
+    # listing task; its contacts are the task's result for every other worker.
+    def list_task(tasks: list[dict]) -> None:
+        scraper = ABATherapyScraper(
+            backend=fetch_backend, readiness=readiness, telemetry=telemetry
+        )
+        try:
+            listed = list(list_contacts(scraper, data_dir, store, telemetry))
+        except Exception as e:
+            work_queue.fail(TASK_LIST, DIRECTORY_TASK, str(e))
+            return
+        finally:
+            scraper.close()
+        work_queue.complete(TASK_LIST, DIRECTORY_TASK, listed)
+
+    work_queue.enqueue(TASK_LIST, [(DIRECTORY_TASK, {})])
+    drain_queue(work_queue, TASK_LIST, list_task, claim_size=1)
+    contacts: Optional[list[dict]] = work_queue.result(TASK_LIST, DIRECTORY_TASK)
+    if contacts is None:
+        work_queue.close()
+        raise SystemExit("The directory could not be listed: see the listing worker's output.")
+    store.save_contacts(contacts)
+
+    # Step 2: Contacts become discovery tasks in the shared queue; every worker
+    # claims a share of them, and leases of crashed workers are re-queued.
+    work_queue.enqueue(TASK_DISCOVER, ((c["Url"], c) for c in contacts))
+
+    def discover_task(browser: Optional[Callable[[], ChromeDriverManager]], task: dict) -> None:
+        try:
+            # HTTP first: a pooled browser is only taken if the backend misses
+            page_info = ABATherapyScraper(
+                backend=fetch_backend,
+                readiness=readiness,
+                telemetry=telemetry,
+                driver_provider=browser,
+            ).get_company_pages(task["payload"])
+        except Exception as e:
+            work_queue.fail(TASK_DISCOVER, task["key"], str(e))
+            return
+        if page_info["Link"]:
+            work_queue.complete(TASK_DISCOVER, task["key"], page_info)
+        else:
+            work_queue.fail(TASK_DISCOVER, task["key"], "no website found", page_info)
+
+    with telemetry.span("stage.discovery"), discovery_pool(offline) as pool:
+        drain_queue(
+            work_queue,
+            TASK_DISCOVER,
+            lambda tasks: pool.map(discover_task, tasks, lazy=True),
+            claim_size=DISCOVERY_WORKERS * 4,
+        )
+    url_pages = [
+        work_queue.result(TASK_DISCOVER, c["Url"]) or {**c, "Link": ""} for c in contacts
+    ]
+
+    # Step 3: Extract team members once per unique provider website
+    store.save_pages(url_pages)
+    site_index = SiteIndex(url_pages)
+    print(
+        f"{len(url_pages)} pages map to {len(site_index)} unique sites "
+        f"({len(site_index.rejected)} without a usable link)."
+    )
+    imported = store.import_legacy_json(data_dir, site_index)
+    if imported:
+        print(f"Imported {imported} sites from legacy team_members_*.json files.")
+    pending_sites = [site for site in site_index if store.site_status(site.key) != STATUS_DONE]
+    work_queue.enqueue(TASK_EXTRACT, ((site.key, {"url": site.url}) for site in pending_sites))
+    if refresh:
+        done_sites = [site for site in site_index if store.site_status(site.key) == STATUS_DONE]
+        refreshed = changed_sites(fetch_backend, store, done_sites)
+        print(f"Refresh: {len(refreshed)} of {len(done_sites)} extracted sites changed.")
+        # Their extract tasks are done from an earlier run: put them back in the queue
+        work_queue.enqueue(
+            TASK_EXTRACT, ((site.key, {"url": site.url}) for site in refreshed), requeue=True
+        )
+
+    def extract_tasks(tasks: list[dict]) -> None:
+        sites = [site_index.sites[t["key"]] for t in tasks if t["key"] in site_index.sites]
+        planned: dict[str, list[str]] = {}
+        if BATCH_TOKENS and sites:
+            sites, planned = batch_extract_sites(
+                team_extractor, make_batch_extractor(), store, sites
+            )
+        asyncio.run(extract_sites(team_extractor, store, sites, EXTRACT_CONCURRENCY, planned))
+        for task in tasks:
+            info = store.site_info(task["key"]) or {}
+            if info.get("status") == STATUS_DONE:
+                work_queue.complete(
+                    TASK_EXTRACT,
+                    task["key"],
+                    {
+                        "members": store.members(task["key"]),
+                        "sources": store.site_sources(task["key"]),
+                    },
+                )
+            else:
+                work_queue.fail(TASK_EXTRACT, task["key"], info.get("error") or "not extracted")
+
+    with telemetry.span("stage.extraction"):
+        drain_queue(work_queue, TASK_EXTRACT, extract_tasks, claim_size=EXTRACT_CONCURRENCY * 2)
+
+    # Other workers' sites may be missing from this worker's store (when hosts do
+    # not share data/): copy them from the queue before consolidating
+    copied = 0
+    for site in site_index:
+        extracted = work_queue.result(TASK_EXTRACT, site.key)
+        if not isinstance(extracted, dict):
+            continue
+        if store.site_status(site.key) != STATUS_DONE or (
+            store.members(site.key) != extracted["members"]
+        ):
+            store.save_site_members(
+                site.key, site.url, extracted["members"], sources=extracted["sources"]
+            )
+            copied += 1
+    if copied:
+        print(f"Copied the members of {copied} sites extracted by other workers.")
+    for kind in (TASK_DISCOVER, TASK_EXTRACT):
+        counts = work_queue.counts(kind)
+        print(f"Queue {kind}: {counts[TASK_DONE]} done, {counts[TASK_FAILED]} failed.")
+    work_queue.close()
+    return site_index
+
+
+def has_rows(csv_path: pathlib.Path) -> bool:
+    """
+    Tell whether a CSV file exists and has a row after its header.
+    """
+    if not csv_path.exists():
+        return False
+    with csv_path.open("r", encoding="utf-8", newline="") as csv_file:
+        reader = csv.reader(csv_file)
+        next(reader, None)
+        return next(reader, None) is not None
+
+
+def consolidate_outputs(
+    data_dir: pathlib.Path,
+    store: ResultStore,
+    telemetry: Telemetry,
+    site_index: SiteIndex,
+    arrow: bool,
+) -> None:
+    """
+    Write the final outputs from the members in the result store.
+
+    Each site is fanned out to all of its clinics; only sites whose results
+    changed are merged again and every file is replaced atomically. The rows
+    are also exported as Parquet (and Arrow IPC with `arrow`) when pyarrow is
+    installed, and linked to stable person IDs. Nothing is written while the
+    store holds no members but the final CSV already has rows, so an empty
+    store never wipes earlier results.
+
+    Args:
+        data_dir (pathlib.Path): Directory receiving the outputs.
+        store (ResultStore): Store holding members and merged rows.
+        telemetry (Telemetry): Receives the stage spans.
+        site_index (SiteIndex): Index of every discovered page.
+        arrow (bool): Also write data/final_team_members.arrow.
+    """
+    final_csv = data_dir / "final_team_members.csv"
+    if not store.member_total() and has_rows(final_csv):
+        print(f"Not overwriting {final_csv}: the result store holds no team members.")
+        return
+
+    # Step 4: Consolidate team members, fanning each site out to all of its clinics.
+    # Only sites whose results changed are merged again; the CSV is replaced atomically.
+    consolidator = Consolidator(store, final_csv)
+    with telemetry.span("stage.consolidation"):
+        stats = consolidator.build(site_index)
+    if stats["written"]:
+        print(
+            f"Consolidated {stats['sites']} sites ({stats['merged']} re-merged), "
+            f"{stats['rows']} rows written."
+        )
+    else:
+        print("Consolidated output is up to date.")
+
+    # Columnar copies for analytics: Parquet partitioned by state (and an Arrow IPC
+    # file with --arrow), rewritten whenever the CSV is
+    parquet_dir = data_dir / "final_team_members.parquet"
+    arrow_path = data_dir / "final_team_members.arrow"
+    if columnar_available():
+        if stats["written"] or not parquet_dir.exists() or (arrow and not arrow_path.exists()):
+            exporter = ColumnarExporter(store, parquet_dir, arrow_path if arrow else None)
+            with telemetry.span("stage.export"):
+                exported = exporter.export(site_index)
+            print(
+                f"Exported {exported['rows']} rows in {exported['states']} states to Parquet "
+                f"({exported['parquet_bytes'] / 1024:.0f} KiB)."
+            )
+    elif arrow:
+        print("Skipping the Parquet/Arrow export: pyarrow is not installed.")
+
+    # Step 5: Link the rows of the same person (across clinics and name variants)
+    # to one stable person ID
+    deduplicator = Deduplicator(store, data_dir / "people.csv", data_dir / "person_clinics.csv")
+    with telemetry.span("stage.dedupe"):
+        people = deduplicator.build(site_index)
+    print(
+        f"Linked {people['records']} rows to {people['people']} people "
+        f"({people['merged']} name variants merged)."
+    )
+
+
+def run_command(
+    args: argparse.Namespace, data_dir: pathlib.Path, store: ResultStore, telemetry: Telemetry
+) -> None:
+    """
+    Run every step: directory, discovery, extraction and consolidation.
+
+    Steps 1-3 overlap: each listing page's contacts go to discovery and each
+    discovered page to extraction as soon as they are known, through bounded
+    queues, so a slow stage holds the others back instead of piling up work in
+    memory. Known pages (pages_list.csv) go straight to extraction. With
+    WORK_QUEUE set, the steps run in phases over the shared queue instead.
+
+    Args:
+        args (argparse.Namespace): Options (refresh, offline, arrow).
+        data_dir (pathlib.Path): Directory of inputs and outputs.
+        store (ResultStore): The result store.
+        telemetry (Telemetry): The run's telemetry.
+    """
+    pages_csv = data_dir / "pages_list.csv"
+    contacts_csv = data_dir / "contacts_list.csv"
+    with open_fetch_backend(data_dir, store, telemetry, args.offline) as fetch_backend:
+        with llm_extraction(data_dir, fetch_backend, telemetry) as (team_extractor, batching):
+            if WORK_QUEUE:
+                site_index = queue_sites(
+                    data_dir,
+                    store,
+                    telemetry,
+                    fetch_backend,
+                    team_extractor,
+                    batching,
+                    offline=args.offline,
+                    refresh=args.refresh,
+                )
+            elif pages_csv.exists():
+                # Team pages are known: stream them straight into extraction
+                if contacts_csv.exists():
+                    store.save_contacts(load_contacts_from_csv(contacts_csv))
+                site_index = stream_sites(
+                    read_pages(pages_csv),
+                    team_extractor,
+                    fetch_backend,
+                    store,
+                    data_dir,
+                    args.refresh,
+                    telemetry,
+                    batching,
+                )
+            else:
+                with discovery(data_dir, store, telemetry, fetch_backend, args.offline) as (
+                    contacts,
+                    discover,
+                    on_page,
+                ):
+                    site_index = stream_sites(
+                        contacts,
+                        team_extractor,
+                        fetch_backend,
+                        store,
+                        data_dir,
+                        args.refresh,
+                        telemetry,
+                        batching,
+                        discover=discover,
+                        on_page=on_page,
+                    )
+    consolidate_outputs(data_dir, store, telemetry, site_index, args.arrow)
+
+
+def directory_command(
+    args: argparse.Namespace, data_dir: pathlib.Path, store: ResultStore, telemetry: Telemetry
+) -> None:
+    """
+    Step 1 only: scrape the provider directory into contacts_list.csv.
+
+    Listing pages journaled by an earlier (interrupted) listing are replayed.
+
+    Args:
+        args (argparse.Namespace): Options (offline).
+        data_dir (pathlib.Path): Directory of inputs and outputs.
+        store (ResultStore): The result store.
+        telemetry (Telemetry): The run's telemetry.
+    """
+    from scrapper.ABATherapyScraper import ABATherapyScraper
+
+    with open_fetch_backend(data_dir, store, telemetry, args.offline) as fetch_backend:
+        scraper = ABATherapyScraper(backend=fetch_backend, telemetry=telemetry)
+        try:
+            listed = sum(1 for _ in list_contacts(scraper, data_dir, store, telemetry, rescrape=True))
+        finally:
+            scraper.close()
+    print(f"Listed {listed} contacts in {data_dir / 'contacts_list.csv'}.")
+
+
+def discover_command(
+    args: argparse.Namespace, data_dir: pathlib.Path, store: ResultStore, telemetry: Telemetry
+) -> None:
+    """
+    Step 2 only: find the website of every listed contact into pages_list.csv.
+
+    The directory is scraped first if contacts_list.csv is missing; contacts
+    settled by an earlier discovery are taken from its journal.
+
+    Args:
+        args (argparse.Namespace): Options (offline).
+        data_dir (pathlib.Path): Directory of inputs and outputs.
+        store (ResultStore): The result store.
+        telemetry (Telemetry): The run's telemetry.
+    """
+    from tqdm import tqdm
+
+    site_index = SiteIndex()
+    with open_fetch_backend(data_dir, store, telemetry, args.offline) as fetch_backend:
+        with discovery(data_dir, store, telemetry, fetch_backend, args.offline) as (
+            contacts,
+            discover,
+            on_page,
+        ):
+            pipeline = StreamingPipeline(on_error=print_stage_error, telemetry=telemetry)
+            pipeline.stage(
+                "discover", lambda contact: [discover(contact)], DISCOVERY_WORKERS, PIPELINE_QUEUE_SIZE
+            )
+            with telemetry.span("stage.discovery"):
+                with tqdm(desc="Discovering team pages", unit="contact") as progress:
+                    for page in pipeline.run(contacts):
+                        on_page(page)
+                        store.save_pages([page])
+                        site_index.add(page)
+                        progress.update(1)
+    report_pipeline(pipeline, site_index)
+
+
+def extract_command(
+    args: argparse.Namespace, data_dir: pathlib.Path, store: ResultStore, telemetry: Telemetry
+) -> None:
+    """
+    Step 3 only: extract the team members of every site in pages_list.csv.
+
+    Extracted sites are skipped (re-checked for changes with --refresh).
+
+    Args:
+        args (argparse.Namespace): Options (refresh, offline).
+        data_dir (pathlib.Path): Directory of inputs and outputs.
+        store (ResultStore): The result store.
+        telemetry (Telemetry): The run's telemetry.
+
+    Raises:
+        SystemExit: If pages_list.csv does not exist yet.
+    """
+    pages_csv = data_dir / "pages_list.csv"
+    contacts_csv = data_dir / "contacts_list.csv"
+    if not pages_csv.exists():
+        raise SystemExit(f"{pages_csv} not found: run `python main.py discover` first.")
+    if contacts_csv.exists():
+        store.save_contacts(load_contacts_from_csv(contacts_csv))
+    with open_fetch_backend(data_dir, store, telemetry, args.offline) as fetch_backend:
+        with llm_extraction(data_dir, fetch_backend, telemetry) as (team_extractor, batching):
+            stream_sites(
+                read_pages(pages_csv),
+                team_extractor,
+                fetch_backend,
+                store,
+                data_dir,
+                args.refresh,
+                telemetry,
+                batching,
+            )
+
+
+def consolidate_command(
+    args: argparse.Namespace, data_dir: pathlib.Path, store: ResultStore, telemetry: Telemetry
+) -> None:
+    """
+    Steps 4-5 only: rebuild the final outputs from the extracted members.
+
+    Sites come from pages_list.csv (or the pages in the result store), and
+    legacy team_members_*.json files are imported first, so a fresh checkout
+    without results.sqlite rebuilds the same outputs. No page is fetched and
+    no browser, LLM client or progress bar is loaded.
+
+    Args:
+        args (argparse.Namespace): Options (arrow).
+        data_dir (pathlib.Path): Directory of inputs and outputs.
+        store (ResultStore): The result store.
+        telemetry (Telemetry): The run's telemetry.
+    """
+    pages_csv = data_dir / "pages_list.csv"
+    site_index = SiteIndex(read_pages(pages_csv) if pages_csv.exists() else store.load_pages())
+    imported = store.import_legacy_json(data_dir, site_index)
+    if imported:
+        print(f"Imported {imported} sites from legacy team_members_*.json files.")
+    consolidate_outputs(data_dir, store, telemetry, site_index, args.arrow)
+
+
+# Subcommands: (name, handler, help, options). `run` is used when none is given.
+COMMANDS: tuple = (
+    ("run", run_command, "run every step (the default)", ("--refresh", "--offline", "--arrow")),
+    (
+        "directory",
+        directory_command,
+        "scrape the provider directory into data/contacts_list.csv",
+        ("--offline",),
+    ),
+    (
+        "discover",
+        discover_command,
+        "find each contact's team pages into data/pages_list.csv",
+        ("--offline",),
+    ),
+    (
+        "extract",
+        extract_command,
+        "extract the team members of every site in data/pages_list.csv",
+        ("--refresh", "--offline"),
+    ),
+    (
+        "consolidate",
+        consolidate_command,
+        "write the final CSVs (and Parquet/Arrow) from the extracted members",
+        ("--arrow",),
+    ),
+)
+OPTIONS: dict[str, str] = {
+    "--refresh": "re-extract already processed sites whose pages changed since the last run",
+    "--offline": "replay pages from data/archive only, without network access or browsers",
+    "--arrow": "also write data/final_team_members.arrow (Arrow IPC) for zero-copy reads",
+}
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """
+    Parse the command line.
+
+    Without a subcommand (e.g. `main.py --refresh`), `run` is assumed.
+
+    Args:
+        argv (Optional[list[str]]): Arguments (defaults to sys.argv).
+
+    Returns:
+        argparse.Namespace: The parsed options, with the command's `handler`.
+    """
+    argv = list(sys.argv[1:] if argv is None else argv)
+    names = [name for name, *_ in COMMANDS]
+    if not argv or argv[0] not in [*names, "-h", "--help"]:
+        argv.insert(0, "run")
+    parser = argparse.ArgumentParser(
+        description="Scrape ABA therapy providers and extract their team members."
+    )
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    for name, handler, help_text, options in COMMANDS:
+        command = commands.add_parser(name, help=help_text, description=help_text)
+        command.set_defaults(handler=handler)
+        for option in options:
+            command.add_argument(option, action="store_true", help=OPTIONS[option])
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
     """
     Main entry point for team member scraping workflow.
 
-    Workflow steps:
-      1. Initialize Selenium WebDriver (headless by default).
-      2. Load or generate contacts list.
-      3. Discover "team" page URLs for each contact.
-      4. Extract team member data and save interim JSON files.
-      5. Consolidate extracted data into a final CSV.
+    Workflow steps (each also available as a subcommand):
+      1. directory:   Load or generate the contacts list.
+      2. discover:    Discover "team" page URLs for each contact using a pool of browsers.
+      3. extract:     Extract team member data once per unique website into the result store.
+      4. consolidate: Consolidate extracted data into a final CSV, one row per member
+         and clinic, and deduplicate people into people.csv and person_clinics.csv.
+
+    Pages are fetched over HTTP first (Selenium is started lazily as a fallback).
+    With --refresh, extracted sites are re-checked with conditional requests
+    and only those whose pages changed are extracted again. With --offline,
+    pages are replayed from the page archive written by earlier runs.
+
+    Args:
+        argv (Optional[list[str]]): Command line arguments (defaults to sys.argv).
 
     Side effects:
-      - Creates/reads `data/pages_list.csv` and `data/team_members_*.json`.
+      - Creates/reads `data/pages_list.csv` and `data/results.sqlite`.
       - Writes `data/final_team_members.csv` with columns: Url, Name, Title, Company, Location.
     """
+    args = parse_args(argv)
+
     # Ensure data directory exists
     data_dir = pathlib.Path("data")
     data_dir.mkdir(parents=True, exist_ok=True)
 
-    # Initialize browser driver (headless)
-    driver_manager = ChromeDriverManager(headless=True)
-    scraper = ABATherapyScraper(driver_manager)
-    team_extractor = TeamExtractor()
+    # Every stage and external call (HTTP, browser, LLM) is timed; each provider and
+    # site gets a span tree in traces.jsonl, and metrics are exported at the end.
+    telemetry = Telemetry(data_dir / "traces.jsonl")
 
-    # Step 1: Load or generate contacts_list.csv
-    contacts_csv = data_dir / "contacts_list.csv"
+    # Contacts, pages, members, per-site status and page validators live in one SQLite store
+    store = ResultStore(data_dir / "results.sqlite")
     try:
-        scraper.contacts = load_contacts_from_csv(contacts_csv)
-    except FileNotFoundError:
-        scraper.run()
-        scraper.save_contacts_to_csv(str(contacts_csv))
-        scraper.contacts = load_contacts_from_csv(contacts_csv)
-
-    # Step 2: Discover or load team page URLs
-    pages_csv = data_dir / "pages_list.csv"
-    url_pages: list[dict] = []
-    if pages_csv.exists():
-        with pages_csv.open("r", encoding="utf-8", newline="") as csv_file:
-            reader = csv.DictReader(csv_file)
-            for row in reader:
-                url_pages.append(row)
-    else:
-        for contact in tqdm(scraper.contacts, desc="Finding pages", unit="contact"):
-            page_info = scraper.get_company_pages(contact)
-            url_pages.append(page_info)
-        # Persist page list
-        with pages_csv.open("w", encoding="utf-8", newline="") as csv_file:
-            writer = csv.DictWriter(
-                csv_file, fieldnames=["Name", "Link", "Location", "Url"]
-            )
-            writer.writeheader()
-            for page in url_pages:
-                writer.writerow(page)
-
-    # Step 3: Extract team members per page
-    for page in tqdm(url_pages, desc="Extracting team members", unit="page"):
-        # Build a safe filename for JSON output
-        safe_link = page["Link"].replace("/", "_").replace(".", "_")
-        json_path = data_dir / f"team_members_{safe_link}.json"
-        if not json_path.exists():
-            members = team_extractor.extract(page["Link"])
-            with json_path.open("w", encoding="utf-8") as jf:
-                json.dump(members, jf, indent=4)
-
-    # Quit Selenium driver to free resources
-    driver_manager.quit()
-
-    # Step 4: Consolidate all team members into final CSV
-    all_members: list[dict] = []
-    for json_file in data_dir.glob("team_members_*.json"):
-        with json_file.open("r", encoding="utf-8") as jf:
-            all_members.extend(json.load(jf))
+        args.handler(args, data_dir, store, telemetry)
+    finally:
+        store.close()
 
-    final_csv = data_dir / "final_team_members.csv"
-    with final_csv.open("w", encoding="utf-8", newline="") as csv_file:
-        writer = csv.writer(csv_file)
-        writer.writerow(["Url", "Name", "Title", "Company", "Location"])
-        for member in tqdm(all_members, desc="Saving team members", unit="member"):
-            # Map member URL back to company
-            page = next((p for p in url_pages if p["Link"] == member.get("Url")), {})
-            writer.writerow(
-                [
-                    member.get("Url", ""),
-                    member.get("name", ""),
-                    member.get("position", ""),
-                    page.get("Name", ""),
-                    page.get("Location", ""),
-                ]
-            )
+    telemetry.export(data_dir)
+    for name, span_stats in sorted(telemetry.summary().items()):
+        print(
+            f"{name}: {span_stats['count']} x, p50 {span_stats['p50']:.3f}s, "
+            f"p95 {span_stats['p95']:.3f}s, {span_stats['total_seconds']:.1f}s total"
+        )
+    print(
+        f"LLM usage: {telemetry.total('llm_requests_total'):.0f} requests, "
+        f"{telemetry.total('llm_tokens_total'):.0f} tokens, "
+        f"~${telemetry.total('llm_cost_usd_total'):.4f}."
+    )
 
 
 if __name__ == "__main__":
@@ -6,8 +6,7 @@ def main():
     driver_manager = ChromeDriverManager(headless=True)
     # Instantiate the scraper with the driver manager.
     scraper = ABATherapyScraper(driver_manager)
-    scraper.run()
-    scraper.save_contacts_to_csv()
+    scraper.save_contacts_to_csv(contacts=scraper.iter_contacts())
 
 
 if __name__ == "__main__":
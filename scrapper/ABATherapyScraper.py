@@ -1,12 +1,15 @@
 #!/usr/bin/env python3
 import csv
-import re
-import time
 import pathlib
+from typing import Callable, Iterable, Iterator, Optional
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
+from scrapper.discoveryJournal import DiscoveryJournal
 from scrapper.driverManager import ChromeDriverManager
+from scrapper.fetchBackend import CONTACT_DETAILS_XPATH, DASH_PATTERN, HttpFetchBackend
+from scrapper.pageReadiness import PageReadiness
+from scrapper.telemetry import Telemetry
 from selenium.webdriver.remote.webelement import WebElement
 
 class ABATherapyScraper:
@@ -16,22 +19,94 @@ class ABATherapyScraper:
     The scraper navigates through pages of the ABA Therapy Directory and extracts article details
     (Name, URL, and Location) from the contact cards until at least 100 contacts are collected
     or no more results are available.
+
+    When an HttpFetchBackend is supplied, pages are read over plain HTTP and the
+    browser is only started (lazily) for pages the backend cannot parse.
+
+    Listing pages and providers are traced as "listing" and "discover" spans
+    of the attached Telemetry, with browser navigation and waits as children.
     """
 
     BASE_URL: str = "https://www.bhcoe.org/aba-therapy-directory/"
 
-    def __init__(self, driver_manager: ChromeDriverManager) -> None:
+    def __init__(
+        self,
+        driver_manager: Optional[ChromeDriverManager] = None,
+        backend: Optional[HttpFetchBackend] = None,
+        readiness: Optional[PageReadiness] = None,
+        telemetry: Optional[Telemetry] = None,
+        driver_provider: Optional[Callable[[], ChromeDriverManager]] = None,
+    ) -> None:
         """
-        Initializes the scraper with a ChromeDriverManager instance.
-
-        :param driver_manager: An instance of ChromeDriverManager.
+        Initializes the scraper with a ChromeDriverManager and/or a fetch backend.
+
+        :param driver_manager: An instance of ChromeDriverManager. If omitted, a
+                               headless browser is started on first fallback.
+        :param backend: Optional HTTP backend tried before the browser.
+        :param readiness: Optional PageReadiness shared between scrapers so
+                          per-host timeouts are learned across the whole run.
+        :param telemetry: Optional Telemetry shared by the whole run.
+        :param driver_provider: Optional callable returning the browser to use
+                                when the backend cannot read a page (e.g. one
+                                leased from a DriverPool); only called then.
         """
-        self.driver_manager: ChromeDriverManager = driver_manager
-        self.driver: webdriver.Chrome = driver_manager.driver
-        self.wait: WebDriverWait = driver_manager.wait
+        self.driver_manager: Optional[ChromeDriverManager] = None
+        self.driver: Optional[webdriver.Chrome] = None
+        self.wait: Optional[WebDriverWait] = None
+        if driver_manager is not None:
+            self.attach_driver(driver_manager)
+        self.backend: Optional[HttpFetchBackend] = backend
+        self.readiness: PageReadiness = readiness or PageReadiness()
+        self.telemetry: Telemetry = telemetry or Telemetry()
+        self.driver_provider: Optional[Callable[[], ChromeDriverManager]] = driver_provider
         self.contacts: list[dict] = []
         self.page: int = 1
 
+    def attach_driver(self, driver_manager: ChromeDriverManager) -> None:
+        """
+        Binds the scraper to the browser owned by a ChromeDriverManager.
+
+        :param driver_manager: An instance of ChromeDriverManager.
+        """
+        self.driver_manager = driver_manager
+        self.driver = driver_manager.driver
+        self.wait = driver_manager.wait
+
+    def ensure_driver(self) -> None:
+        """
+        Starts a headless browser (with the lean profile) if the scraper does not have one yet,
+        or takes the one from `driver_provider`.
+        """
+        if self.driver is None:
+            if self.driver_provider is not None:
+                self.attach_driver(self.driver_provider())
+            else:
+                self.attach_driver(ChromeDriverManager(headless=True, lean=True))
+
+    def browser_allowed(self) -> bool:
+        """
+        Returns False in offline mode, where pages may only come from the page archive.
+        """
+        return self.backend is None or not self.backend.offline
+
+    def archive_page(self, url: str) -> None:
+        """
+        Stores the page loaded in the browser in the backend's page archive (if any),
+        so offline runs can replay it.
+        """
+        if self.backend is not None and self.backend.archive is not None:
+            self.backend.archive.put(url, self.driver.page_source, source="browser")
+
+    def close(self) -> None:
+        """
+        Shuts down the browser (if one was started) so it can be recreated later.
+        """
+        if self.driver_manager is not None:
+            self.driver_manager.quit()
+        self.driver_manager = None
+        self.driver = None
+        self.wait = None
+
     def get_page_url(self, page_number: int) -> str:
         """
         Construct the URL for a given page number.
@@ -61,6 +136,26 @@ class ABATherapyScraper:
         except Exception:
             print("Cookie banner not found, proceeding...")
 
+    def after_page_load(self, url: str) -> None:
+        """
+        Handles a page the browser just loaded.
+
+        With the lean profile the cookie banner is blocked at the network layer,
+        so only the bytes saved are reported; otherwise the banner is hidden.
+
+        :param url: The URL that was loaded.
+        """
+        if getattr(self.driver_manager, "lean", False):
+            stats: dict = self.driver_manager.collect_page_stats(url)
+            print(
+                f"Lean profile: {stats['bytes_transferred']} bytes loaded, "
+                f"{stats['blocked_requests']} requests blocked, "
+                f"~{stats['bytes_saved']} bytes saved"
+            )
+        else:
+            # Hide cookie banner if present.
+            self.hide_cookie_banner()
+
     def scrape_page(self) -> bool:
         """
         Loads a page and extracts contact articles from it.
@@ -69,14 +164,37 @@ class ABATherapyScraper:
         checks for "no results", and then processes containers of articles to extract details.
 
         :return: True if the page was processed; False if there are no more results.
+        :raises RuntimeError: Offline, when the page is not in the page archive.
         """
         url: str = self.get_page_url(self.page)
         print(f"Scraping page {self.page}: {url}")
-        self.driver.get(url)
-        time.sleep(2)  # Allow page to load
 
-        # Hide cookie banner if present.
-        self.hide_cookie_banner()
+        if self.backend is not None:
+            contacts: Optional[list[dict]] = self.backend.scrape_listing(url)
+            if contacts is not None:
+                if not contacts:
+                    print("No contacts found on this page. Ending scraping.")
+                    return False
+                self.contacts.extend(contacts)
+                return True
+            if not self.browser_allowed():
+                # Not the end of the directory: the listing must not be cut short here
+                raise RuntimeError(f"Listing page {url} is not in the page archive (offline)")
+            print("HTTP backend could not read the page, falling back to Selenium.")
+
+        self.ensure_driver()
+        with self.telemetry.span("browser.navigate", url=url):
+            self.driver.get(url)
+        # Wait until either the result cards or the 'no results' notice is shown.
+        with self.telemetry.span("browser.wait", url=url):
+            self.readiness.wait_for(
+                self.driver,
+                url,
+                [(By.CLASS_NAME, "dp-dfg-items"), (By.CLASS_NAME, "dp-dfg-no-results")],
+                label="listing",
+            )
+        self.after_page_load(url)
+        self.archive_page(url)
 
         # If an element indicating 'no results' is displayed, break the loop.
         try:
@@ -105,7 +223,7 @@ class ABATherapyScraper:
                         By.CSS_SELECTOR, "h3.entry-title a"
                     )
                     # Replace any en dash or em dash with a plain hyphen with spaces
-                    title: str = re.sub(r"\s*[–—]\s*", " - ", title_element.text.strip())
+                    title: str = DASH_PATTERN.sub(" - ", title_element.text.strip())
                     article_url: str = title_element.get_attribute("href") or ""
 
                     # Extract the city/state information from the article.
@@ -130,22 +248,36 @@ class ABATherapyScraper:
 
         return True
 
-    def save_contacts_to_csv(self) -> None:
+    def save_contacts_to_csv(
+        self, csv_path: Optional[str] = None, contacts: Optional[Iterable[dict]] = None
+    ) -> None:
         """
         Save the scraped contact details into a CSV file.
 
         This function writes the contact information to a CSV file with the specified fieldnames.
+        Rows go to a ".part" file as the contacts arrive, which is renamed to the CSV
+        once all of them are written, so an interrupted listing leaves no truncated CSV.
+
+        :param csv_path: Optional output path. Defaults to data/contacts_list.csv.
+        :param contacts: Contacts to write, e.g. `iter_contacts()`. Defaults to `self.contacts`.
         """
 
-        csv_dir = pathlib.Path("data")
+        if csv_path is None:
+            csv_dir = pathlib.Path("data")
+            csv_file_path = csv_dir / "contacts_list.csv"
+        else:
+            csv_file_path = pathlib.Path(csv_path)
+            csv_dir = csv_file_path.parent
         csv_dir.mkdir(parents=True, exist_ok=True)
-        csv_file_path = csv_dir / "contacts_list.csv"
 
-        with open(csv_file_path, "w", newline="", encoding="utf-8") as csvFile:
+        part_path = csv_file_path.with_name(csv_file_path.name + ".part")
+        with open(part_path, "w", newline="", encoding="utf-8") as csvFile:
             fieldnames: list[str] = ["Name", "Url", "Location"]
             writer: csv.DictWriter = csv.DictWriter(csvFile, fieldnames=fieldnames)
             writer.writeheader()
-            writer.writerows(self.contacts)
+            for contact in self.contacts if contacts is None else contacts:
+                writer.writerow(contact)
+        part_path.replace(csv_file_path)
 
     def get_company_pages(self, contact: dict) -> dict:
         """
@@ -159,7 +291,10 @@ class ABATherapyScraper:
         :return: A set of unique company page URLs.
         """
 
-        link: str = self.get_company_url(contact["Url"])
+        with self.telemetry.span("discover", provider=contact["Url"]):
+            link: str = self.get_company_url(contact["Url"])
+            self.telemetry.annotate(link=link)
+        self.telemetry.count("providers_total", outcome="found" if link else "missing")
         return {
             "Name": contact["Name"],
             "Link": link,
@@ -197,17 +332,29 @@ class ABATherapyScraper:
         :param url: The URL of the contact page to scrape.
         :return: A dictionary containing the contact details.
         """
-        self.driver.get(url)
-        time.sleep(2)  # Allow page to load
-
-        # Hide cookie banner if present.
-        self.hide_cookie_banner()
+        if self.backend is not None:
+            website: Optional[str] = self.backend.get_company_url(url)
+            if website is not None:
+                return website
+            if not self.browser_allowed():
+                return ""
+
+        self.ensure_driver()
+        with self.telemetry.span("browser.navigate", url=url):
+            self.driver.get(url)
+        # Wait for the contact-details block instead of a fixed delay.
+        with self.telemetry.span("browser.wait", url=url):
+            self.readiness.wait_for(
+                self.driver, url, [(By.XPATH, CONTACT_DETAILS_XPATH)], label="contact-details"
+            )
+        self.after_page_load(url)
+        self.archive_page(url)
 
         # Extract the contact details from the page.
         try:
             website: str = ""
             # Extract the contact details from the page.
-            contact_details = self.driver.find_element(By.XPATH, '//*[@id="main-content"]/div/div/div[1]/div[3]/div[1]/div[3]/div/div[2]/div')
+            contact_details = self.driver.find_element(By.XPATH, CONTACT_DETAILS_XPATH)
             if contact_details:
                 # Extract the contact details from the page.
                 website = contact_details.text.strip()
@@ -217,28 +364,66 @@ class ABATherapyScraper:
 
         return website
 
-    def run(self):
+    def iter_contacts(self, journal: Optional[DiscoveryJournal] = None) -> Iterator[dict]:
         """
-        Runs the scraper until 100 contacts are collected or there are no more pages.
+        Scrapes the listing pages one by one, yielding each page's contacts as soon
+        as the page is read so later stages can start before the directory is done.
+        `self.contacts` only holds the page being read, so memory does not grow
+        with the directory.
+
+        :param journal: Optional DiscoveryJournal. Each listing page's contacts are
+                        recorded as soon as the page is scraped, and pages already
+                        recorded are replayed from the journal instead of re-scraped.
+        :return: Iterator over contact dicts (Name, Url, Location).
         """
+        collected: int = 0
         try:
             while True:
-                if not self.scrape_page():
+                key: str = f"page:{self.page}"
+                self.contacts = []
+                if journal is not None and journal.is_done(key):
+                    entry: dict = journal.result(key)
+                    self.contacts = list(entry["contacts"])
+                    more: bool = entry["more"]
+                else:
+                    try:
+                        with self.telemetry.span("listing", page=self.page):
+                            more = self.scrape_page()
+                    except Exception as e:
+                        if journal is not None:
+                            journal.record_failure(key, str(e))
+                        raise
+                    if journal is not None:
+                        journal.record_success(
+                            key, {"contacts": self.contacts, "more": more}
+                        )
+                collected += len(self.contacts)
+                yield from self.contacts
+                if not more:
                     break
 
                 self.page += 1
-                print(f"Collected {len(self.contacts)} contacts so far.")
-                time.sleep(1)  # Pause before proceeding to the next page
+                print(f"Collected {collected} contacts so far.")
 
         finally:
-            self.driver_manager.quit()
+            self.close()
+
+    def run(self, journal: Optional[DiscoveryJournal] = None) -> list[dict]:
+        """
+        Runs the scraper until there are no more pages.
+
+        Unlike `iter_contacts`, every contact is kept in `self.contacts`, so
+        `run()` followed by `save_contacts_to_csv()` writes the whole directory.
+
+        :param journal: Optional DiscoveryJournal (see `iter_contacts`).
+        :return: All contacts (Name, Url, Location), also stored in `self.contacts`.
+        """
+        contacts: list[dict] = list(self.iter_contacts(journal))
+        self.contacts = contacts
+        return contacts
 
 
 if __name__ == "__main__":
-    # Instantiate the ChromeDriverManager.
-    driver_manager = ChromeDriverManager(headless=True)
-    # Instantiate the scraper with the driver manager.
-    scraper = ABATherapyScraper(driver_manager)
-    scraper.run()
-    scraper.save_contacts_to_csv()
-    driver_manager.quit()
+    # Read pages over HTTP; a headless browser is started only if needed.
+    scraper = ABATherapyScraper(backend=HttpFetchBackend())
+    scraper.save_contacts_to_csv(contacts=scraper.iter_contacts())
@@ -1,12 +1,87 @@
-from typing import List
-from scrapegraphai.graphs import SmartScraperGraph, SmartScraperMultiGraph  # type: ignore
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Iterable, List, Optional, Union
 from dotenv import load_dotenv
 import os
 from urllib.parse import urlparse
 
+from scrapper.fetchBackend import HttpFetchBackend
+from scrapper.htmlReducer import HtmlReducer, estimate_tokens
+from scrapper.llmCache import LLMCache
+from scrapper.rateLimiter import RateLimiter, retry_after
+from scrapper.structuredExtractor import StructuredExtractor
+from scrapper.telemetry import Telemetry
+from scrapper.teamPageFinder import TeamPageFinder
+
+LINKS_PROMPT: str = "Extract all the links on the page for the same domain. Do not include anchor links (#xxx). Return a list of links will full url."
+TEAM_PROMPT: str = "Extract the name and position of the team members. Remove duplicate names."
+
+# Token estimate for graph calls whose page content is not known up front.
+DEFAULT_CALL_TOKENS: int = 2000
+GRAPH_CLASSES: tuple = ("SmartScraperGraph", "SmartScraperMultiGraph")
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Imports the ScrapeGraphAI graphs on first use: with LangChain underneath
+    they take seconds to import, which commands that never call the LLM skip.
+    """
+    if name in GRAPH_CLASSES:
+        from scrapegraphai import graphs  # type: ignore
+
+        for graph_name in GRAPH_CLASSES:
+            globals().setdefault(graph_name, getattr(graphs, graph_name))
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def graph(name: str) -> Any:
+    """
+    Returns a graph class by name (patched module attributes win, e.g. in tests).
+    """
+    return globals().get(name) or __getattr__(name)
+
 
 class TeamExtractor:
-    def __init__(self, llm=None):
+    def __init__(
+        self,
+        llm=None,
+        cache: Optional[LLMCache] = None,
+        fetcher: Optional[HttpFetchBackend] = None,
+        finder: Optional[TeamPageFinder] = None,
+        max_pages: int = 3,
+        max_tokens: int = 60000,
+        min_roster: int = 2,
+        reducer: Optional[HtmlReducer] = None,
+        min_text_chars: int = 200,
+        structured: Optional[StructuredExtractor] = None,
+        min_confidence: float = 0.8,
+        limiter: Optional[RateLimiter] = None,
+        max_retries: int = 3,
+        telemetry: Optional[Telemetry] = None,
+    ):
+        """
+        :param llm: Unused, kept for backwards compatibility.
+        :param cache: Optional LLMCache; graph results are reused while the pages
+                      they were computed from are unchanged.
+        :param fetcher: HTTP backend used to read page content for cache keys
+                        and for heuristic team page discovery.
+        :param finder: Optional TeamPageFinder; defaults to one built on `fetcher`.
+        :param max_pages: Maximum number of links extracted per site.
+        :param max_tokens: Estimated content tokens sent to the LLM per site.
+        :param min_roster: Members with name and position that end the search early.
+        :param reducer: HtmlReducer that shrinks fetched pages before they reach the LLM.
+        :param min_text_chars: Reduced pages shorter than this (e.g. rendered by
+                               JavaScript) are passed to the graph by URL instead.
+        :param structured: StructuredExtractor tried on every fetched page before the LLM.
+        :param min_confidence: Structured results below this confidence fall back to the LLM.
+        :param limiter: Optional RateLimiter shared by every LLM call.
+        :param max_retries: Retries of a graph call after a rate-limit (429) error.
+        :param telemetry: Optional Telemetry; sites are traced as "extract" spans
+                          with their page fetches and LLM requests as children.
+        """
         load_dotenv()
 
         self.graph_config = {
@@ -17,6 +92,26 @@ class TeamExtractor:
             "verbose": True,
             "headless": False,
         }
+        self.cache: Optional[LLMCache] = cache
+        self.fetcher: Optional[HttpFetchBackend] = fetcher
+        if cache is not None and fetcher is None:
+            self.fetcher = HttpFetchBackend()
+        self.finder: Optional[TeamPageFinder] = finder
+        if finder is None and self.fetcher is not None:
+            self.finder = TeamPageFinder(self.fetcher)
+        self.max_pages: int = max_pages
+        self.max_tokens: int = max_tokens
+        self.min_roster: int = min_roster
+        self.reducer: HtmlReducer = reducer or HtmlReducer()
+        self.min_text_chars: int = min_text_chars
+        self.reduction_stats: list[dict] = []
+        # Site URL -> pages its members were last extracted from
+        self.sources: dict[str, list[str]] = {}
+        self.structured: StructuredExtractor = structured or StructuredExtractor()
+        self.min_confidence: float = min_confidence
+        self.limiter: Optional[RateLimiter] = limiter
+        self.max_retries: int = max_retries
+        self.telemetry: Telemetry = telemetry or Telemetry()
 
     def ensure_protocol(self, url: str, default_scheme: str = "https") -> str:
         """
@@ -28,46 +123,343 @@ class TeamExtractor:
             return f"{default_scheme}://{url}"
         return url
 
-    def extract(self, url: str) -> list[dict]:
+    def page_content(self, source: Union[str, List[str]]) -> Optional[str]:
+        """
+        Fetch the content a graph will read, to key the LLM cache on.
+        Returns None if any page cannot be fetched (the cache is then skipped).
+        """
+        if self.fetcher is None:
+            return None
+        urls = source if isinstance(source, list) else [source]
+        parts: list[str] = []
+        for url in urls:
+            body = self.fetcher.fetch(url)
+            if body is None:
+                return None
+            parts.append(f"{url}\n{body}")
+        return "\n\0\n".join(parts)
 
-        try:
+    def run_graph(
+        self,
+        graph_class: Union[type, str],
+        prompt: str,
+        source: Union[str, List[str]],
+        content: Optional[str] = None,
+    ) -> Any:
+        """
+        Run a ScrapeGraphAI graph, answering from the LLM cache when the pages
+        it reads are unchanged since the cached run.
+        `content` is the already fetched page content of `source`, if known.
+        `graph_class` may be a name from GRAPH_CLASSES, imported only on a cache miss.
+        Calls go through the rate limiter and are retried after 429 errors.
+        """
+        model: str = self.graph_config["llm"]["model"]
+        if content is None and self.cache is not None:
+            content = self.page_content(source)
+        if self.cache is not None and content is not None:
+            cached = self.cache.get(prompt, model, content)
+            if cached is not None:
+                self.telemetry.count("llm_cache_total", result="hit")
+                return cached
 
-            # Create the SmartScraperGraph instance
-            smart_scraper_graph = SmartScraperGraph(
-                prompt="Extract all the links on the page for the same domain. Do not include anchor links (#xxx). Return a list of links will full url.",
-                source=self.ensure_protocol(url),
-                config=self.graph_config,
-            )
+        if isinstance(graph_class, str):
+            graph_class = graph(graph_class)
+        # A multi-source graph makes one call per source plus one to merge them.
+        requests = len(source) + 1 if isinstance(source, list) and len(source) > 1 else 1
+        tokens = estimate_tokens(content) if content else DEFAULT_CALL_TOKENS
+        for attempt in range(self.max_retries + 1):
+            if self.limiter is not None:
+                with self.telemetry.span("llm.wait"):
+                    self.limiter.acquire(tokens, requests)
+            try:
+                with self.telemetry.span("llm.request", graph=graph_class.__name__):
+                    result = graph_class(
+                        prompt=prompt, source=source, config=self.graph_config
+                    ).run()
+                    # Graphs do not report usage, so tokens are estimated.
+                    self.telemetry.llm(
+                        model,
+                        tokens,
+                        estimate_tokens(json.dumps(result, default=str)),
+                        path="graph",
+                        estimated=True,
+                    )
+                break
+            except Exception as e:
+                delay = retry_after(e)
+                if delay is None or attempt == self.max_retries:
+                    raise
+                print(f"Rate limited, retrying in {delay:.1f}s: {e}")
+                if self.limiter is not None:
+                    self.limiter.pause(delay)
+                else:
+                    time.sleep(delay)
+
+        if self.cache is not None and content is not None and result:
+            self.cache.set(prompt, model, content, result)
+        return result
 
-            # Run the pipeline
-            result = smart_scraper_graph.run()
+    def discover_links(self, url: str) -> list[str]:
+        """
+        Find the pages to extract team members from.
+        Keyword heuristics over the homepage anchors and sitemap.xml are tried
+        first; the LLM link listing (SmartScraperGraph) only runs when they find nothing.
+        """
+        source = self.ensure_protocol(url)
+        if self.finder is not None:
+            candidates = self.finder.find(source)
+            if candidates:
+                return candidates
 
-            if (
-                not isinstance(result, dict)
-                or "content" not in result
-                or not result["content"]
-            ):
+        if self.offline:
+            # The graph would load the page itself; hand it the archived copy instead.
+            body = self.fetcher.fetch(source)
+            if not body:
                 return []
+            result = self.run_graph("SmartScraperGraph", LINKS_PROMPT, body, f"{source}\n{body}")
+        else:
+            result = self.run_graph("SmartScraperGraph", LINKS_PROMPT, source)
 
-            smart_multi_graph = SmartScraperMultiGraph(
-                prompt="Extract the name and position of the team members. Remove duplicate names.",
-                source=result["content"],
-                config=self.graph_config,
-            )
+        if (
+            not isinstance(result, dict)
+            or "content" not in result
+            or not result["content"]
+        ):
+            return []
+        return result["content"]
+
+    @property
+    def offline(self) -> bool:
+        """
+        True when pages may only be read from the fetcher's page archive.
+        """
+        return bool(getattr(self.fetcher, "offline", False))
+
+    def prepare_page(self, link: str, body: Optional[str]) -> tuple[List[str], Optional[str], int]:
+        """
+        Reduce a fetched page to the compact text chunks sent to the LLM.
+
+        :param link: The page URL.
+        :param body: The page HTML, or None if it could not be fetched.
+        :return: (graph source, cache content, estimated input tokens). The source
+                 is the reduced chunks, or [link] when the page could not be
+                 fetched or reduced to enough text ([body] in offline mode).
+        """
+        if body is None:
+            return [link], None, 0
+
+        reduced = self.reducer.reduce(body, link)
+        self.reduction_stats.append(
+            {key: reduced[key] for key in ("url", "tokens_before", "tokens_after")}
+        )
+        print(f"{link}: ~{reduced['tokens_before']} -> ~{reduced['tokens_after']} tokens")
+        if len(reduced["text"]) >= self.min_text_chars:
+            return reduced["chunks"], f"{link}\n{reduced['text']}", reduced["tokens_after"]
+        # Offline, the archived HTML is passed as it is instead of the URL.
+        source = [body] if self.offline else [link]
+        return source, f"{link}\n{body}", estimate_tokens(body)
+
+    def rank_links(self, url: str, links: Union[str, List[str]]) -> list[str]:
+        """
+        Order candidate links by how likely they hold the team roster.
+        Duplicates and links to other sites are dropped; ties keep their original order.
+        """
+        if isinstance(links, str):
+            links = [links]
+        unique: list[str] = []
+        seen: set[str] = set()
+        for link in links:
+            if not isinstance(link, str) or not link.strip():
+                continue
+            link = link.strip()
+            key = link.rstrip("/")
+            if key in seen:
+                continue
+            if "://" in link and not TeamPageFinder.same_site(link, url):
+                continue
+            seen.add(key)
+            unique.append(link)
+        return sorted(unique, key=lambda link: -TeamPageFinder.score(link))
+
+    def is_roster(self, members: list[dict]) -> bool:
+        """
+        True if the members found so far look like a complete team roster.
+        """
+        complete = [m for m in members if m.get("name") and m.get("position")]
+        return len(complete) >= self.min_roster
+
+    def plan_site(self, url: str, max_page_tokens: int) -> Optional[dict]:
+        """
+        Prepare a site for batched extraction (see BatchExtractor).
+
+        Only the top-ranked candidate page is read.
+
+        :param url: The site URL.
+        :param max_page_tokens: Largest reduced page that may be batched.
+        :return: {"members": [...]} when no LLM call is needed (no candidate page,
+                 or structured team data), {"link", "text", "links"} when the page
+                 is small enough to batch, {"links"} when the site needs
+                 `extract_members`, or None without a fetcher. "links" are the
+                 ranked candidate pages, to pass on to `extract_members`.
+        """
+        with self.telemetry.span("plan", site=url):
+            if self.fetcher is None:
+                return None
+            links = self.rank_links(self.ensure_protocol(url), self.discover_links(url))
+            if not links:
+                self.sources[url] = []
+                return {"members": []}
+            link = links[0]
+            body = self.fetcher.fetch(link)
+            if not body:
+                return {"links": links}
+            self.sources[url] = [link]
+
+            structured = self.structured.extract(body, link)
+            if structured["confidence"] >= self.min_confidence:
+                members = [
+                    {"Url": url, "name": m["name"], "position": m["position"]}
+                    for m in structured["members"]
+                ]
+                if self.is_roster(members):
+                    return {"members": members}
 
-            result = smart_multi_graph.run()
+            source, _, tokens = self.prepare_page(link, body)
+            if source != [link] and len(source) == 1 and tokens <= max_page_tokens:
+                return {"link": link, "text": source[0], "links": links}
+            return {"links": links}
+
+    def extract_members(self, url: str, links: Optional[List[str]] = None) -> list[dict]:
+        """
+        Extract the team members of a site. Errors are raised to the caller.
 
-            if (
-                not isinstance(result, dict)
-                or "team_members" not in result
-                or not result["team_members"]
-            ):
+        Candidate links are visited one at a time in priority order, within
+        `max_pages` pages and `max_tokens` estimated tokens, and the search stops
+        as soon as the members found so far look like a team roster. Pages whose
+        markup lists the team as structured data are parsed without the LLM.
+        `links` from `plan_site` skip discovering (and paying for) them again.
+        """
+        with self.telemetry.span("extract", site=url):
+            source = self.ensure_protocol(url)
+            if links is None:
+                links = self.rank_links(source, self.discover_links(url))
+            self.sources[url] = []
+            if not links:
                 return []
 
+            members: list[dict] = []
+            seen_names: set[str] = set()
+            visited: int = 0
+            tokens: int = 0
+            stop_reason: str = "exhausted"
+            for link in links:
+                if visited >= self.max_pages:
+                    stop_reason = "page cap"
+                    break
+                body = self.fetcher.fetch(link) if self.fetcher is not None else None
+                if body is None and self.offline:
+                    # Not archived: offline runs never go to the network.
+                    continue
+                structured = self.structured.extract(body, link) if body else None
+
+                if structured and structured["confidence"] >= self.min_confidence:
+                    visited += 1
+                    self.sources[url].append(link)
+                    page_members = structured["members"]
+                    self.telemetry.count("extract_pages_total", method="structured")
+                    print(
+                        f"{link}: {len(page_members)} members from {structured['method']} "
+                        f"(confidence {structured['confidence']}), LLM skipped"
+                    )
+                else:
+                    source, content, page_tokens = self.prepare_page(link, body)
+                    if visited and tokens + page_tokens > self.max_tokens:
+                        stop_reason = "token cap"
+                        break
+                    visited += 1
+                    tokens += page_tokens
+                    self.sources[url].append(link)
+                    self.telemetry.count("extract_pages_total", method="llm")
+
+                    # Extract the team members from this link (SmartScraperMultiGraph)
+                    result = self.run_graph("SmartScraperMultiGraph", TEAM_PROMPT, source, content)
+                    page_members = []
+                    if isinstance(result, dict) and result.get("team_members"):
+                        page_members = result["team_members"]
+
+                for member in page_members:
+                    name_key = str(member.get("name") or "").strip().lower()
+                    if name_key in seen_names:
+                        continue
+                    seen_names.add(name_key)
+                    members.append(member)
+
+                if self.is_roster(members):
+                    stop_reason = "roster found"
+                    break
+
+            print(
+                f"{url}: visited {visited}/{len(links)} links, "
+                f"~{tokens} tokens, stopped: {stop_reason}"
+            )
+            self.telemetry.annotate(
+                visited=visited, tokens=tokens, stop_reason=stop_reason, members=len(members)
+            )
             return [
                 {"Url": url, "name": member["name"], "position": member["position"]}
-                for member in result["team_members"]
+                for member in members
             ]
+
+    async def extract_many(
+        self,
+        links: Iterable[str],
+        concurrency: int = 8,
+        planned: Optional[dict[str, List[str]]] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Extract the team members of many sites concurrently.
+
+        Each site runs `extract_members` in a worker thread, at most
+        `concurrency` at a time; LLM calls stay within the shared rate limiter.
+        Results are yielded as soon as each site completes, not in input order.
+
+        :param links: Site URLs.
+        :param concurrency: Maximum number of sites extracted at the same time.
+        :param planned: Candidate links per site URL from `plan_site`.
+        :return: Async iterator of dicts with url, members, error, started_at and seconds.
+        """
+        concurrency = max(1, concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+        # A dedicated pool, so concurrency is not capped by the default executor size.
+        executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="extract")
+        loop = asyncio.get_running_loop()
+
+        async def run_one(link: str) -> dict:
+            async with semaphore:
+                started_at = time.time()
+                outcome: dict = {"url": link, "members": [], "error": None, "started_at": started_at}
+                try:
+                    outcome["members"] = await loop.run_in_executor(
+                        executor, self.extract_members, link, (planned or {}).get(link)
+                    )
+                except Exception as e:
+                    outcome["error"] = str(e)
+                outcome["seconds"] = time.time() - started_at
+                return outcome
+
+        tasks = [asyncio.ensure_future(run_one(link)) for link in links]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def extract(self, url: str) -> list[dict]:
+
+        try:
+            return self.extract_members(url)
         except Exception as e:
             # If the url is not valid, return an empty list or has an error, return an empty list
             print(f"Error: {e}")
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+import json
+import os
+import time
+from typing import TYPE_CHECKING, Any, Optional
+
+from scrapper.htmlReducer import estimate_tokens
+from scrapper.llmCache import LLMCache
+from scrapper.rateLimiter import RateLimiter, retry_after
+from scrapper.telemetry import Telemetry
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+BATCH_PROMPT: str = (
+    "You receive the text of several web pages, each wrapped in "
+    '<page id="..." url="...">...</page>. For every page, extract the name and '
+    "position of the team members listed on that page only. Remove duplicate names. "
+    'Answer with JSON only: {"pages": [{"id": "<page id>", "team_members": '
+    '[{"name": "...", "position": "..."}]}]}, with one entry per page, '
+    "using an empty list when a page lists nobody."
+)
+
+# Tokens reserved per batch for the instructions and per page for its tags.
+PROMPT_TOKENS: int = 200
+PAGE_OVERHEAD_TOKENS: int = 20
+
+
+class BatchExtractor:
+    """
+    Extracts team members of several small pages in one LLM request.
+
+    Reduced pages are packed, tagged by id and URL, into structured-output
+    requests of at most `max_tokens` estimated tokens, and the answer is split
+    back per page. A page whose entry is missing or malformed is retried on
+    its own (un-batched), so one confusing page never spoils its neighbours.
+    Results are cached per page content, like the graph results.
+    """
+
+    def __init__(
+        self,
+        client: Optional["OpenAI"] = None,
+        model: str = "gpt-4o-mini",
+        base_url: Optional[str] = None,
+        max_tokens: int = 12000,
+        cache: Optional[LLMCache] = None,
+        limiter: Optional[RateLimiter] = None,
+        max_retries: int = 3,
+        telemetry: Optional[Telemetry] = None,
+    ) -> None:
+        """
+        :param client: OpenAI-compatible client; built from OPENAI_API_KEY if omitted.
+        :param model: Chat model used for extraction.
+        :param base_url: API base URL (e.g. a proxy or a local server);
+                         defaults to OPENAI_BASE_URL or the OpenAI API.
+        :param max_tokens: Estimated input token budget of one batch.
+        :param cache: Optional LLMCache for per-page results.
+        :param limiter: Optional RateLimiter shared with the other LLM calls.
+        :param max_retries: Retries of a request after a rate-limit (429) error.
+        :param telemetry: Optional Telemetry receiving request spans, tokens and cost.
+        """
+        if client is None:
+            # The OpenAI SDK is slow to import; only load it when a client is needed.
+            from openai import OpenAI
+
+            client = OpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"),
+                base_url=base_url or os.getenv("OPENAI_BASE_URL") or None,
+                max_retries=0,
+            )
+        self.client: "OpenAI" = client
+        self.model: str = model
+        self.max_tokens: int = max_tokens
+        self.cache: Optional[LLMCache] = cache
+        self.limiter: Optional[RateLimiter] = limiter
+        self.max_retries: int = max_retries
+        self.requests: int = 0
+        self.telemetry: Telemetry = telemetry or Telemetry()
+
+    @staticmethod
+    def page_tokens(page: dict) -> int:
+        """
+        Estimated tokens a page adds to a batch.
+        """
+        return estimate_tokens(page["text"]) + PAGE_OVERHEAD_TOKENS
+
+    def pack(self, pages: list[dict]) -> list[list[dict]]:
+        """
+        Groups pages into batches within the token budget, keeping their order.
+        A page larger than the budget gets a batch of its own.
+        """
+        budget: int = self.max_tokens - PROMPT_TOKENS
+        batches: list[list[dict]] = []
+        current: list[dict] = []
+        size: int = 0
+        for page in pages:
+            tokens = self.page_tokens(page)
+            if current and size + tokens > budget:
+                batches.append(current)
+                current, size = [], 0
+            current.append(page)
+            size += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    @staticmethod
+    def render(batch: list[dict]) -> str:
+        """
+        Renders a batch as tagged page blocks for the prompt.
+        """
+        return "\n\n".join(
+            f'<page id="{index}" url="{page["url"]}">\n{page["text"]}\n</page>'
+            for index, page in enumerate(batch)
+        )
+
+    @staticmethod
+    def validate(entry: Any) -> Optional[list[dict]]:
+        """
+        Returns the members of one page entry, or None if it is malformed.
+        """
+        if not isinstance(entry, dict) or not isinstance(entry.get("team_members"), list):
+            return None
+        members: list[dict] = []
+        for member in entry["team_members"]:
+            if not isinstance(member, dict) or not isinstance(member.get("name"), str):
+                return None
+            position = member.get("position") or ""
+            if not isinstance(position, str):
+                return None
+            if member["name"].strip():
+                members.append({"name": member["name"].strip(), "position": position.strip()})
+        return members
+
+    def complete(self, batch: list[dict]) -> str:
+        """
+        Sends one batch to the LLM and returns the raw answer.
+        Calls go through the rate limiter and are retried after 429 errors.
+        """
+        user_message = self.render(batch)
+        tokens = estimate_tokens(BATCH_PROMPT + user_message)
+        for attempt in range(self.max_retries + 1):
+            if self.limiter is not None:
+                with self.telemetry.span("llm.wait"):
+                    self.limiter.acquire(tokens)
+            try:
+                self.requests += 1
+                with self.telemetry.span("llm.request", pages=len(batch)):
+                    response = self.client.chat.completions.create(
+                        model=self.model,
+                        temperature=0,
+                        response_format={"type": "json_object"},
+                        messages=[
+                            {"role": "system", "content": BATCH_PROMPT},
+                            {"role": "user", "content": user_message},
+                        ],
+                    )
+                    answer = response.choices[0].message.content or ""
+                    usage = getattr(response, "usage", None)
+                    self.telemetry.llm(
+                        self.model,
+                        getattr(usage, "prompt_tokens", None) or tokens,
+                        getattr(usage, "completion_tokens", None) or estimate_tokens(answer),
+                        path="batch",
+                        estimated=usage is None,
+                    )
+                return answer
+            except Exception as e:
+                delay = retry_after(e)
+                if delay is None or attempt == self.max_retries:
+                    raise
+                print(f"Rate limited, retrying in {delay:.1f}s: {e}")
+                if self.limiter is not None:
+                    self.limiter.pause(delay)
+                else:
+                    time.sleep(delay)
+        return ""
+
+    def split(self, batch: list[dict], answer: str) -> list[Optional[list[dict]]]:
+        """
+        Splits an answer back per page: members, or None where the output is invalid.
+        """
+        try:
+            entries = json.loads(answer).get("pages")
+        except (ValueError, AttributeError):
+            entries = None
+        results: list[Optional[list[dict]]] = [None] * len(batch)
+        if not isinstance(entries, list):
+            return results
+        for entry in entries:
+            index = entry.get("id") if isinstance(entry, dict) else None
+            try:
+                index = int(index)
+            except (TypeError, ValueError):
+                continue
+            if 0 <= index < len(batch):
+                results[index] = self.validate(entry)
+        return results
+
+    def cache_content(self, page: dict) -> str:
+        """
+        The content a page's cached result is keyed on.
+        """
+        return f"{page['url']}\n{page['text']}"
+
+    def extract(self, pages: list[dict]) -> dict[str, dict]:
+        """
+        Extracts the team members of many small pages.
+
+        :param pages: Dicts with key (e.g. the site key), url and text (reduced page).
+        :return: key -> {"members": [...], "error": message or None}.
+        """
+        results: dict[str, dict] = {}
+        todo: list[dict] = []
+        for page in pages:
+            cached = None
+            if self.cache is not None:
+                cached = self.cache.get(BATCH_PROMPT, self.model, self.cache_content(page))
+            if cached is not None:
+                results[page["key"]] = {"members": cached, "error": None}
+            else:
+                todo.append(page)
+
+        for batch in self.pack(todo):
+            try:
+                outputs = self.split(batch, self.complete(batch))
+            except Exception as e:
+                if len(batch) == 1:
+                    results[batch[0]["key"]] = {"members": [], "error": str(e)}
+                    continue
+                outputs = [None] * len(batch)
+            for page, members in zip(batch, outputs):
+                if members is None and len(batch) > 1:
+                    # Un-batch: retry the page on its own.
+                    try:
+                        members = self.split([page], self.complete([page]))[0]
+                    except Exception as e:
+                        results[page["key"]] = {"members": [], "error": str(e)}
+                        continue
+                if members is None:
+                    results[page["key"]] = {"members": [], "error": "invalid LLM output"}
+                    continue
+                results[page["key"]] = {"members": members, "error": None}
+                if self.cache is not None:
+                    self.cache.set(BATCH_PROMPT, self.model, self.cache_content(page), members)
+        return results
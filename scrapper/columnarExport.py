@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+import importlib.util
+import os
+import pathlib
+import shutil
+import tempfile
+from typing import Iterable, Optional, Union
+
+from scrapper.consolidation import OUTPUT_HEADER
+from scrapper.resultStore import ResultStore
+from scrapper.siteIndex import SiteIndex
+
+# Columns whose few distinct values repeat on every row
+DICTIONARY_COLUMNS: tuple = ("Title", "Company", "Location", "State")
+UNKNOWN_STATE: str = "Unknown"
+
+# Optional and slow to import: loaded by require_pyarrow() when an export or load needs it
+pyarrow = None
+
+
+def state_of(location: str) -> str:
+    """
+    Returns the state of a "City, State" location (UNKNOWN_STATE if there is none).
+    """
+    state = location.rpartition(",")[2].strip()
+    return state or UNKNOWN_STATE
+
+
+def columnar_available() -> bool:
+    """
+    Returns True if pyarrow is installed (without importing it).
+    """
+    return pyarrow is not None or importlib.util.find_spec("pyarrow") is not None
+
+
+def require_pyarrow() -> None:
+    """
+    Imports pyarrow and the submodules used here on first use.
+    """
+    global pyarrow
+    if pyarrow is not None:
+        return
+    try:
+        import pyarrow.compute
+        import pyarrow.dataset
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        pyarrow = None
+        raise RuntimeError(
+            "Columnar export needs pyarrow; install it with `pip install pyarrow`"
+        ) from e
+
+
+class ColumnarExporter:
+    """
+    Writes the consolidated team members as columnar files for analytics.
+
+    The rows of final_team_members.csv (plus a State column taken from the
+    Location) become an Arrow table whose repetitive columns are
+    dictionary-encoded. It is written as a Parquet dataset partitioned by
+    state (`State=California/part-0.parquet`), so filters on a state only
+    read its files, and optionally as one Arrow IPC file that readers map
+    into memory without parsing or copying. Both outputs are replaced
+    atomically.
+    """
+
+    def __init__(
+        self,
+        store: ResultStore,
+        parquet_dir: Union[str, pathlib.Path],
+        arrow_path: Optional[Union[str, pathlib.Path]] = None,
+        compression: str = "zstd",
+    ) -> None:
+        """
+        :param store: The result store holding the consolidated rows.
+        :param parquet_dir: Directory of the partitioned Parquet dataset.
+        :param arrow_path: Arrow IPC file to write too (None skips it).
+        :param compression: Parquet compression codec.
+        """
+        require_pyarrow()
+        self.store: ResultStore = store
+        self.parquet_dir: pathlib.Path = pathlib.Path(parquet_dir)
+        self.arrow_path: Optional[pathlib.Path] = pathlib.Path(arrow_path) if arrow_path else None
+        self.compression: str = compression
+
+    def table(self, site_index: SiteIndex) -> "pyarrow.Table":
+        """
+        Builds the Arrow table of every site's consolidated rows.
+        """
+        columns: dict[str, list[str]] = {name: [] for name in [*OUTPUT_HEADER, "State"]}
+        for site in site_index:
+            for row in self.store.consolidated_rows(site.key):
+                for name, value in zip(OUTPUT_HEADER, row):
+                    columns[name].append(value)
+                columns["State"].append(state_of(row[4]))
+        arrays = []
+        for name, values in columns.items():
+            array = pyarrow.array(values, type=pyarrow.string())
+            if name in DICTIONARY_COLUMNS:
+                array = pyarrow.compute.dictionary_encode(array)
+            arrays.append(array)
+        return pyarrow.Table.from_arrays(arrays, names=list(columns))
+
+    def write_parquet(self, table: "pyarrow.Table") -> None:
+        """
+        Replaces the Parquet dataset with `table`, partitioned by state.
+        """
+        self.parquet_dir.parent.mkdir(parents=True, exist_ok=True)
+        staging = pathlib.Path(
+            tempfile.mkdtemp(dir=self.parquet_dir.parent, prefix=f".{self.parquet_dir.name}.")
+        )
+        try:
+            pyarrow.dataset.write_dataset(
+                table,
+                staging,
+                format="parquet",
+                partitioning=pyarrow.dataset.partitioning(
+                    pyarrow.schema([("State", table.schema.field("State").type)]), flavor="hive"
+                ),
+                file_options=pyarrow.dataset.ParquetFileFormat().make_write_options(
+                    compression=self.compression, use_dictionary=True
+                ),
+                basename_template="part-{i}.parquet",
+                existing_data_behavior="overwrite_or_ignore",
+            )
+            os.chmod(staging, 0o755)
+            previous: Optional[pathlib.Path] = None
+            if self.parquet_dir.exists():
+                previous = self.parquet_dir.with_name(f".{self.parquet_dir.name}.old")
+                shutil.rmtree(previous, ignore_errors=True)
+                os.replace(self.parquet_dir, previous)
+            os.replace(staging, self.parquet_dir)
+            if previous is not None:
+                shutil.rmtree(previous, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    def write_arrow(self, table: "pyarrow.Table") -> None:
+        """
+        Replaces the Arrow IPC file with `table` (uncompressed, so reads can be zero-copy).
+        """
+        self.arrow_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(
+            dir=self.arrow_path.parent, prefix=f".{self.arrow_path.name}.", suffix=".tmp"
+        )
+        os.close(fd)
+        try:
+            with pyarrow.OSFile(tmp_name, "wb") as sink:
+                with pyarrow.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.chmod(tmp_name, 0o644)
+            os.replace(tmp_name, self.arrow_path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+
+    def export(self, site_index: SiteIndex) -> dict:
+        """
+        Writes the Parquet dataset (and the Arrow file, if configured).
+
+        :param site_index: The current SiteIndex.
+        :return: Dict with rows, states and the bytes written per format.
+        """
+        table = self.table(site_index)
+        self.write_parquet(table)
+        stats: dict = {
+            "rows": table.num_rows,
+            "states": len(pyarrow.compute.unique(table.column("State"))),
+            "parquet_bytes": sum(p.stat().st_size for p in self.parquet_dir.rglob("*.parquet")),
+        }
+        if self.arrow_path is not None:
+            self.write_arrow(table)
+            stats["arrow_bytes"] = self.arrow_path.stat().st_size
+        return stats
+
+
+def load_members(
+    path: Union[str, pathlib.Path],
+    states: Optional[Iterable[str]] = None,
+    columns: Optional[list[str]] = None,
+) -> "pyarrow.Table":
+    """
+    Loads exported team members with memory mapping instead of CSV parsing.
+
+    :param path: The Parquet dataset directory or an Arrow IPC file.
+    :param states: Only load these states (only their partitions are read from Parquet).
+    :param columns: Only load these columns.
+    :return: An Arrow table (`.to_pandas()` for a DataFrame).
+    """
+    require_pyarrow()
+    path = pathlib.Path(path)
+    wanted = sorted(set(states)) if states is not None else None
+    if path.is_dir():
+        return pyarrow.parquet.read_table(
+            path,
+            columns=columns,
+            filters=[("State", "in", wanted)] if wanted is not None else None,
+            memory_map=True,
+            partitioning="hive",
+        )
+    # The table's buffers point into the map, which stays open while they are referenced.
+    table = pyarrow.ipc.open_file(pyarrow.memory_map(str(path), "r")).read_all()
+    if wanted is not None:
+        table = table.filter(
+            pyarrow.compute.is_in(
+                table.column("State").cast(pyarrow.string()), value_set=pyarrow.array(wanted)
+            )
+        )
+    if columns is not None:
+        table = table.select(columns)
+    return table
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+import csv
+import hashlib
+import json
+import os
+import pathlib
+import tempfile
+from typing import Iterable, Union
+
+from scrapper.resultStore import ResultStore
+from scrapper.siteIndex import SiteIndex
+
+OUTPUT_HEADER: list[str] = ["Url", "Name", "Title", "Company", "Location"]
+
+
+def write_csv_atomically(
+    path: Union[str, pathlib.Path], header: list[str], rows: Iterable[list]
+) -> int:
+    """
+    Streams rows into a temporary file next to `path` that then replaces it,
+    so readers never see a half-written CSV.
+
+    :param path: The CSV to (re)write.
+    :param header: Header row.
+    :param rows: Data rows, consumed lazily.
+    :return: Number of data rows written.
+    """
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    written: int = 0
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(header)
+            for row in rows:
+                writer.writerow(row)
+                written += 1
+            csv_file.flush()
+            os.fsync(csv_file.fileno())
+        # mkstemp creates the file owner-only; keep the usual permissions.
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+    return written
+
+
+class Consolidator:
+    """
+    Builds final_team_members.csv incrementally from the result store.
+
+    The SiteIndex is the prebuilt Link -> pages index: every site's members are
+    joined to its clinic rows directly, without scanning the page list. Merged
+    rows are kept per site in the store together with a fingerprint of their
+    inputs (the site's pages and when its members were last written), so only
+    sites whose raw results changed are merged again. The CSV is then streamed
+    site by site into a temporary file that atomically replaces the output.
+    """
+
+    def __init__(
+        self, store: ResultStore, output_path: Union[str, pathlib.Path]
+    ) -> None:
+        """
+        :param store: The result store holding members and merged rows.
+        :param output_path: Path of the consolidated CSV.
+        """
+        self.store: ResultStore = store
+        self.output_path: pathlib.Path = pathlib.Path(output_path)
+
+    def fingerprint(self, site_index: SiteIndex, key: str) -> str:
+        """
+        Hashes everything a site's output rows depend on.
+        """
+        info = self.store.site_info(key) or {}
+        material = json.dumps(
+            [info.get("finished_at"), info.get("status"), site_index.sites[key].pages],
+            sort_keys=True,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def build(self, site_index: SiteIndex) -> dict:
+        """
+        Re-merges changed sites and rewrites the output CSV atomically.
+
+        :param site_index: The current SiteIndex.
+        :return: Dict with sites, merged (re-merged sites), rows and written flag.
+        """
+        merged: int = 0
+        for site in site_index:
+            fingerprint: str = self.fingerprint(site_index, site.key)
+            if self.store.consolidated_fingerprint(site.key) == fingerprint:
+                continue
+            rows = list(site_index.fan_out(site.key, self.store.members(site.key)))
+            self.store.save_consolidated(site.key, fingerprint, rows)
+            merged += 1
+        pruned: int = self.store.prune_consolidated(site_index.sites)
+
+        stats: dict = {"sites": len(site_index), "merged": merged, "rows": 0, "written": False}
+        if not merged and not pruned and self.output_path.exists():
+            return stats
+
+        stats["rows"] = write_csv_atomically(
+            self.output_path,
+            OUTPUT_HEADER,
+            (row for site in site_index for row in self.store.consolidated_rows(site.key)),
+        )
+        stats["written"] = True
+        return stats
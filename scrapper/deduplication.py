@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+import hashlib
+import pathlib
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Iterable, Iterator, Union
+
+from scrapper.consolidation import write_csv_atomically
+from scrapper.resultStore import ResultStore
+from scrapper.siteIndex import SiteIndex
+
+PEOPLE_HEADER: list[str] = ["PersonId", "Name", "Title", "Credentials", "Site", "Clinics"]
+PERSON_CLINICS_HEADER: list[str] = ["PersonId", "Url", "Company", "Location"]
+
+HONORIFICS: frozenset = frozenset({"dr", "mr", "mrs", "ms", "miss", "mx", "prof", "professor"})
+# Degrees, licences and certifications found after team member names
+CREDENTIALS: frozenset = frozenset(
+    {
+        "aba", "ba", "bs", "bsc", "bcaba", "bcba", "bcbad", "bcba-d", "cas", "ccc",
+        "cccslp", "ccc-slp", "do", "dpt", "edd", "iba", "laba", "lba", "lbs", "lcsw",
+        "lmft", "lmhc", "lpc", "lpa", "lsw", "ma", "mba", "md", "med", "mpa", "ms",
+        "msc", "msed", "msw", "np", "ot", "otd", "otr", "otrl", "otr/l", "phd", "psyd",
+        "pt", "qasp", "qba", "rbt", "rn", "slp", "slpa",
+    }
+)
+SUFFIXES: frozenset = frozenset({"jr", "sr", "ii", "iii", "iv"})
+PARENTHESES_PATTERN = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9'/-]*")
+SOUNDEX_CODES: dict[str, str] = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+# Names sharing a blocking key match above these similarities ("Jon"/"John", "Jonson"/"Johnson")
+FIRST_NAME_SIMILARITY: float = 0.85
+LAST_NAME_SIMILARITY: float = 0.85
+
+
+@lru_cache(maxsize=65536)
+def soundex(word: str) -> str:
+    """
+    American Soundex code of a word, e.g. "Robert" and "Rupert" -> "R163".
+    """
+    letters = [c for c in word.lower() if c.isalpha()]
+    if not letters:
+        return ""
+    code: list[str] = [letters[0].upper()]
+    previous: str = SOUNDEX_CODES.get(letters[0], "")
+    for letter in letters[1:]:
+        digit = SOUNDEX_CODES.get(letter, "")
+        if digit and digit != previous:
+            code.append(digit)
+            if len(code) == 4:
+                break
+        if letter not in "hw":
+            # Vowels separate repeated codes; h and w do not.
+            previous = digit
+    return "".join(code).ljust(4, "0")
+
+
+def credential_key(token: str) -> str:
+    return token.replace(".", "").replace("-", "").replace("/", "")
+
+
+def normalize_name(name: str) -> tuple[list[str], list[str]]:
+    """
+    Splits a scraped name into comparable name tokens and credentials.
+
+    Accents, honorifics, parenthesised notes, middle initials and
+    generational suffixes are dropped; "Doe, Jane" is read as "Jane Doe" and
+    anything else after a comma is taken as credentials or a title.
+
+    :param name: e.g. "Dr. Jane M. Doe, M.Ed., BCBA".
+    :return: (["jane", "doe"], ["BCBA", "MED"]).
+    """
+    text = name
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(c for c in text if not unicodedata.combining(c))
+    text = text.lower()
+    text = PARENTHESES_PATTERN.sub(" ", text)
+    head, _, tail = text.partition(",")
+    head_tokens = TOKEN_PATTERN.findall(head.replace(".", " "))
+    tail_keys = [credential_key(t) for t in TOKEN_PATTERN.findall(tail.replace(".", ""))]
+    credentials: set[str] = {key.upper() for key in tail_keys if key in CREDENTIALS}
+    if len(head_tokens) == 1 and tail_keys and not credentials and "," not in tail:
+        # "Doe, Jane": last name first.
+        head_tokens = TOKEN_PATTERN.findall(tail.replace(".", " ")) + head_tokens
+
+    tokens: list[str] = []
+    for token in head_tokens:
+        key = credential_key(token)
+        if key in HONORIFICS and not tokens:
+            continue
+        if key in CREDENTIALS and len(tokens) >= 2:
+            # Only after a full name, so last names like "Do" stay names.
+            credentials.add(key.upper())
+        elif key not in SUFFIXES:
+            token = token.strip("'-")
+            if token:
+                tokens.append(token)
+    if len(tokens) > 2:
+        # Middle initials ("jane m doe") are noise for matching.
+        tokens = [tokens[0]] + [t for t in tokens[1:-1] if len(t) > 1] + [tokens[-1]]
+    return tokens, sorted(credentials)
+
+
+def same_person(first: list[str], second: list[str]) -> bool:
+    """
+    Compares two normalized names that share a blocking key.
+    """
+    if first == second:
+        return True
+    if len(first) < 2 or len(second) < 2:
+        # A bare name cannot be told apart from others sharing it.
+        return False
+    if (
+        first[-1] != second[-1]
+        and SequenceMatcher(None, first[-1], second[-1]).ratio() < LAST_NAME_SIMILARITY
+    ):
+        return False
+    a, b = first[0], second[0]
+    if a.startswith(b) or b.startswith(a):
+        # "jen" / "jennifer", "chris" / "christopher"
+        return True
+    return SequenceMatcher(None, a, b).ratio() >= FIRST_NAME_SIMILARITY
+
+
+def person_id(site_key: str, name_tokens: list[str]) -> str:
+    """
+    Stable ID of a person: the same site and canonical name always give the same ID.
+    """
+    material = f"{site_key}|{' '.join(name_tokens)}"
+    return "p_" + hashlib.sha1(material.encode("utf-8")).hexdigest()[:16]
+
+
+class Deduplicator:
+    """
+    Links the consolidated team member rows to people.
+
+    The same person appears once per clinic of a site and, across LLM calls,
+    under variants like "Dr. Jane Doe, BCBA" and "Jane Doe". Names are
+    normalized (credentials, honorifics and initials split off) and only
+    rows sharing a blocking key (site, Soundex of the last name and first
+    initial) are compared, so the work grows with the number of rows rather than their
+    square. Every person gets an ID derived from the site and their most
+    common canonical name, which stays the same across runs.
+
+    Writes one row per person (people.csv) and one per person and clinic
+    (person_clinics.csv).
+    """
+
+    def __init__(
+        self,
+        store: ResultStore,
+        people_path: Union[str, pathlib.Path],
+        clinics_path: Union[str, pathlib.Path],
+    ) -> None:
+        """
+        :param store: The result store holding the consolidated rows.
+        :param people_path: Path of the per-person CSV.
+        :param clinics_path: Path of the person -> clinic CSV.
+        """
+        self.store: ResultStore = store
+        self.people_path: pathlib.Path = pathlib.Path(people_path)
+        self.clinics_path: pathlib.Path = pathlib.Path(clinics_path)
+
+    @staticmethod
+    def link(site_key: str, rows: Iterable[list[str]]) -> list[dict]:
+        """
+        Groups one site's consolidated rows into people.
+
+        :param site_key: Canonical site key.
+        :param rows: Rows of [Url, Name, Title, Company, Location].
+        :return: Dicts with id, name, title, credentials and clinics
+                 (distinct [Url, Company, Location] rows), in first-seen order.
+        """
+        # Each member repeats once per clinic: normalize every raw name once.
+        variants: dict[str, dict] = {}
+        for url, name, title, company, location in rows:
+            variant = variants.get(name)
+            if variant is None:
+                tokens, credentials = normalize_name(name)
+                if not tokens:
+                    continue
+                variant = variants[name] = {
+                    "tokens": tokens,
+                    "credentials": credentials,
+                    "titles": Counter(),
+                    "clinics": {},
+                    "rows": 0,
+                }
+            variant["rows"] += 1
+            if title:
+                variant["titles"][title] += 1
+            variant["clinics"].setdefault((url, company, location), None)
+
+        # Blocking key: Soundex of the last name and the first initial.
+        blocks: dict[tuple, list[str]] = defaultdict(list)
+        for name, variant in variants.items():
+            tokens = variant["tokens"]
+            blocks[(soundex(tokens[-1]), tokens[0][0] if len(tokens) > 1 else "")].append(name)
+
+        # Union-find over the variants of each block.
+        parent: dict[str, str] = {name: name for name in variants}
+
+        def find(name: str) -> str:
+            while parent[name] != name:
+                parent[name] = parent[parent[name]]
+                name = parent[name]
+            return name
+
+        for names in blocks.values():
+            for index, name in enumerate(names):
+                for other in names[:index]:
+                    if find(name) != find(other) and same_person(
+                        variants[name]["tokens"], variants[other]["tokens"]
+                    ):
+                        parent[find(name)] = find(other)
+
+        clusters: dict[str, list[str]] = defaultdict(list)
+        for name in variants:
+            clusters[find(name)].append(name)
+
+        people: list[dict] = []
+        for names in clusters.values():
+            canonical: Counter = Counter()
+            for name in names:
+                canonical[" ".join(variants[name]["tokens"])] += variants[name]["rows"]
+            # Most rows first, then the fullest name, then alphabetical: stable across runs.
+            best = min(canonical, key=lambda c: (-canonical[c], -len(c), c))
+            display = min(
+                (n for n in names if " ".join(variants[n]["tokens"]) == best),
+                key=lambda n: (len(n), n),
+            )
+            titles: Counter = Counter()
+            clinics: dict = {}
+            credentials: set[str] = set()
+            for name in names:
+                titles.update(variants[name]["titles"])
+                clinics.update(variants[name]["clinics"])
+                credentials.update(variants[name]["credentials"])
+            people.append(
+                {
+                    "id": person_id(site_key, best.split()),
+                    "name": display,
+                    "title": min(titles, key=lambda t: (-titles[t], t)) if titles else "",
+                    "credentials": sorted(credentials),
+                    "clinics": [list(clinic) for clinic in clinics],
+                    "variants": len(names),
+                }
+            )
+        return people
+
+    def build(self, site_index: SiteIndex) -> dict:
+        """
+        Links every consolidated row to a person and rewrites both CSVs atomically.
+
+        :param site_index: The current SiteIndex.
+        :return: Dict with records (consolidated rows read), people, links
+                 (person-clinic rows) and merged (name variants folded into another).
+        """
+        stats: dict = {"records": 0, "people": 0, "links": 0, "merged": 0}
+        links: list[list[str]] = []
+
+        def people_rows() -> Iterator[list[str]]:
+            for site in site_index:
+                rows = self.store.consolidated_rows(site.key)
+                stats["records"] += len(rows)
+                for person in self.link(site.key, rows):
+                    stats["people"] += 1
+                    stats["merged"] += person["variants"] - 1
+                    for url, company, location in person["clinics"]:
+                        links.append([person["id"], url, company, location])
+                    yield [
+                        person["id"],
+                        person["name"],
+                        person["title"],
+                        " ".join(person["credentials"]),
+                        site.key,
+                        str(len(person["clinics"])),
+                    ]
+
+        write_csv_atomically(self.people_path, PEOPLE_HEADER, people_rows())
+        stats["links"] = write_csv_atomically(self.clinics_path, PERSON_CLINICS_HEADER, links)
+        return stats
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+import json
+import os
+import pathlib
+import threading
+import time
+from typing import Any, Callable, Iterable, Optional, Union
+
+STATUS_OK: str = "ok"
+STATUS_FAILED: str = "failed"
+
+
+class DiscoveryJournal:
+    """
+    Append-only JSONL journal that makes long discovery runs resumable.
+
+    Every outcome is appended (and fsynced) as soon as it is known, one JSON
+    object per line: {"key", "status", "attempt", "result", "error", "ts"}.
+    On restart the journal is replayed: completed keys are skipped, and failed
+    keys are retried until they reach `max_attempts`. A line cut short by a
+    crash is ignored.
+    """
+
+    def __init__(self, path: Union[str, pathlib.Path], max_attempts: int = 3) -> None:
+        """
+        :param path: Journal file (created if missing).
+        :param max_attempts: Attempts after which a failing key is given up.
+        """
+        self.path: pathlib.Path = pathlib.Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts: int = max(1, max_attempts)
+        self._entries: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._load()
+        self._file = self.path.open("a", encoding="utf-8")
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        with self.path.open("r", encoding="utf-8") as journal_file:
+            for line in journal_file:
+                try:
+                    entry: dict = json.loads(line)
+                except ValueError:
+                    # Partial line left by a crash mid-write.
+                    continue
+                self._entries[entry["key"]] = entry
+
+    def _append(self, entry: dict) -> None:
+        with self._lock:
+            self._entries[entry["key"]] = entry
+            self._file.write(json.dumps(entry) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def attempts(self, key: str) -> int:
+        """
+        Returns how many times `key` has been attempted.
+        """
+        entry: Optional[dict] = self._entries.get(key)
+        return entry["attempt"] if entry else 0
+
+    def is_done(self, key: str) -> bool:
+        """
+        Returns True if `key` completed successfully.
+        """
+        entry: Optional[dict] = self._entries.get(key)
+        return bool(entry) and entry["status"] == STATUS_OK
+
+    def is_settled(self, key: str) -> bool:
+        """
+        Returns True if `key` succeeded or has used up all its attempts.
+        """
+        return self.is_done(key) or self.attempts(key) >= self.max_attempts
+
+    def pending(self, items: Iterable[Any], key: Callable[[Any], str]) -> list[Any]:
+        """
+        Filters `items` down to the ones that still need to be (re)tried.
+
+        :param items: Work items, e.g. contacts.
+        :param key: Function returning the journal key of an item.
+        :return: Items that are new or failed with attempts left.
+        """
+        return [item for item in items if not self.is_settled(key(item))]
+
+    def record_success(self, key: str, result: Any) -> None:
+        """
+        Appends a successful outcome for `key`.
+        """
+        self._append(
+            {
+                "key": key,
+                "status": STATUS_OK,
+                "attempt": self.attempts(key) + 1,
+                "result": result,
+                "error": None,
+                "ts": time.time(),
+            }
+        )
+
+    def record_failure(self, key: str, error: str, result: Any = None) -> None:
+        """
+        Appends a failed outcome for `key`, optionally with a partial result.
+        """
+        self._append(
+            {
+                "key": key,
+                "status": STATUS_FAILED,
+                "attempt": self.attempts(key) + 1,
+                "result": result,
+                "error": error,
+                "ts": time.time(),
+            }
+        )
+
+    def result(self, key: str) -> Any:
+        """
+        Returns the latest result recorded for `key` (None if never recorded).
+        """
+        entry: Optional[dict] = self._entries.get(key)
+        return entry["result"] if entry else None
+
+    def close(self) -> None:
+        """
+        Closes the journal file.
+        """
+        with self._lock:
+            self._file.close()
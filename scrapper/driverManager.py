@@ -1,8 +1,39 @@
 #!/usr/bin/env python3
+import json
+
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 
+# URL patterns blocked at the network layer by the lean profile.
+LEAN_BLOCKED_URLS: list[str] = [
+    # Images
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    # Fonts
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    # Media
+    "*.mp4", "*.webm", "*.mp3", "*.m4a", "*.ogg",
+    # Analytics and ads
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*hotjar.com*", "*clarity.ms*",
+    # HubSpot scripts and cookie banners
+    "*hs-scripts.com*", "*hs-analytics.net*", "*hs-banner.com*", "*hsforms.net*",
+    "*hscollectedforms.net*", "*usemessages.com*",
+]
+
+# Typical transfer size (bytes) per resource type, used to estimate what a
+# blocked request would have cost.
+ESTIMATED_RESOURCE_BYTES: dict[str, int] = {
+    "Image": 40_000,
+    "Font": 35_000,
+    "Media": 500_000,
+    "Script": 30_000,
+    "Stylesheet": 15_000,
+}
+DEFAULT_RESOURCE_BYTES: int = 5_000
+
+LEAN_WINDOW_SIZE: str = "1280,800"
+
 
 class ChromeDriverManager:
     """
@@ -11,15 +42,24 @@ class ChromeDriverManager:
     Attributes:
         driver: An instance of Selenium WebDriver.
         wait: A WebDriverWait instance for explicit waits.
+        lean: Whether the lightweight profile is active.
+        page_stats: Per-page network stats collected in lean mode.
     """
 
-    def __init__(self, headless: bool = False, wait_time: int = 20) -> None:
+    def __init__(
+        self, headless: bool = False, wait_time: int = 20, lean: bool = False
+    ) -> None:
         """
         Initializes Chrome with the specified options.
 
+        The lean profile uses the "eager" page-load strategy, a small fixed
+        viewport, and blocks images, fonts, media, analytics and the HubSpot
+        cookie banner at the network layer.
+
         :param headless: Boolean flag to run Chrome in headless mode.
         :param driver_path: Optional path to the chromedriver executable.
         :param wait_time: Timeout (in seconds) for explicit wait operations.
+        :param lean: Boolean flag to enable the lightweight browser profile.
         """
         chrome_options: Options = Options()
         if headless:
@@ -27,12 +67,69 @@ class ChromeDriverManager:
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
+        if lean:
+            chrome_options.page_load_strategy = "eager"
+            chrome_options.add_argument(f"--window-size={LEAN_WINDOW_SIZE}")
+            chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+            chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
 
         self.driver: webdriver.Chrome = webdriver.Chrome(options=chrome_options)
+        self.lean: bool = lean
+        self.page_stats: list[dict] = []
 
-        self.driver.maximize_window()
+        if lean:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd(
+                "Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS}
+            )
+        else:
+            self.driver.maximize_window()
         self.wait: WebDriverWait = WebDriverWait(self.driver, wait_time)
 
+    def collect_page_stats(self, url: str) -> dict:
+        """
+        Summarizes the network activity since the previous call (lean mode only).
+
+        Reads Chrome's performance log and counts transferred bytes and requests
+        blocked by the lean profile. Bytes saved are estimated from typical
+        sizes per blocked resource type.
+
+        :param url: The page the activity belongs to.
+        :return: Dict with url, requests, bytes_transferred, blocked_requests and bytes_saved.
+        """
+        stats: dict = {
+            "url": url,
+            "requests": 0,
+            "bytes_transferred": 0,
+            "blocked_requests": 0,
+            "bytes_saved": 0,
+        }
+        try:
+            entries: list[dict] = self.driver.get_log("performance")
+        except Exception as e:
+            print(f"Could not read performance log: {e}")
+            entries = []
+
+        for entry in entries:
+            try:
+                message: dict = json.loads(entry["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            method: str = message.get("method", "")
+            params: dict = message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                stats["requests"] += 1
+            elif method == "Network.loadingFinished":
+                stats["bytes_transferred"] += int(params.get("encodedDataLength", 0))
+            elif method == "Network.loadingFailed" and params.get("blockedReason"):
+                stats["blocked_requests"] += 1
+                stats["bytes_saved"] += ESTIMATED_RESOURCE_BYTES.get(
+                    params.get("type", ""), DEFAULT_RESOURCE_BYTES
+                )
+
+        self.page_stats.append(stats)
+        return stats
+
     def quit(self) -> None: 
         """
         Closes the Chrome WebDriver.
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Optional
+
+from selenium.common.exceptions import WebDriverException
+
+from scrapper.driverManager import ChromeDriverManager
+
+# How often a thread waiting for a browser checks whether a slot was freed
+ACQUIRE_POLL_SECONDS: float = 1.0
+
+
+class DriverPool:
+    """
+    A fixed-size pool of ChromeDriverManager instances with a parallel work queue.
+
+    Work items are handed to whichever browser is free. Browsers are started on
+    demand (up to `size`), recycled after `max_pages` items to contain memory
+    leaks, and replaced when they crash. Results are returned in input order.
+
+    Attributes:
+        size: Maximum number of concurrent browsers.
+        max_pages: Number of items a browser handles before it is recycled.
+        retries: How many times an item is retried on a fresh browser after a crash.
+        acquire_timeout: Seconds to wait for a free browser before giving up.
+    """
+
+    def __init__(
+        self,
+        size: int = 4,
+        max_pages: int = 50,
+        retries: int = 1,
+        factory: Optional[Callable[[], ChromeDriverManager]] = None,
+        acquire_timeout: float = 600,
+    ) -> None:
+        """
+        Initializes the pool.
+
+        :param size: Number of browsers (and worker threads) to run.
+        :param max_pages: Recycle a browser after it has processed this many items.
+        :param retries: Number of retries on a fresh browser when a driver crashes.
+        :param factory: Callable creating a ChromeDriverManager (defaults to headless
+                        Chrome with the lean profile).
+        :param acquire_timeout: Seconds to wait for a free browser; a TimeoutError
+                                is raised instead of waiting forever when every
+                                browser stays leased.
+        """
+        self.size: int = max(1, size)
+        self.max_pages: int = max(1, max_pages)
+        self.retries: int = max(0, retries)
+        self.acquire_timeout: float = acquire_timeout
+        self.factory: Callable[[], ChromeDriverManager] = factory or (
+            lambda: ChromeDriverManager(headless=True, lean=True)
+        )
+        self._idle: "queue.LifoQueue[ChromeDriverManager]" = queue.LifoQueue()
+        self._pages: dict[int, int] = {}
+        self._managers: list[ChromeDriverManager] = []
+        self._starting: int = 0
+        self._lock = threading.Lock()
+        self.recycled: int = 0
+
+    def _acquire(self) -> ChromeDriverManager:
+        """
+        Returns an idle browser, starting a new one while below the pool size.
+
+        While every browser is leased this waits for one to be released, or for
+        a slot to be freed by a discarded browser, for up to `acquire_timeout`.
+        """
+        deadline = time.monotonic() + self.acquire_timeout
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                can_start = len(self._managers) + self._starting < self.size
+                if can_start:
+                    self._starting += 1
+            if can_start:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(
+                    f"No browser became free within {self.acquire_timeout:.0f}s: all "
+                    f"{self.size} are leased (one may have been dropped instead of released)"
+                )
+            try:
+                return self._idle.get(timeout=min(remaining, ACQUIRE_POLL_SECONDS))
+            except queue.Empty:
+                continue
+        try:
+            manager = self.factory()
+        finally:
+            with self._lock:
+                self._starting -= 1
+        with self._lock:
+            self._managers.append(manager)
+            self._pages[id(manager)] = 0
+        return manager
+
+    def _release(self, manager: ChromeDriverManager) -> None:
+        """
+        Returns a browser to the idle queue, recycling it once it hit max_pages.
+        """
+        with self._lock:
+            self._pages[id(manager)] += 1
+            worn_out = self._pages[id(manager)] >= self.max_pages
+        if worn_out:
+            self._discard(manager)
+        else:
+            self._idle.put(manager)
+
+    def _discard(self, manager: ChromeDriverManager) -> None:
+        """
+        Quits a browser and frees its slot so a fresh one can be started.
+        """
+        try:
+            manager.quit()
+        except Exception as e:
+            print(f"Error quitting driver: {e}")
+        with self._lock:
+            if manager in self._managers:
+                self._managers.remove(manager)
+            self._pages.pop(id(manager), None)
+            self.recycled += 1
+
+    def run(self, func: Callable[[Any, Any], Any], item: Any, lazy: bool = False) -> Any:
+        """
+        Runs one work item on a free browser, retrying on a fresh browser if the
+        driver crashes. Safe to call from many threads at once (e.g. the workers
+        of a streaming pipeline stage).
+
+        :param func: Callable receiving a ChromeDriverManager and the work item.
+        :param item: The work item.
+        :param lazy: Pass `func` a callable returning the browser instead, so a
+                     browser is only taken (and started) if `func` needs one,
+                     e.g. after the HTTP backend could not read a page.
+        :return: What `func` returned.
+        """
+        attempt = 0
+        while True:
+            leased: list[ChromeDriverManager] = []
+
+            def browser() -> ChromeDriverManager:
+                if not leased:
+                    leased.append(self._acquire())
+                return leased[0]
+
+            try:
+                result = func(browser if lazy else browser(), item)
+            except WebDriverException as e:
+                if leased:
+                    self._discard(leased[0])
+                if attempt >= self.retries:
+                    raise
+                attempt += 1
+                print(f"Driver crashed ({e.__class__.__name__}), retrying on a fresh browser.")
+                continue
+            except Exception:
+                if leased:
+                    self._release(leased[0])
+                raise
+            if leased:
+                self._release(leased[0])
+            return result
+
+    def map(
+        self, func: Callable[[Any, Any], Any], items: Iterable[Any], lazy: bool = False
+    ) -> list[Any]:
+        """
+        Applies `func(manager, item)` to every item using the pooled browsers.
+
+        :param func: Callable receiving a ChromeDriverManager and a work item.
+        :param items: Work items (e.g. contacts).
+        :param lazy: Pass `func` a callable returning the browser (see `run`).
+        :return: The results, in the same order as `items`.
+        """
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(lambda item: self.run(func, item, lazy), items))
+
+    def close(self) -> None:
+        """
+        Quits every browser owned by the pool.
+        """
+        with self._lock:
+            managers = list(self._managers)
+            self._managers.clear()
+            self._pages.clear()
+        for manager in managers:
+            try:
+                manager.quit()
+            except Exception as e:
+                print(f"Error quitting driver: {e}")
+        self._idle = queue.LifoQueue()
+
+    def __enter__(self) -> "DriverPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class BrowserlessPool:
+    """
+    DriverPool stand-in for runs that never start a browser (offline replay, or
+    server-rendered directories): `func` receives None instead of a driver manager.
+    """
+
+    def __init__(self, size: int = 4, max_pages: int = 50, **kwargs) -> None:
+        self.size: int = max(1, size)
+
+    def run(self, func: Callable[[None, Any], Any], item: Any, lazy: bool = False) -> Any:
+        return func(None, item)
+
+    def map(
+        self, func: Callable[[None, Any], Any], items: Iterable[Any], lazy: bool = False
+    ) -> list[Any]:
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(lambda item: func(None, item), items))
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "BrowserlessPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+import re
+from typing import Optional
+
+import requests
+from lxml import html
+from lxml.cssselect import CSSSelector
+from lxml.etree import XPath
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from scrapper.htmlReducer import content_fingerprint
+from scrapper.pageArchive import PageArchive
+from scrapper.telemetry import Telemetry
+
+# Replace any en dash or em dash with a plain hyphen with spaces.
+DASH_PATTERN = re.compile(r"\s*[–—]\s*")
+
+# XPath of the block holding the provider website on a directory detail page.
+CONTACT_DETAILS_XPATH: str = (
+    '//*[@id="main-content"]/div/div/div[1]/div[3]/div[1]/div[3]/div/div[2]/div'
+)
+
+# Response headers kept with archived pages.
+ARCHIVED_HEADERS: tuple = ("Content-Type", "ETag", "Last-Modified")
+
+DEFAULT_HEADERS: dict = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+class HttpFetchBackend:
+    """
+    Fetches directory pages over plain HTTP and parses them with lxml.
+
+    The ABA Therapy Directory renders its listing cards and provider details
+    on the server, so the data can be read without a browser. A single pooled
+    `requests.Session` is reused for every request, and all selectors are
+    compiled once at class level.
+
+    Parsing methods return None when the page could not be fetched or does not
+    contain the expected markup, which tells the caller to fall back to Selenium.
+
+    When a validator store is attached, the ETag, Last-Modified and content
+    fingerprint of every fetched page are recorded, so `fetch_if_changed` can
+    later ask with a conditional request whether the page changed.
+
+    When a PageArchive is attached, every response is archived and pages
+    already fetched during this run are served from it. In offline mode the
+    archive is the only source and the network is never used.
+
+    Every request is timed as an "http.get" span of the attached Telemetry,
+    and `aba_fetch_total` counts pages by source (archive, network, failed).
+    """
+
+    NO_RESULTS = CSSSelector(".dp-dfg-no-results")
+    CONTAINERS = CSSSelector(".dp-dfg-items")
+    ARTICLES = CSSSelector("article")
+    TITLE_LINK = CSSSelector("h3.entry-title a")
+    CITY_STATE = CSSSelector(".city-state")
+    CONTACT_DETAILS = XPath(CONTACT_DETAILS_XPATH)
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        pool_size: int = 16,
+        timeout: float = 20,
+        retries: int = 2,
+        validators=None,
+        archive: Optional[PageArchive] = None,
+        offline: bool = False,
+        telemetry: Optional[Telemetry] = None,
+    ) -> None:
+        """
+        Initializes the backend with a pooled HTTP session.
+
+        :param session: Optional preconfigured session (mainly for tests).
+        :param pool_size: Maximum number of kept-alive connections per host.
+        :param timeout: Timeout (in seconds) for each request.
+        :param retries: Number of retries on connection errors and 5xx responses.
+        :param validators: Optional store of page validators (e.g. a ResultStore).
+        :param archive: Optional PageArchive receiving every fetched page.
+        :param offline: Replay pages from `archive` only, without network access.
+        :param telemetry: Telemetry receiving request spans and fetch counters.
+        """
+        if offline and archive is None:
+            raise ValueError("Offline mode needs a page archive")
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=pool_size,
+                pool_maxsize=pool_size,
+                max_retries=Retry(
+                    total=retries,
+                    backoff_factor=0.5,
+                    status_forcelist=(500, 502, 503, 504),
+                ),
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update(DEFAULT_HEADERS)
+        self.session: requests.Session = session
+        self.timeout: float = timeout
+        self.validators = validators
+        self.archive: Optional[PageArchive] = archive
+        self.offline: bool = offline
+        self.telemetry: Telemetry = telemetry or Telemetry()
+
+    def record_validators(self, url: str, response: requests.Response) -> bool:
+        """
+        Records a response's validators and content fingerprint.
+
+        :return: True if the content differs from the recorded fingerprint.
+        """
+        return self.validators.save_page_validators(
+            url,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+            content_fingerprint(response.text),
+        )
+
+    def fetch(self, url: str, quiet: bool = False) -> Optional[str]:
+        """
+        Downloads a page and returns its HTML.
+
+        :param url: The URL to fetch.
+        :param quiet: Do not report failures (for optional resources like sitemap.xml).
+        :return: The response body, or None if the request failed.
+        """
+        if self.archive is not None:
+            # Online, only copies fetched during this run are reused.
+            since: Optional[float] = None if self.offline else self.archive.opened_at
+            record: Optional[dict] = self.archive.get(url, since=since)
+            if record is not None:
+                self.telemetry.count("fetch_total", source="archive")
+                return record["body"]
+            if self.offline:
+                self.telemetry.count("fetch_total", source="failed")
+                if not quiet:
+                    print(f"Not in the page archive (offline): {url}")
+                return None
+        with self.telemetry.span("http.get", url=url) as span:
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+                span["attributes"]["status"] = response.status_code
+                response.raise_for_status()
+            except requests.RequestException as e:
+                span["error"] = str(e)
+                self.telemetry.count("fetch_total", source="failed")
+                if not quiet:
+                    print(f"HTTP fetch failed for {url}: {e}")
+                return None
+        self.telemetry.count("fetch_total", source="network")
+        if self.validators is not None:
+            self.record_validators(url, response)
+        self.archive_response(url, response)
+        return response.text
+
+    def archive_response(self, url: str, response: requests.Response) -> None:
+        """
+        Writes a response to the page archive, if there is one.
+        """
+        if self.archive is not None:
+            headers = {h: response.headers[h] for h in ARCHIVED_HEADERS if h in response.headers}
+            self.archive.put(url, response.text, response.status_code, headers)
+
+    def fetch_if_changed(self, url: str) -> Optional[bool]:
+        """
+        Checks with a conditional request whether a page changed since it was recorded.
+
+        The recorded ETag and Last-Modified are sent as If-None-Match and
+        If-Modified-Since. A 304 means unchanged; otherwise the normalized
+        content fingerprint is compared, since many servers send no validators.
+
+        :param url: The page URL.
+        :return: True if changed (or never recorded), False if unchanged, None if
+                 the page could not be fetched. Always False in offline mode.
+        """
+        if self.offline:
+            return False
+        recorded = self.validators.page_validators(url) if self.validators is not None else None
+        headers: dict = {}
+        if recorded and recorded["etag"]:
+            headers["If-None-Match"] = recorded["etag"]
+        if recorded and recorded["last_modified"]:
+            headers["If-Modified-Since"] = recorded["last_modified"]
+        with self.telemetry.span("http.get", url=url, conditional=True) as span:
+            try:
+                response = self.session.get(url, timeout=self.timeout, headers=headers)
+                span["attributes"]["status"] = response.status_code
+                if response.status_code == 304 and recorded:
+                    self.validators.touch_page_validators(url)
+                    return False
+                response.raise_for_status()
+            except requests.RequestException as e:
+                span["error"] = str(e)
+                print(f"HTTP fetch failed for {url}: {e}")
+                return None
+        self.archive_response(url, response)
+        if self.validators is None:
+            return True
+        return self.record_validators(url, response)
+
+    def parse(self, url: str) -> Optional[html.HtmlElement]:
+        """
+        Fetches a page and parses it into an lxml tree with absolute links.
+
+        :param url: The URL to fetch.
+        :return: The parsed document, or None if it could not be fetched.
+        """
+        body = self.fetch(url)
+        if not body:
+            return None
+        try:
+            document = html.fromstring(body)
+        except Exception as e:
+            print(f"Could not parse {url}: {e}")
+            return None
+        document.make_links_absolute(url)
+        return document
+
+    def scrape_listing(self, url: str) -> Optional[list[dict]]:
+        """
+        Extracts contact cards from a directory listing page.
+
+        :param url: The listing page URL.
+        :return: A list of contact dicts (Name, Url, Location), an empty list
+                 when the page reports no results, or None when the page could
+                 not be read and Selenium should be used instead.
+        """
+        document = self.parse(url)
+        if document is None:
+            return None
+
+        contacts: list[dict] = []
+        for container in self.CONTAINERS(document):
+            for article in self.ARTICLES(container):
+                title_links = self.TITLE_LINK(article)
+                if not title_links:
+                    continue
+                title_element = title_links[0]
+                title: str = DASH_PATTERN.sub(
+                    " - ", title_element.text_content().strip()
+                )
+                article_url: str = title_element.get("href") or ""
+                cities = self.CITY_STATE(article)
+                city: str = cities[0].text_content().strip() if cities else ""
+
+                if title or article_url or city:
+                    contacts.append(
+                        {"Name": title, "Url": article_url, "Location": city}
+                    )
+
+        if contacts or self.NO_RESULTS(document):
+            return contacts
+        return None
+
+    def get_company_url(self, url: str) -> Optional[str]:
+        """
+        Extracts the provider website from a directory detail page.
+
+        :param url: The provider detail page URL.
+        :return: The website text, or None when the page could not be read.
+        """
+        document = self.parse(url)
+        if document is None:
+            return None
+        details = self.CONTACT_DETAILS(document)
+        if not details:
+            return None
+        return details[0].text_content().strip()
+
+    def close(self) -> None:
+        """
+        Closes the pooled HTTP session.
+        """
+        self.session.close()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+import hashlib
+import re
+from typing import Optional
+
+from lxml import html
+from lxml.cssselect import CSSSelector
+
+# Rough size of one LLM token in characters.
+CHARS_PER_TOKEN: int = 4
+
+# Elements that never carry page content.
+DROPPED_TAGS: tuple = (
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe",
+    "form", "button", "select", "input", "textarea", "nav", "aside",
+)
+
+# Page chrome, dropped unless it belongs to an article or section
+# (a team member card may be an <article> with its own <header>).
+CHROME_TAGS: tuple = ("header", "footer")
+
+# id/class words marking boilerplate blocks (cookie banners, menus, popups, ...).
+BOILERPLATE_PATTERN = re.compile(
+    r"(^|[-_])(cookies?|consent|gdpr|navbar|navigation|menu|footer|"
+    r"sidebar|popup|modal|breadcrumbs?|social|share|skip-link)([-_]|$)"
+)
+BOILERPLATE_EXACT: frozenset = frozenset({"nav", "header", "site-header", "topbar"})
+
+HEADING_TAGS: frozenset = frozenset({"h1", "h2", "h3", "h4", "h5", "h6"})
+BLOCK_TAGS: frozenset = frozenset(
+    {
+        "p", "div", "section", "article", "main", "li", "dt", "dd", "tr", "td", "th",
+        "blockquote", "figure", "figcaption", "br", "ul", "ol", "table",
+    }
+) | HEADING_TAGS
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Returns a rough token count for `text` (about CHARS_PER_TOKEN characters per token).
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+class HtmlReducer:
+    """
+    Shrinks an HTML page to the compact text an LLM needs to read.
+
+    Scripts, styles, navigation, headers, footers and blocks whose id or class
+    marks them as boilerplate (cookie banners, menus, popups) are dropped. The
+    main content region is kept when the page has one, and the rest is
+    collapsed to markdown-like lines: "#" headings, "-" list items and image
+    alt texts (team photos are often only labelled there). The text is then
+    split into chunks of at most `max_tokens` estimated tokens.
+    """
+
+    MAIN_REGIONS = CSSSelector("main, [role=main], #main-content, #content, article")
+
+    def __init__(self, max_tokens: int = 4000, min_main_ratio: float = 0.3) -> None:
+        """
+        :param max_tokens: Token budget of one chunk.
+        :param min_main_ratio: Share of the page text the main region must hold to
+                               be used instead of the whole body.
+        """
+        self.max_tokens: int = max(1, max_tokens)
+        self.min_main_ratio: float = min_main_ratio
+
+    @staticmethod
+    def is_boilerplate(element: html.HtmlElement) -> bool:
+        """
+        Returns True if the element's id or classes mark it as boilerplate.
+        """
+        words = (element.get("class") or "").lower().split()
+        words.append((element.get("id") or "").lower())
+        return any(
+            word in BOILERPLATE_EXACT or BOILERPLATE_PATTERN.search(word)
+            for word in words
+            if word
+        )
+
+    def strip(self, document: html.HtmlElement) -> None:
+        """
+        Removes non-content elements from `document` in place.
+        """
+        for element in list(document.iter()):
+            if not isinstance(element.tag, str):
+                # Comments and processing instructions.
+                element.drop_tree()
+            elif element.tag in DROPPED_TAGS or (
+                element.tag not in ("html", "body", "main") and self.is_boilerplate(element)
+            ):
+                if element.getparent() is not None:
+                    element.drop_tree()
+            elif element.tag in CHROME_TAGS and not any(
+                ancestor.tag in ("article", "section") for ancestor in element.iterancestors()
+            ):
+                element.drop_tree()
+
+    def main_region(self, document: html.HtmlElement) -> html.HtmlElement:
+        """
+        Returns the main content element, or the body when no region holds
+        enough of the page text.
+        """
+        body = document.find("body")
+        if body is None:
+            body = document
+        total: int = len(body.text_content().strip())
+        for region in self.MAIN_REGIONS(document):
+            if total and len(region.text_content().strip()) >= total * self.min_main_ratio:
+                return region
+        return body
+
+    @staticmethod
+    def to_lines(element: html.HtmlElement) -> list[str]:
+        """
+        Collapses an element to markdown-like text lines.
+        """
+        lines: list[str] = []
+        current: list[str] = []
+
+        def flush(prefix: str = "") -> None:
+            text = WHITESPACE_PATTERN.sub(" ", " ".join(current)).strip()
+            current.clear()
+            if text and (not lines or lines[-1] != prefix + text):
+                lines.append(prefix + text)
+
+        def walk(node: html.HtmlElement) -> None:
+            tag = node.tag if isinstance(node.tag, str) else ""
+            if tag in BLOCK_TAGS:
+                flush()
+            if tag == "img" and node.get("alt"):
+                current.append(node.get("alt"))
+            if node.text:
+                current.append(node.text)
+            for child in node:
+                walk(child)
+            if tag in HEADING_TAGS:
+                flush("#" * int(tag[1]) + " ")
+            elif tag in ("li", "dt"):
+                flush("- ")
+            elif tag in BLOCK_TAGS:
+                flush()
+            if node.tail:
+                current.append(node.tail)
+
+        walk(element)
+        flush()
+        return lines
+
+    def chunk(self, lines: list[str]) -> list[str]:
+        """
+        Groups lines into chunks of at most `max_tokens` estimated tokens.
+        A single line longer than the budget is split.
+        """
+        limit: int = self.max_tokens * CHARS_PER_TOKEN
+        chunks: list[str] = []
+        current: list[str] = []
+        size: int = 0
+        pieces: list[str] = []
+        for line in lines:
+            pieces.extend(line[i : i + limit] for i in range(0, len(line), limit))
+        for piece in pieces:
+            if current and size + len(piece) + 1 > limit:
+                chunks.append("\n".join(current))
+                current, size = [], 0
+            current.append(piece)
+            size += len(piece) + 1
+        if current:
+            chunks.append("\n".join(current))
+        return chunks
+
+    def reduce(self, page: str, url: Optional[str] = None) -> dict:
+        """
+        Reduces an HTML page to compact text chunks.
+
+        :param page: The raw HTML.
+        :param url: The page URL (reported back only).
+        :return: Dict with url, text, chunks, tokens_before and tokens_after.
+        """
+        stats: dict = {
+            "url": url,
+            "text": "",
+            "chunks": [],
+            "tokens_before": estimate_tokens(page),
+            "tokens_after": 0,
+        }
+        if not page or not page.strip():
+            return stats
+        try:
+            document = html.fromstring(page)
+        except Exception as e:
+            print(f"Could not parse {url}: {e}")
+            return stats
+
+        self.strip(document)
+        lines = self.to_lines(self.main_region(document))
+        stats["text"] = "\n".join(lines)
+        stats["chunks"] = self.chunk(lines)
+        stats["tokens_after"] = estimate_tokens(stats["text"])
+        return stats
+
+
+def content_fingerprint(page: str) -> str:
+    """
+    Hashes the normalized content of a page: its reduced text, lower-cased with
+    whitespace collapsed, so changing scripts, nonces or menus do not count as
+    a change. Pages without readable text are hashed as they are.
+    """
+    text: str = HtmlReducer().reduce(page)["text"] or page
+    normalized: str = WHITESPACE_PATTERN.sub(" ", text.lower()).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
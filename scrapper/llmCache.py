@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import pathlib
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Optional, Union
+
+COMMENT_PATTERN = re.compile(r"<!--.*?-->", re.DOTALL)
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+class LLMCache:
+    """
+    Persistent, content-addressed cache of LLM graph results backed by SQLite.
+
+    Entries are keyed on (prompt, model id, hash of the normalized page
+    content), so a result is reused for as long as the page it was computed
+    from does not change. Entries expire after `ttl` seconds, and the least
+    recently used entries are evicted once more than `max_entries` are stored.
+
+    Attributes:
+        hits: Number of lookups answered from the cache.
+        misses: Number of lookups that had to call the LLM.
+        bypass: When True, lookups always miss (fresh results are still stored).
+    """
+
+    def __init__(
+        self,
+        path: Union[str, pathlib.Path] = "data/llm_cache.sqlite",
+        ttl: float = 30 * 24 * 3600,
+        max_entries: int = 50_000,
+        bypass: bool = False,
+    ) -> None:
+        """
+        :param path: SQLite database file (":memory:" for a throwaway cache).
+        :param ttl: Time-to-live of an entry in seconds.
+        :param max_entries: Maximum number of entries kept before LRU eviction.
+        :param bypass: Skip cache reads, e.g. to force fresh LLM results.
+        """
+        if str(path) != ":memory:":
+            pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.ttl: float = ttl
+        self.max_entries: int = max_entries
+        self.bypass: bool = bypass
+        self.hits: int = 0
+        self.misses: int = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def content_hash(content: str) -> str:
+        """
+        Hashes page content after dropping HTML comments and collapsing whitespace.
+
+        :param content: Raw page content.
+        :return: Hex SHA-256 digest of the normalized content.
+        """
+        normalized: str = COMMENT_PATTERN.sub("", content)
+        normalized = WHITESPACE_PATTERN.sub(" ", normalized).strip()
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def make_key(self, prompt: str, model: str, content: str) -> str:
+        """
+        Builds the cache key for a prompt, model and page content.
+        """
+        material: str = "\0".join([prompt, model, self.content_hash(content)])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, prompt: str, model: str, content: str) -> Optional[Any]:
+        """
+        Looks up a cached result.
+
+        :param prompt: The graph prompt.
+        :param model: The model id.
+        :param content: The page content the result was computed from.
+        :return: The cached result, or None on a miss.
+        """
+        if self.bypass:
+            with self._lock:
+                self.misses += 1
+            return None
+        key: str = self.make_key(prompt, model, content)
+        now: float = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, prompt: str, model: str, content: str, value: Any) -> None:
+        """
+        Stores a result and evicts the least recently used entries if needed.
+
+        :param prompt: The graph prompt.
+        :param model: The model id.
+        :param content: The page content the result was computed from.
+        :param value: A JSON-serializable result.
+        """
+        key: str = self.make_key(prompt, model, content)
+        now: float = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, model, json.dumps(value), now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,)
+            )
+            self._conn.execute(
+                """
+                DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def stats(self) -> dict:
+        """
+        Returns hit/miss counters and the number of stored entries.
+        """
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self)}
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+import json
+import mmap
+import os
+import pathlib
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Optional, Union
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS records (
+    url TEXT PRIMARY KEY,
+    segment INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    codec TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    source TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+"""
+
+# Start of every record, so a segment can be scanned (and repaired) without the index.
+RECORD_MAGIC: bytes = b"ARCHIVE/1.0\n"
+
+
+class PageArchive:
+    """
+    Append-only archive of fetched pages, shared by the scraper and the extractor.
+
+    Like a WARC file, each segment holds a sequence of records: a magic line,
+    a JSON header line (url, status, headers, codec, length, fetched_at) and
+    the compressed body. Bodies are compressed with zstd (zlib when the
+    `zstandard` package is not installed). A SQLite index maps each URL to its
+    latest record, and segments are read back through memory maps.
+
+    Several processes (e.g. WORK_QUEUE workers) may share one archive: a
+    record is appended under an exclusive lock on its segment, and its offset
+    is taken from the segment's size while the lock is held. The index uses
+    SQLite's rollback journal, which (unlike WAL) works on the network file
+    systems such workers share.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, pathlib.Path] = "data/archive",
+        segment_max_bytes: int = 256 * 1024 * 1024,
+        level: int = 3,
+    ) -> None:
+        """
+        :param directory: Directory holding the segments and the index.
+        :param segment_max_bytes: Size after which a new segment is started.
+        :param level: Compression level.
+        """
+        self.directory: pathlib.Path = pathlib.Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_max_bytes: int = segment_max_bytes
+        self.codec: str = "zstd" if zstandard is not None else "zlib"
+        self.level: int = level
+        self.opened_at: float = time.time()
+        self._lock = threading.Lock()
+        # Other writers may hold the index lock for a moment (no WAL on shared storage)
+        self._conn = sqlite3.connect(
+            str(self.directory / "index.sqlite"), timeout=60, check_same_thread=False
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=DELETE")
+        self._conn.executescript(SCHEMA)
+        segments = sorted(self.directory.glob("segment-*.warc"))
+        self._segment: int = int(segments[-1].stem.split("-")[1]) if segments else 0
+        self._writer = self.segment_path(self._segment).open("ab")
+        self._maps: dict[int, mmap.mmap] = {}
+
+    def segment_path(self, segment: int) -> pathlib.Path:
+        """
+        Returns the path of a segment file.
+        """
+        return self.directory / f"segment-{segment:05d}.warc"
+
+    def compress(self, data: bytes) -> bytes:
+        """
+        Compresses a record body with the archive's codec.
+        """
+        if self.codec == "zstd":
+            return zstandard.ZstdCompressor(level=self.level).compress(data)
+        return zlib.compress(data, self.level)
+
+    @staticmethod
+    def decompress(data: bytes, codec: str) -> bytes:
+        """
+        Decompresses a record body written with `codec`.
+        """
+        if codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError("The archive holds zstd records; install zstandard to read them")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return zlib.decompress(data)
+
+    def put(
+        self,
+        url: str,
+        body: str,
+        status: int = 200,
+        headers: Optional[dict] = None,
+        source: str = "http",
+    ) -> None:
+        """
+        Appends a fetched page and points the index at it.
+
+        :param url: The page URL.
+        :param body: The page content.
+        :param status: HTTP status code.
+        :param headers: Response headers worth keeping (e.g. ETag, Content-Type).
+        :param source: What fetched the page ("http" or "browser").
+        """
+        payload: bytes = self.compress(body.encode("utf-8"))
+        now: float = time.time()
+        header: dict = {
+            "url": url,
+            "status": status,
+            "headers": dict(headers or {}),
+            "source": source,
+            "codec": self.codec,
+            "length": len(payload),
+            "fetched_at": now,
+        }
+        header_line: bytes = json.dumps(header).encode("utf-8") + b"\n"
+        with self._lock:
+            while True:
+                self._lock_writer(True)
+                # Other processes append to the same segment: its end is only known under the lock.
+                end: int = os.fstat(self._writer.fileno()).st_size
+                if end < self.segment_max_bytes:
+                    break
+                self._lock_writer(False)
+                self._writer.close()
+                self._segment += 1
+                self._writer = self.segment_path(self._segment).open("ab")
+            try:
+                self._writer.write(RECORD_MAGIC + header_line + payload + b"\n")
+                self._writer.flush()
+            finally:
+                self._lock_writer(False)
+            offset: int = end + len(RECORD_MAGIC) + len(header_line)
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO records (url, segment, offset, length, codec, "
+                    "status, headers, source, fetched_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        url,
+                        self._segment,
+                        offset,
+                        len(payload),
+                        self.codec,
+                        status,
+                        json.dumps(header["headers"]),
+                        source,
+                        now,
+                    ),
+                )
+
+    def _lock_writer(self, exclusive: bool) -> None:
+        """
+        Takes (or releases) the lock on the current segment shared with other processes.
+        """
+        if fcntl is not None:
+            fcntl.flock(self._writer.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_UN)
+
+    def _view(self, segment: int, end: int) -> mmap.mmap:
+        """
+        Returns a memory map of a segment covering at least `end` bytes.
+        """
+        mapped: Optional[mmap.mmap] = self._maps.get(segment)
+        if mapped is None or len(mapped) < end:
+            if mapped is not None:
+                mapped.close()
+            with self.segment_path(segment).open("rb") as segment_file:
+                mapped = mmap.mmap(segment_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[segment] = mapped
+        return mapped
+
+    def get(self, url: str, since: Optional[float] = None) -> Optional[dict]:
+        """
+        Reads the latest archived copy of a page.
+
+        :param url: The page URL.
+        :param since: Only return copies fetched at or after this time.
+        :return: Dict with url, status, headers, source, fetched_at and body, or None.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM records WHERE url = ?", (url,)).fetchone()
+            if row is None or (since is not None and row["fetched_at"] < since):
+                return None
+            view = self._view(row["segment"], row["offset"] + row["length"])
+            payload: bytes = view[row["offset"] : row["offset"] + row["length"]]
+        return {
+            "url": url,
+            "status": row["status"],
+            "headers": json.loads(row["headers"]),
+            "source": row["source"],
+            "fetched_at": row["fetched_at"],
+            "body": self.decompress(payload, row["codec"]).decode("utf-8"),
+        }
+
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM records WHERE url = ?", (url,)).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def close(self) -> None:
+        """
+        Closes the segment writer, the memory maps and the index.
+        """
+        with self._lock:
+            self._writer.close()
+            for mapped in self._maps.values():
+                mapped.close()
+            self._maps.clear()
+            self._conn.close()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+import threading
+import time
+from collections import deque
+from typing import Optional
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+class PageReadiness:
+    """
+    Waits for the elements a page needs instead of sleeping a fixed time.
+
+    Each wait polls for any of the given locators to be displayed. The timeout
+    used for a host is learned from how long its previous pages took (an
+    exponential moving average scaled by a safety factor). The latest waits
+    of each host are kept so slow hosts can be spotted after a run, and
+    running totals feed the summary, so memory stays bounded on long runs.
+
+    Attributes:
+        records: Host -> its latest waits (at most `history`), one dict per wait
+                 with host, url, label, seconds and ready flag.
+    """
+
+    def __init__(
+        self,
+        default_timeout: float = 20,
+        min_timeout: float = 2,
+        max_timeout: float = 30,
+        safety_factor: float = 3.0,
+        smoothing: float = 0.3,
+        poll_frequency: float = 0.05,
+        history: int = 20,
+    ) -> None:
+        """
+        :param default_timeout: Timeout (in seconds) for hosts without history.
+        :param min_timeout: Lower bound for learned timeouts.
+        :param max_timeout: Upper bound for learned timeouts.
+        :param safety_factor: Multiplier applied to the average load time.
+        :param smoothing: Weight of the newest observation in the moving average.
+        :param poll_frequency: Delay (in seconds) between readiness checks.
+        :param history: Number of recent waits kept per host.
+        """
+        self.default_timeout: float = default_timeout
+        self.min_timeout: float = min_timeout
+        self.max_timeout: float = max_timeout
+        self.safety_factor: float = safety_factor
+        self.smoothing: float = smoothing
+        self.poll_frequency: float = poll_frequency
+        self.history: int = max(1, history)
+        self.records: dict[str, deque[dict]] = {}
+        self._totals: dict = {"count": 0, "timeouts": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+        self._load_times: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        """
+        Returns the lower-cased host of a URL.
+        """
+        return urlparse(url).netloc.lower()
+
+    def timeout_for(self, host: str) -> float:
+        """
+        Returns the timeout to use for the next page of `host`.
+
+        :param host: Host name as returned by host_of.
+        :return: Timeout in seconds.
+        """
+        with self._lock:
+            average: Optional[float] = self._load_times.get(host)
+        if average is None:
+            return self.default_timeout
+        return min(self.max_timeout, max(self.min_timeout, average * self.safety_factor))
+
+    def observe(self, host: str, seconds: float) -> None:
+        """
+        Feeds an observed load time into the host's moving average.
+        """
+        with self._lock:
+            previous: Optional[float] = self._load_times.get(host)
+            if previous is None:
+                self._load_times[host] = seconds
+            else:
+                self._load_times[host] = (
+                    self.smoothing * seconds + (1 - self.smoothing) * previous
+                )
+
+    def wait_for(
+        self, driver, url: str, locators: list[tuple[str, str]], label: str = ""
+    ) -> bool:
+        """
+        Blocks until any of `locators` is displayed on the current page.
+
+        :param driver: Selenium WebDriver that has navigated to `url`.
+        :param url: URL of the page (used to pick the host timeout).
+        :param locators: (By, value) pairs; the page is ready when any matches.
+        :param label: Short name of the wait for the records.
+        :return: True when the page became ready, False on timeout.
+        """
+        host: str = self.host_of(url)
+        timeout: float = self.timeout_for(host)
+
+        def ready(d) -> bool:
+            for by, value in locators:
+                for element in d.find_elements(by, value):
+                    try:
+                        if element.is_displayed():
+                            return True
+                    except Exception:
+                        continue
+            return False
+
+        start: float = time.monotonic()
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=self.poll_frequency).until(ready)
+            is_ready = True
+        except TimeoutException:
+            is_ready = False
+        seconds: float = time.monotonic() - start
+
+        # A timeout only tells us the page is slower than we allowed for.
+        self.observe(host, seconds if is_ready else timeout)
+        with self._lock:
+            self.records.setdefault(host, deque(maxlen=self.history)).append(
+                {
+                    "host": host,
+                    "url": url,
+                    "label": label,
+                    "seconds": seconds,
+                    "ready": is_ready,
+                }
+            )
+            self._totals["count"] += 1
+            self._totals["timeouts"] += 0 if is_ready else 1
+            self._totals["total_seconds"] += seconds
+            self._totals["max_seconds"] = max(self._totals["max_seconds"], seconds)
+        return is_ready
+
+    def summary(self) -> dict:
+        """
+        Summarizes every wait of the run (not only the ones still in `records`).
+
+        :return: Dict with count, timeouts, total_seconds and max_seconds.
+        """
+        with self._lock:
+            return dict(self._totals)
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+import queue
+import threading
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from scrapper.telemetry import Telemetry
+
+# Marks the end of a stage's input.
+END: object = object()
+
+
+class PipelineCancelled(Exception):
+    """
+    Raised inside worker threads when the consumer stopped reading the pipeline.
+    """
+
+
+class Stage:
+    """
+    One step of a StreamingPipeline.
+
+    Attributes:
+        name: Stage name, used in stats and telemetry.
+        func: Callable turning one input item into an iterable of outputs
+              (empty to drop the item, several to fan out).
+        workers: Number of threads running `func`.
+        capacity: Size of the bounded queue in front of the stage.
+        flush: Optional callable returning the outputs still held by the stage
+               (e.g. a partial batch) once its input is exhausted.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Any], Optional[Iterable[Any]]],
+        workers: int = 1,
+        capacity: int = 64,
+        flush: Optional[Callable[[], Optional[Iterable[Any]]]] = None,
+    ) -> None:
+        self.name: str = name
+        self.func = func
+        self.workers: int = max(1, workers)
+        self.capacity: int = max(1, capacity)
+        self.flush = flush
+        self.stats: dict = {"in": 0, "out": 0, "errors": 0, "max_queued": 0}
+
+
+class StreamingPipeline:
+    """
+    Stages connected by bounded queues, each served by its own worker threads.
+
+    An item moves on to the next stage as soon as it is processed, so slow
+    stages (e.g. browser discovery and LLM extraction) overlap instead of
+    running one after another. A full queue blocks the stage feeding it, which
+    keeps memory bounded however many items the source yields. Errors of one
+    item are reported to `on_error` and do not stop the pipeline.
+    """
+
+    def __init__(
+        self,
+        on_error: Optional[Callable[[str, Any, Exception], None]] = None,
+        telemetry: Optional[Telemetry] = None,
+        poll_seconds: float = 0.1,
+    ) -> None:
+        """
+        :param on_error: Called with (stage name, item, exception) when an item fails.
+        :param telemetry: Optional Telemetry counting items per stage.
+        :param poll_seconds: How often blocked threads check whether the run was cancelled.
+        """
+        self.stages: list[Stage] = []
+        self.on_error = on_error
+        self.telemetry: Telemetry = telemetry or Telemetry()
+        self.poll_seconds: float = poll_seconds
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+
+    def stage(
+        self,
+        name: str,
+        func: Callable[[Any], Optional[Iterable[Any]]],
+        workers: int = 1,
+        capacity: int = 64,
+        flush: Optional[Callable[[], Optional[Iterable[Any]]]] = None,
+    ) -> "StreamingPipeline":
+        """
+        Appends a stage (see Stage) and returns the pipeline for chaining.
+        """
+        self.stages.append(Stage(name, func, workers, capacity, flush))
+        return self
+
+    def _put(self, target: queue.Queue, item: Any) -> None:
+        while True:
+            try:
+                target.put(item, timeout=self.poll_seconds)
+                return
+            except queue.Full:
+                if self._cancelled.is_set():
+                    raise PipelineCancelled()
+
+    def _get(self, source: queue.Queue) -> Any:
+        while True:
+            try:
+                return source.get(timeout=self.poll_seconds)
+            except queue.Empty:
+                if self._cancelled.is_set():
+                    raise PipelineCancelled()
+
+    def _emit(self, stage: Stage, target: queue.Queue, outputs: Optional[Iterable[Any]]) -> None:
+        for output in outputs or ():
+            self._put(target, output)
+            with self._lock:
+                stage.stats["out"] += 1
+
+    def _work(
+        self, stage: Stage, source: queue.Queue, target: queue.Queue, finished: list, downstream: int
+    ) -> None:
+        try:
+            while True:
+                item = self._get(source)
+                if item is END:
+                    break
+                with self._lock:
+                    stage.stats["in"] += 1
+                    stage.stats["max_queued"] = max(stage.stats["max_queued"], source.qsize() + 1)
+                try:
+                    outputs = stage.func(item)
+                    self._emit(stage, target, outputs)
+                    self.telemetry.count("pipeline_items_total", stage=stage.name, result="ok")
+                except PipelineCancelled:
+                    raise
+                except Exception as e:
+                    with self._lock:
+                        stage.stats["errors"] += 1
+                    self.telemetry.count("pipeline_items_total", stage=stage.name, result="error")
+                    if self.on_error is not None:
+                        self.on_error(stage.name, item, e)
+            with self._lock:
+                finished[0] += 1
+                last = finished[0] == stage.workers
+            if last:
+                # The last worker out flushes the stage and closes the next one's input.
+                if stage.flush is not None:
+                    try:
+                        self._emit(stage, target, stage.flush())
+                    except PipelineCancelled:
+                        raise
+                    except Exception as e:
+                        if self.on_error is not None:
+                            self.on_error(stage.name, None, e)
+                for _ in range(downstream):
+                    self._put(target, END)
+        except PipelineCancelled:
+            pass
+
+    def _feed(self, items: Iterable[Any], target: queue.Queue, downstream: int, errors: list) -> None:
+        iterator = iter(items)
+        try:
+            for item in iterator:
+                self._put(target, item)
+        except PipelineCancelled:
+            # Close a generator source on this thread, where it was running.
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+            return
+        except Exception as e:
+            # The source failed: finish what was fed, then re-raise in run().
+            errors.append(e)
+        try:
+            for _ in range(downstream):
+                self._put(target, END)
+        except PipelineCancelled:
+            pass
+
+    def run(self, items: Iterable[Any]) -> Iterator[Any]:
+        """
+        Streams `items` through every stage.
+
+        The source is iterated on its own thread, so a generator that scrapes
+        (e.g. directory listing pages) overlaps with the stages too.
+
+        :param items: Input items of the first stage.
+        :return: Iterator over the outputs of the last stage, in completion order.
+        """
+        if not self.stages:
+            yield from items
+            return
+        self._cancelled.clear()
+        queues = [queue.Queue(maxsize=stage.capacity) for stage in self.stages]
+        queues.append(queue.Queue(maxsize=self.stages[-1].capacity))
+        threads: list[threading.Thread] = []
+        source_errors: list[Exception] = []
+        threads.append(
+            threading.Thread(
+                target=self._feed,
+                args=(items, queues[0], self.stages[0].workers, source_errors),
+                name="pipeline-source",
+                daemon=True,
+            )
+        )
+        for index, stage in enumerate(self.stages):
+            downstream = self.stages[index + 1].workers if index + 1 < len(self.stages) else 1
+            finished = [0]
+            for worker in range(stage.workers):
+                threads.append(
+                    threading.Thread(
+                        target=self._work,
+                        args=(stage, queues[index], queues[index + 1], finished, downstream),
+                        name=f"pipeline-{stage.name}-{worker}",
+                        daemon=True,
+                    )
+                )
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                output = queues[-1].get()
+                if output is END:
+                    break
+                yield output
+        finally:
+            self._cancelled.set()
+            for thread in threads:
+                thread.join()
+        if source_errors:
+            raise source_errors[0]
+
+    def stats(self) -> dict[str, dict]:
+        """
+        Returns items in, items out, errors and the deepest queue seen per stage.
+        """
+        with self._lock:
+            return {stage.name: dict(stage.stats) for stage in self.stages}
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+import threading
+import time
+from typing import Callable, Optional
+
+# Pause applied after a 429 that carries no retry-after header.
+DEFAULT_RETRY_AFTER: float = 10.0
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """
+    Returns how long to wait after a rate-limit error, or None if `error` is
+    not a rate-limit error.
+
+    OpenAI-style errors carry the HTTP response; its `retry-after-ms` or
+    `retry-after` header is used when present.
+    """
+    response = getattr(error, "response", None)
+    status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    if (
+        status != 429
+        and "ratelimit" not in type(error).__name__.lower()
+        and "rate limit" not in str(error).lower()
+    ):
+        return None
+    headers = getattr(response, "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        pass
+    return DEFAULT_RETRY_AFTER
+
+
+class RateLimiter:
+    """
+    Thread-safe requests-per-minute / tokens-per-minute limiter for LLM calls.
+
+    Two token buckets refill continuously at `rpm` and `tpm` per minute.
+    `acquire` blocks until both hold enough for the next call, and `pause`
+    (used on a 429 response) holds every caller back until the retry-after
+    delay has passed.
+    """
+
+    def __init__(
+        self,
+        rpm: float = 500,
+        tpm: float = 200000,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        :param rpm: Requests allowed per minute.
+        :param tpm: Tokens allowed per minute.
+        :param clock: Monotonic clock (replaceable in tests).
+        :param sleep: Sleep function (replaceable in tests).
+        """
+        self.rpm: float = rpm
+        self.tpm: float = tpm
+        self._clock = clock
+        self._sleep = sleep
+        self._requests: float = rpm
+        self._tokens: float = tpm
+        self._updated: float = clock()
+        self._paused_until: float = 0.0
+        self._lock = threading.Lock()
+        self.waited: float = 0.0
+        self.throttled: int = 0
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated)
+        self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+        self._updated = now
+
+    def acquire(self, tokens: int = 0, requests: int = 1) -> float:
+        """
+        Blocks until `requests` calls using `tokens` tokens may be sent.
+
+        :param tokens: Estimated tokens of the call(s); capped at `tpm`.
+        :param requests: Number of LLM requests about to be made; capped at `rpm`.
+        :return: Seconds spent waiting.
+        """
+        tokens = min(max(0, tokens), self.tpm)
+        requests = min(max(1, requests), self.rpm)
+        waited: float = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                delay = self._paused_until - now
+                if delay <= 0:
+                    missing_requests = requests - self._requests
+                    missing_tokens = tokens - self._tokens
+                    if missing_requests <= 0 and missing_tokens <= 0:
+                        self._requests -= requests
+                        self._tokens -= tokens
+                        self.waited += waited
+                        return waited
+                    delay = max(
+                        missing_requests * 60 / self.rpm if missing_requests > 0 else 0.0,
+                        missing_tokens * 60 / self.tpm if missing_tokens > 0 else 0.0,
+                    )
+            self._sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """
+        Holds back every caller for `seconds` (e.g. a 429 retry-after).
+        """
+        with self._lock:
+            self.throttled += 1
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+import json
+import pathlib
+import sqlite3
+import threading
+import time
+from typing import Iterable, Iterator, Optional, Union
+
+from scrapper.siteIndex import Site, site_slug
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS contacts (
+    url TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    location TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    link TEXT NOT NULL,
+    location TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sites (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error TEXT,
+    member_count INTEGER NOT NULL DEFAULT 0,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS members (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    site_key TEXT NOT NULL,
+    url TEXT NOT NULL,
+    name TEXT NOT NULL,
+    position TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS consolidated (
+    site_key TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    rows TEXT NOT NULL,
+    built_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS site_sources (
+    site_key TEXT NOT NULL,
+    url TEXT NOT NULL,
+    PRIMARY KEY (site_key, url)
+);
+CREATE TABLE IF NOT EXISTS page_validators (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    fingerprint TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    changed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS members_site ON members (site_key);
+CREATE INDEX IF NOT EXISTS sites_status ON sites (status);
+"""
+
+STATUS_DONE: str = "done"
+STATUS_ERROR: str = "error"
+
+
+class ResultStore:
+    """
+    Single embedded SQLite store for contacts, discovered pages and team members.
+
+    Each site's members are replaced in one transaction together with its
+    status row (done/error, member count, timestamps and error message), so a
+    crash never leaves a half-written site behind.
+
+    The store uses SQLite's rollback journal by default so it can live on a
+    network file system shared by several workers; WAL is faster but only
+    safe when every process using the file runs on the same host.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, pathlib.Path] = "data/results.sqlite",
+        journal_mode: str = "DELETE",
+    ) -> None:
+        """
+        :param path: SQLite database file (":memory:" for a throwaway store).
+        :param journal_mode: SQLite journal mode; "WAL" only for a file on local disk.
+        """
+        if str(path) != ":memory:":
+            pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Other workers may hold the write lock for a moment (no WAL readers/writer overlap)
+        self._conn = sqlite3.connect(str(path), timeout=60, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute(f"PRAGMA journal_mode={journal_mode}")
+        self._conn.executescript(SCHEMA)
+
+    def save_contacts(self, contacts: Iterable[dict]) -> None:
+        """
+        Upserts directory contacts (Name, Url, Location).
+        """
+        now: float = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO contacts (url, name, location, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(c["Url"], c["Name"], c["Location"], now) for c in contacts],
+            )
+
+    def load_contacts(self) -> list[dict]:
+        """
+        Returns all contacts as dicts with Name, Url and Location keys.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, url, location FROM contacts ORDER BY rowid"
+            ).fetchall()
+        return [{"Name": r["name"], "Url": r["url"], "Location": r["location"]} for r in rows]
+
+    def save_pages(self, pages: Iterable[dict]) -> None:
+        """
+        Upserts discovered pages (Name, Link, Location, Url).
+        """
+        now: float = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO pages (url, name, link, location, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(p["Url"], p["Name"], p["Link"], p["Location"], now) for p in pages],
+            )
+
+    def load_pages(self) -> list[dict]:
+        """
+        Returns all pages as dicts with Name, Link, Location and Url keys.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, link, location, url FROM pages ORDER BY rowid"
+            ).fetchall()
+        return [
+            {"Name": r["name"], "Link": r["link"], "Location": r["location"], "Url": r["url"]}
+            for r in rows
+        ]
+
+    def site_status(self, key: str) -> Optional[str]:
+        """
+        Returns the status of a site ("done", "error") or None if never processed.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status FROM sites WHERE key = ?", (key,)
+            ).fetchone()
+        return row["status"] if row else None
+
+    def site_info(self, key: str) -> Optional[dict]:
+        """
+        Returns the full status row of a site, or None if never processed.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM sites WHERE key = ?", (key,)).fetchone()
+        return dict(row) if row else None
+
+    def save_site_members(
+        self,
+        key: str,
+        url: str,
+        members: list[dict],
+        error: Optional[str] = None,
+        started_at: Optional[float] = None,
+        sources: Optional[Iterable[str]] = None,
+    ) -> None:
+        """
+        Replaces a site's members and records its status in one transaction.
+
+        :param key: Canonical site key.
+        :param url: URL the site was extracted from.
+        :param members: Member dicts with Url, name and position keys.
+        :param error: Error message if extraction failed (status becomes "error").
+        :param started_at: When extraction started (defaults to now).
+        :param sources: Pages the members were extracted from (kept when None).
+        """
+        now: float = time.time()
+        with self._lock, self._conn:
+            if sources is not None:
+                self._conn.execute("DELETE FROM site_sources WHERE site_key = ?", (key,))
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO site_sources (site_key, url) VALUES (?, ?)",
+                    [(key, source) for source in sources],
+                )
+            self._conn.execute("DELETE FROM members WHERE site_key = ?", (key,))
+            self._conn.executemany(
+                "INSERT INTO members (site_key, url, name, position) VALUES (?, ?, ?, ?)",
+                [
+                    (key, m.get("Url") or url, m.get("name") or "", m.get("position") or "")
+                    for m in members
+                ],
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sites "
+                "(key, url, status, error, member_count, started_at, finished_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    url,
+                    STATUS_ERROR if error else STATUS_DONE,
+                    error,
+                    len(members),
+                    started_at if started_at is not None else now,
+                    now,
+                ),
+            )
+
+    def site_sources(self, key: str) -> list[str]:
+        """
+        Returns the pages a site's members were last extracted from.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url FROM site_sources WHERE site_key = ? ORDER BY rowid", (key,)
+            ).fetchall()
+        return [r["url"] for r in rows]
+
+    def page_validators(self, url: str) -> Optional[dict]:
+        """
+        Returns the ETag, Last-Modified and content fingerprint recorded for a page.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM page_validators WHERE url = ?", (url,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def save_page_validators(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        fingerprint: str,
+    ) -> bool:
+        """
+        Records the validators of a freshly fetched page.
+
+        :return: True if the fingerprint differs from the recorded one (or is new).
+        """
+        now: float = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT fingerprint, changed_at FROM page_validators WHERE url = ?", (url,)
+            ).fetchone()
+            changed: bool = row is None or row["fingerprint"] != fingerprint
+            self._conn.execute(
+                "INSERT OR REPLACE INTO page_validators "
+                "(url, etag, last_modified, fingerprint, fetched_at, changed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, fingerprint, now, now if changed else row["changed_at"]),
+            )
+        return changed
+
+    def touch_page_validators(self, url: str) -> None:
+        """
+        Records that a page was confirmed unchanged (HTTP 304).
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE page_validators SET fetched_at = ? WHERE url = ?", (time.time(), url)
+            )
+
+    def members(self, key: str) -> list[dict]:
+        """
+        Returns the members of one site as dicts with Url, name and position keys.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, name, position FROM members WHERE site_key = ? ORDER BY id",
+                (key,),
+            ).fetchall()
+        return [{"Url": r["url"], "name": r["name"], "position": r["position"]} for r in rows]
+
+    def member_total(self) -> int:
+        """
+        Returns the number of members stored across all sites.
+        """
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM members").fetchone()[0]
+
+    def iter_members(self) -> Iterator[tuple[str, dict]]:
+        """
+        Yields (site_key, member) pairs for every stored member.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT site_key, url, name, position FROM members ORDER BY site_key, id"
+            ).fetchall()
+        for r in rows:
+            yield r["site_key"], {"Url": r["url"], "name": r["name"], "position": r["position"]}
+
+    def consolidated_fingerprint(self, key: str) -> Optional[str]:
+        """
+        Returns the fingerprint a site's output rows were last built from.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprint FROM consolidated WHERE site_key = ?", (key,)
+            ).fetchone()
+        return row["fingerprint"] if row else None
+
+    def save_consolidated(self, key: str, fingerprint: str, rows: list[list[str]]) -> None:
+        """
+        Stores the output rows merged for a site and the fingerprint of their inputs.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO consolidated (site_key, fingerprint, rows, built_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, fingerprint, json.dumps(rows), time.time()),
+            )
+
+    def consolidated_rows(self, key: str) -> list[list[str]]:
+        """
+        Returns the output rows last merged for a site.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT rows FROM consolidated WHERE site_key = ?", (key,)
+            ).fetchone()
+        return json.loads(row["rows"]) if row else []
+
+    def prune_consolidated(self, keep: Iterable[str]) -> int:
+        """
+        Deletes merged rows of sites that are no longer part of the run.
+
+        :param keep: Site keys to keep.
+        :return: Number of sites removed.
+        """
+        keep = set(keep)
+        with self._lock, self._conn:
+            stale = [
+                r["site_key"]
+                for r in self._conn.execute("SELECT site_key FROM consolidated")
+                if r["site_key"] not in keep
+            ]
+            self._conn.executemany(
+                "DELETE FROM consolidated WHERE site_key = ?", [(k,) for k in stale]
+            )
+        return len(stale)
+
+    def import_legacy_json(self, data_dir: pathlib.Path, sites: Iterable[Site]) -> int:
+        """
+        Imports `team_members_*.json` files written by earlier versions.
+
+        Files are looked up by canonical site key and by each raw link of the
+        site; sites already in the store are left alone.
+
+        :param data_dir: Directory holding the legacy JSON files.
+        :param sites: Sites from a SiteIndex.
+        :return: Number of sites imported.
+        """
+        imported: int = 0
+        for site in sites:
+            if self.site_status(site.key) is not None:
+                continue
+            candidates = [data_dir / f"team_members_{site_slug(site.key)}.json"] + [
+                data_dir / f"team_members_{link.replace('/', '_').replace('.', '_')}.json"
+                for link in site.links
+            ]
+            for json_path in candidates:
+                if json_path.exists():
+                    with json_path.open("r", encoding="utf-8") as jf:
+                        members = json.load(jf)
+                    self.save_site_members(site.key, site.url, members)
+                    imported += 1
+                    break
+        return imported
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        with self._lock:
+            self._conn.close()
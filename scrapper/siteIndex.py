@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+import re
+from typing import Iterable, Iterator, Optional
+from urllib.parse import urlsplit
+
+# Single path segments that point at a page of a site rather than a separate site.
+GENERIC_LEAF_PAGES: frozenset = frozenset(
+    {
+        "about", "about-us", "contact", "contact-us", "contactus", "home",
+        "index.html", "index.htm", "index.php", "locations", "team", "our-team",
+    }
+)
+
+HOST_PATTERN = re.compile(r"^[a-z0-9-]+(\.[a-z0-9-]+)+$")
+
+WEB_SCHEMES: frozenset = frozenset({"http", "https"})
+
+
+def canonicalize_site(link: str) -> Optional[str]:
+    """
+    Reduces a provider link to a canonical site key.
+
+    Scheme, case, a leading "www.", the port (any port, not only the default
+    ones), query strings, fragments and trailing slashes are ignored, and a
+    single generic page segment such as "/contact/" is dropped. Links that are
+    empty, not a host name, not http(s), carry user info (as "mailto:x@y.com"
+    would once a scheme is added) or have an invalid port are rejected.
+    `SiteIndex.site_url` keeps the port.
+
+    :param link: A raw link, e.g. "https://www.Example.com/contact/".
+    :return: The canonical key (e.g. "example.com"), or None when rejected.
+    """
+    link = (link or "").strip()
+    if not link:
+        return None
+    if "://" not in link:
+        link = f"https://{link}"
+    try:
+        parts = urlsplit(link)
+        host: str = (parts.hostname or "").lower().rstrip(".")
+        # Raises ValueError for a port that is not a number in 0-65535
+        parts.port
+    except ValueError:
+        return None
+    if parts.scheme.lower() not in WEB_SCHEMES or parts.username is not None:
+        return None
+    if host.startswith("www."):
+        host = host[4:]
+    if not HOST_PATTERN.match(host):
+        return None
+
+    segments: list[str] = [s for s in parts.path.split("/") if s]
+    if len(segments) == 1 and segments[0].lower() in GENERIC_LEAF_PAGES:
+        segments = []
+    path: str = "/".join(segments)
+    return f"{host}/{path}" if path else host
+
+
+def site_slug(key: str) -> str:
+    """
+    Builds a filesystem-safe name for a canonical site key.
+    """
+    return re.sub(r"[^A-Za-z0-9]+", "_", key).strip("_")
+
+
+class Site:
+    """
+    A unique provider website and every clinic row that links to it.
+
+    Attributes:
+        key: Canonical site key.
+        url: URL used to extract the site (scheme added, first-seen host form kept).
+        pages: Page dicts (Name, Link, Location, Url) of the clinics sharing the site.
+    """
+
+    def __init__(self, key: str, url: str) -> None:
+        self.key: str = key
+        self.url: str = url
+        self.pages: list[dict] = []
+
+    @property
+    def links(self) -> list[str]:
+        """
+        Returns the distinct raw links of the clinics, in first-seen order.
+        """
+        return list(dict.fromkeys(page["Link"] for page in self.pages))
+
+
+class SiteIndex:
+    """
+    Groups discovered pages by canonical site so each website is extracted once.
+
+    Attributes:
+        sites: Canonical key -> Site, in first-seen order.
+        rejected: Pages whose link was empty or invalid.
+    """
+
+    def __init__(self, pages: Iterable[dict] = ()) -> None:
+        self.sites: dict[str, Site] = {}
+        self.rejected: list[dict] = []
+        for page in pages:
+            self.add(page)
+
+    def add(self, page: dict) -> Optional[str]:
+        """
+        Adds a page dict to the index.
+
+        :param page: Dict with at least a "Link" key.
+        :return: The canonical site key, or None if the link was rejected.
+        """
+        key: Optional[str] = canonicalize_site(page.get("Link", ""))
+        if key is None:
+            self.rejected.append(page)
+            return None
+        site: Optional[Site] = self.sites.get(key)
+        if site is None:
+            site = self.sites[key] = Site(key, self.site_url(page["Link"], key))
+        site.pages.append(page)
+        return key
+
+    @staticmethod
+    def site_url(link: str, key: str) -> str:
+        """
+        Builds the URL to extract a site from, keeping the link's scheme, host form and port.
+
+        :param link: The first raw link seen for the site.
+        :param key: Its canonical key.
+        :return: e.g. "https://www.example.com" for link "www.Example.com/contact/".
+        """
+        link = link.strip()
+        parts = urlsplit(link if "://" in link else f"https://{link}")
+        host: str = (parts.hostname or "").lower()
+        if parts.port:
+            host = f"{host}:{parts.port}"
+        path: str = key.partition("/")[2]
+        return f"{parts.scheme or 'https'}://{host}/{path}".rstrip("/")
+
+    def __iter__(self) -> Iterator[Site]:
+        return iter(self.sites.values())
+
+    def __len__(self) -> int:
+        return len(self.sites)
+
+    def fan_out(self, key: str, members: Iterable[dict]) -> Iterator[list[str]]:
+        """
+        Expands a site's members into one output row per clinic of the site.
+
+        :param key: Canonical site key.
+        :param members: Member dicts with "name" and "position" keys.
+        :return: Rows of [Url, Name, Title, Company, Location].
+        """
+        site: Site = self.sites[key]
+        members = list(members)
+        for page in site.pages:
+            for member in members:
+                yield [
+                    page.get("Link", ""),
+                    member.get("name", ""),
+                    member.get("position", ""),
+                    page.get("Name", ""),
+                    page.get("Location", ""),
+                ]
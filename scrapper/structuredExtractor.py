@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+import json
+import re
+from collections import defaultdict
+from itertools import islice
+from typing import Any, Iterator, Optional
+
+from lxml import html
+from lxml.cssselect import CSSSelector
+
+# "Jane Doe", "Mary-Ann O'Neil", "Jane Doe, M.A., BCBA", "Dr. John A. Smith"
+NAME_PATTERN = re.compile(
+    r"^(dr\.?\s+)?[A-Z][\w'’.-]+(\s+[A-Z][\w'’.-]*){1,3}(\s*,\s*[\w.\s-]{2,20})*$"
+)
+# Job titles typical of ABA providers (and staff pages in general).
+ROLE_PATTERN = re.compile(
+    r"\b(bcba|bcba-d|bcaba|rbt|lba|ceo|coo|cfo|founder|owner|director|manager|"
+    r"supervisor|coordinator|therapist|technician|analyst|specialist|clinician|"
+    r"psychologist|consultant|president|administrator|assistant|lead|head|"
+    r"officer|pathologist|slp|ot|bt)\b",
+    re.IGNORECASE,
+)
+NAME_HINT_PATTERN = re.compile(r"name", re.IGNORECASE)
+TITLE_HINT_PATTERN = re.compile(r"title|position|role|job|designation", re.IGNORECASE)
+DIGIT_PATTERN = re.compile(r"\d")
+
+CARD_NAME_TAGS: frozenset = frozenset({"h2", "h3", "h4", "h5", "h6", "strong", "b"})
+MAX_POSITION_LENGTH: int = 80
+
+
+def looks_like_name(text: str) -> bool:
+    """
+    Returns True if `text` looks like a person's name.
+    """
+    return bool(NAME_PATTERN.match(text.strip())) and len(text) <= 60
+
+
+class StructuredExtractor:
+    """
+    Extracts team members from markup without calling an LLM.
+
+    Three sources are tried: schema.org `Person` objects in JSON-LD, schema.org
+    `Person` microdata, and repeated sibling "cards" (e.g. image + h3 name +
+    p title) detected by their shared structure. Each source yields a
+    confidence between 0 and 1, and the best one is returned, so the caller
+    can fall back to the LLM when the markup is not convincing.
+    """
+
+    JSON_LD = CSSSelector('script[type="application/ld+json"]')
+    MICRODATA_PEOPLE = CSSSelector('[itemscope][itemtype*="schema.org/Person"]')
+
+    def __init__(self, min_cards: int = 3, min_people: int = 2) -> None:
+        """
+        :param min_cards: Repeated siblings needed before they count as a card grid.
+        :param min_people: People a JSON-LD/microdata source must list to be trusted.
+        """
+        self.min_cards: int = min_cards
+        self.min_people: int = min_people
+
+    @staticmethod
+    def clean(text: Optional[str]) -> str:
+        """
+        Collapses whitespace in `text`.
+        """
+        return " ".join((text or "").split())
+
+    def dedupe(self, members: list[dict]) -> list[dict]:
+        """
+        Drops members whose name was already seen (case-insensitive).
+        """
+        seen: set[str] = set()
+        unique: list[dict] = []
+        for member in members:
+            key = member["name"].lower()
+            if key not in seen:
+                seen.add(key)
+                unique.append(member)
+        return unique
+
+    def people_confidence(self, members: list[dict]) -> float:
+        """
+        Confidence of a list of people published as schema.org data.
+        """
+        if not members:
+            return 0.0
+        titled = sum(1 for m in members if m["position"]) / len(members)
+        return (0.95 if len(members) >= self.min_people else 0.5) * titled
+
+    @classmethod
+    def _walk_json(cls, node: Any) -> Iterator[dict]:
+        if isinstance(node, list):
+            for item in node:
+                yield from cls._walk_json(item)
+        elif isinstance(node, dict):
+            yield node
+            for value in node.values():
+                if isinstance(value, (dict, list)):
+                    yield from cls._walk_json(value)
+
+    def json_ld(self, document: html.HtmlElement) -> list[dict]:
+        """
+        Returns the schema.org Person objects found in JSON-LD blocks.
+        """
+        members: list[dict] = []
+        for script in self.JSON_LD(document):
+            try:
+                data = json.loads(script.text or "")
+            except ValueError:
+                continue
+            for node in self._walk_json(data):
+                types = node.get("@type")
+                types = types if isinstance(types, list) else [types]
+                if "Person" not in types:
+                    continue
+                name = self.clean(str(node.get("name") or ""))
+                position = node.get("jobTitle") or node.get("roleName") or ""
+                if isinstance(position, list):
+                    position = ", ".join(str(p) for p in position)
+                if name:
+                    members.append({"name": name, "position": self.clean(str(position))})
+        return self.dedupe(members)
+
+    def microdata(self, document: html.HtmlElement) -> list[dict]:
+        """
+        Returns the schema.org Person items found in microdata.
+        """
+        members: list[dict] = []
+        for person in self.MICRODATA_PEOPLE(document):
+            values: dict[str, str] = {}
+            for prop in person.iterdescendants():
+                key = prop.get("itemprop")
+                if key in ("name", "jobTitle") and key not in values:
+                    values[key] = self.clean(prop.get("content") or prop.text_content())
+            if values.get("name"):
+                members.append({"name": values["name"], "position": values.get("jobTitle", "")})
+        return self.dedupe(members)
+
+    @staticmethod
+    def signature(element: html.HtmlElement) -> tuple:
+        """
+        Structural fingerprint shared by the cards of one grid: tag, stable
+        classes (without per-item ids) and the first descendant tags.
+        """
+        classes = tuple(
+            sorted(c for c in (element.get("class") or "").split() if not DIGIT_PATTERN.search(c))
+        )
+        # Stop walking after 12 tags: the subtree of a page-level element can be huge
+        descendants = tuple(
+            islice((d.tag for d in element.iterdescendants() if isinstance(d.tag, str)), 12)
+        )
+        return element.tag, classes, descendants
+
+    def parse_card(self, card: html.HtmlElement) -> Optional[dict]:
+        """
+        Reads the name and position of one card, or None if it is not a person.
+        """
+        texts: list[tuple[html.HtmlElement, str]] = []
+        for element in card.iter():
+            if not isinstance(element.tag, str) or element.tag in ("script", "style"):
+                continue
+            if element.tag == "img" and element.get("alt"):
+                texts.append((element, self.clean(element.get("alt"))))
+            for text in (element.text, element.tail if element is not card else None):
+                text = self.clean(text)
+                if text:
+                    texts.append((element, text))
+
+        name_index: Optional[int] = None
+        for index, (element, text) in enumerate(texts):
+            hinted = NAME_HINT_PATTERN.search(element.get("class") or "")
+            if (element.tag in CARD_NAME_TAGS or hinted) and looks_like_name(text):
+                name_index = index
+                break
+        if name_index is None:
+            # Some cards only label the photo.
+            name_index = next(
+                (i for i, (el, text) in enumerate(texts) if el.tag == "img" and looks_like_name(text)),
+                None,
+            )
+        if name_index is None:
+            return None
+        name = texts[name_index][1]
+
+        hinted_titles = [
+            text for element, text in texts
+            if TITLE_HINT_PATTERN.search(element.get("class") or "") and text != name
+        ]
+        following = [text for _, text in texts[name_index + 1:] if text != name]
+        candidates = hinted_titles or following
+        position = candidates[0] if candidates else ""
+        if not position or len(position) > MAX_POSITION_LENGTH:
+            return None
+        return {"name": name, "position": position}
+
+    def cards(self, document: html.HtmlElement) -> tuple[list[dict], float]:
+        """
+        Finds the most convincing grid of repeated sibling cards.
+
+        :return: (members, confidence) of the best grid, or ([], 0.0).
+        """
+        best: tuple[list[dict], float] = ([], 0.0)
+        for parent in document.iter():
+            if not isinstance(parent.tag, str):
+                continue
+            groups: dict[tuple, list] = defaultdict(list)
+            for child in parent:
+                if isinstance(child.tag, str):
+                    groups[self.signature(child)].append(child)
+            for cards in groups.values():
+                if len(cards) < self.min_cards:
+                    continue
+                members = self.dedupe([m for m in map(self.parse_card, cards) if m])
+                if not members:
+                    continue
+                valid = len(members) / len(cards)
+                roles = sum(1 for m in members if ROLE_PATTERN.search(m["position"])) / len(members)
+                size = min(1.0, len(members) / (2 * self.min_cards))
+                confidence = 0.5 * valid + 0.3 * roles + 0.2 * size
+                if (confidence, len(members)) > (best[1], len(best[0])):
+                    best = (members, confidence)
+        return best
+
+    def extract(self, page: str, url: Optional[str] = None) -> dict:
+        """
+        Extracts team members from an HTML page.
+
+        :param page: The raw HTML.
+        :param url: Page URL stored in each record's "Url".
+        :return: Dict with members ({"Url", "name", "position"} records),
+                 confidence (0-1) and method ("json-ld", "microdata", "cards" or None).
+        """
+        result: dict = {"members": [], "confidence": 0.0, "method": None}
+        if not page or not page.strip():
+            return result
+        try:
+            document = html.fromstring(page)
+        except Exception:
+            return result
+
+        candidates: list[tuple[str, list[dict], float]] = []
+        for method, finder in (("json-ld", self.json_ld), ("microdata", self.microdata)):
+            members = finder(document)
+            candidates.append((method, members, self.people_confidence(members)))
+        candidates.append(("cards", *self.cards(document)))
+
+        method, members, confidence = max(candidates, key=lambda c: (c[2], len(c[1])))
+        if not members:
+            return result
+        result["members"] = [
+            {"Url": url, "name": m["name"], "position": m["position"]} for m in members
+        ]
+        result["confidence"] = round(confidence, 3)
+        result["method"] = method
+        return result
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+import re
+from typing import Optional
+from urllib.parse import urldefrag, urljoin, urlsplit
+
+from lxml import etree, html
+from lxml.cssselect import CSSSelector
+
+from scrapper.fetchBackend import HttpFetchBackend
+
+# Keyword -> weight, matched against URL path words and anchor text.
+TEAM_KEYWORDS: dict[str, float] = {
+    "team": 10,
+    "our-team": 12,
+    "staff": 9,
+    "leadership": 9,
+    "our-people": 9,
+    "people": 5,
+    "clinicians": 8,
+    "clinical-team": 10,
+    "meet": 6,
+    "providers": 4,
+    "therapists": 5,
+    "directors": 5,
+    "management": 4,
+    "who-we-are": 5,
+    "about-us": 4,
+    "about": 3,
+}
+
+# Words that mark pages which never hold the team roster.
+NEGATIVE_KEYWORDS: frozenset = frozenset(
+    {
+        "blog", "news", "careers", "career", "jobs", "job", "apply", "privacy",
+        "terms", "login", "cart", "checkout", "tag", "category", "feed", "wp-json",
+        "wp-content", "events", "press", "faq", "donate",
+    }
+)
+
+SKIPPED_EXTENSIONS: tuple = (
+    ".pdf", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".zip", ".doc", ".docx", ".xml",
+)
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class TeamPageFinder:
+    """
+    Finds likely "team" pages of a provider site without calling an LLM.
+
+    Candidate URLs come from the homepage anchors and the site's sitemap.xml.
+    Each same-domain URL is scored by team-related keywords in its path and
+    anchor text, and the top-k candidates are returned.
+    """
+
+    ANCHORS = CSSSelector("a[href]")
+    SITEMAP_LOCS = etree.XPath("//*[local-name()='loc']/text()")
+
+    def __init__(
+        self,
+        fetcher: HttpFetchBackend,
+        top_k: int = 3,
+        use_sitemap: bool = True,
+        max_child_sitemaps: int = 3,
+    ) -> None:
+        """
+        :param fetcher: HTTP backend used to read the homepage and sitemap.
+        :param top_k: Maximum number of candidate URLs returned.
+        :param use_sitemap: Also read /sitemap.xml (and up to `max_child_sitemaps` children).
+        :param max_child_sitemaps: Child sitemaps followed from a sitemap index.
+        """
+        self.fetcher: HttpFetchBackend = fetcher
+        self.top_k: int = top_k
+        self.use_sitemap: bool = use_sitemap
+        self.max_child_sitemaps: int = max_child_sitemaps
+
+    @staticmethod
+    def same_site(url: str, base: str) -> bool:
+        """
+        Returns True if both URLs are on the same host (ignoring "www.").
+        """
+        def host(u: str) -> str:
+            name = (urlsplit(u).hostname or "").lower()
+            return name[4:] if name.startswith("www.") else name
+
+        return host(url) == host(base)
+
+    @staticmethod
+    def score(url: str, text: str = "") -> float:
+        """
+        Scores how likely a URL is to be the team page.
+
+        :param url: Absolute URL.
+        :param text: Anchor text linking to it, if known.
+        :return: A score; 0 means "not a candidate".
+        """
+        path: str = urlsplit(url).path.lower()
+        if path.endswith(SKIPPED_EXTENSIONS):
+            return 0.0
+        path_words: list[str] = WORD_PATTERN.findall(path)
+        if any(word in NEGATIVE_KEYWORDS for word in path_words):
+            return 0.0
+
+        joined_path: str = "-".join(path_words)
+        text_words: str = "-".join(WORD_PATTERN.findall(text.lower()))
+        score: float = 0.0
+        for keyword, weight in TEAM_KEYWORDS.items():
+            if re.search(rf"(^|-){re.escape(keyword)}($|-)", joined_path):
+                score += weight
+            if re.search(rf"(^|-){re.escape(keyword)}($|-)", text_words):
+                score += weight / 2
+        if score:
+            # Prefer shallow pages such as /team/ over /team/jane-doe/.
+            score -= 0.5 * max(0, len([s for s in path.split("/") if s]) - 1)
+        return max(score, 0.0)
+
+    def homepage_links(self, url: str) -> list[tuple[str, str]]:
+        """
+        Returns (absolute URL, anchor text) pairs for the homepage anchors.
+        """
+        body: Optional[str] = self.fetcher.fetch(url)
+        if not body:
+            return []
+        try:
+            document = html.fromstring(body)
+        except Exception:
+            return []
+        links: list[tuple[str, str]] = []
+        for anchor in self.ANCHORS(document):
+            href: str = (anchor.get("href") or "").strip()
+            if not href or href.startswith(("#", "mailto:", "tel:", "javascript:")):
+                continue
+            absolute, _ = urldefrag(urljoin(url, href))
+            links.append((absolute, anchor.text_content().strip()))
+        return links
+
+    def sitemap_links(self, url: str) -> list[str]:
+        """
+        Returns the page URLs listed in /sitemap.xml, following a sitemap index.
+        """
+        locs: list[str] = self._read_sitemap(urljoin(url, "/sitemap.xml"))
+        pages: list[str] = []
+        children: list[str] = []
+        for loc in locs:
+            (children if loc.lower().endswith(".xml") else pages).append(loc)
+        # Page sitemaps are most likely to list a static team page.
+        children.sort(key=lambda loc: "page" not in loc.lower())
+        for child in children[: self.max_child_sitemaps]:
+            pages.extend(self._read_sitemap(child))
+        return pages
+
+    def _read_sitemap(self, url: str) -> list[str]:
+        body: Optional[str] = self.fetcher.fetch(url, quiet=True)
+        if not body:
+            return []
+        try:
+            root = etree.fromstring(body.encode("utf-8"))
+        except Exception:
+            return []
+        return [loc.strip() for loc in self.SITEMAP_LOCS(root)]
+
+    def find(self, url: str) -> list[str]:
+        """
+        Returns the top-k candidate team page URLs of a site, best first.
+
+        :param url: The site's homepage URL.
+        :return: Candidate URLs (empty when nothing looks like a team page).
+        """
+        # "/team" and "/team/" are the same page: key on the URL without trailing slash.
+        best: dict[str, tuple[float, str]] = {}
+        candidates: list[tuple[str, str]] = self.homepage_links(url)
+        if self.use_sitemap:
+            candidates += [(loc, "") for loc in self.sitemap_links(url)]
+
+        home: str = url.rstrip("/")
+        for link, text in candidates:
+            key: str = link.rstrip("/")
+            if key == home or not self.same_site(link, url):
+                continue
+            value: float = self.score(link, text)
+            if value > best.get(key, (0.0, ""))[0]:
+                best[key] = (value, link)
+
+        ranked = sorted(best.values(), key=lambda item: (-item[0], len(item[1])))
+        return [link for _, link in ranked[: self.top_k]]
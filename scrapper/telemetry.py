@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+import bisect
+import contextvars
+import json
+import pathlib
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Iterator, Optional, Union
+
+# Upper bounds (seconds) of the latency histogram buckets.
+DEFAULT_BUCKETS: tuple = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+# USD per million (input, output) tokens, for the cost estimate.
+LLM_PRICES: dict[str, tuple[float, float]] = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+}
+
+METRIC_PREFIX: str = "aba_"
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("telemetry_span", default=None)
+
+
+def label_key(labels: dict) -> tuple:
+    """
+    Returns a hashable, ordered form of a label set.
+    """
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def format_labels(labels: tuple, extra: tuple = ()) -> str:
+    """
+    Renders labels in the Prometheus text format, e.g. '{span="http.get"}'.
+    """
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    escaped = (
+        f'{k}="' + v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for k, v in pairs
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+class Telemetry:
+    """
+    Counters, latency histograms and trace spans of a pipeline run.
+
+    `span` times a stage (e.g. "discover", "extract") or an external call
+    (e.g. "http.get", "browser.navigate", "browser.wait", "llm.request"):
+    its duration goes into the `aba_span_seconds` histogram and the span joins
+    the trace tree of the enclosing span on the same thread. Each finished
+    root span (one per provider or site) is appended as a JSON line to
+    `trace_path`. LLM calls also record their tokens and estimated cost.
+
+    Metrics are exported as JSON (`to_dict`) and in the Prometheus text
+    format (`to_prometheus`).
+    """
+
+    def __init__(
+        self,
+        trace_path: Optional[Union[str, pathlib.Path]] = None,
+        buckets: tuple = DEFAULT_BUCKETS,
+        prices: Optional[dict[str, tuple[float, float]]] = None,
+    ) -> None:
+        """
+        :param trace_path: JSON lines file receiving finished traces (None keeps no traces).
+        :param buckets: Upper bounds of the latency histogram buckets, in seconds.
+        :param prices: Model -> USD per million (input, output) tokens.
+        """
+        self.trace_path: Optional[pathlib.Path] = pathlib.Path(trace_path) if trace_path else None
+        if self.trace_path is not None:
+            self.trace_path.parent.mkdir(parents=True, exist_ok=True)
+        self.buckets: tuple = tuple(sorted(buckets))
+        self.prices: dict[str, tuple[float, float]] = LLM_PRICES if prices is None else prices
+        self.counters: dict[str, dict[tuple, float]] = {}
+        self.histograms: dict[str, dict[tuple, dict]] = {}
+        self._lock = threading.Lock()
+        self._trace_lock = threading.Lock()
+
+    def count(self, name: str, value: float = 1, **labels) -> None:
+        """
+        Adds `value` to a counter.
+        """
+        key = label_key(labels)
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        """
+        Records one latency in a histogram.
+        """
+        key = label_key(labels)
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = {
+                    "buckets": [0] * (len(self.buckets) + 1),
+                    "count": 0,
+                    "sum": 0.0,
+                }
+            histogram["buckets"][bisect.bisect_left(self.buckets, seconds)] += 1
+            histogram["count"] += 1
+            histogram["sum"] += seconds
+
+    def quantile(self, name: str, q: float, **labels) -> float:
+        """
+        Estimates a latency quantile (0-1) from its histogram buckets,
+        interpolating linearly inside the bucket like Prometheus does.
+        """
+        with self._lock:
+            histogram = self.histograms.get(name, {}).get(label_key(labels))
+            if not histogram or not histogram["count"]:
+                return 0.0
+            counts = list(histogram["buckets"])
+            total = histogram["count"]
+        rank = q * total
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            if seen + bucket_count >= rank and bucket_count:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[dict]:
+        """
+        Times a block as a span of the current trace (a new trace if there is
+        no enclosing span). Exceptions are recorded on the span and re-raised.
+
+        :param name: Stage or call name, e.g. "discover" or "http.get".
+        :param attributes: Span attributes, e.g. url=...; see also `annotate`.
+        """
+        parent: Optional[dict] = _current_span.get()
+        span: dict = {
+            "name": name,
+            "start": time.time(),
+            "seconds": 0.0,
+            "attributes": attributes,
+            "error": None,
+            "children": [],
+        }
+        token = _current_span.set(span)
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span["error"] = f"{type(e).__name__}: {e}"
+            self.count("span_errors_total", span=name)
+            raise
+        finally:
+            _current_span.reset(token)
+            span["seconds"] = round(time.perf_counter() - started, 6)
+            self.observe("span_seconds", span["seconds"], span=name)
+            if parent is not None:
+                parent["children"].append(span)
+            else:
+                self.write_trace(span)
+
+    def annotate(self, **attributes) -> None:
+        """
+        Adds attributes to the current span (ignored outside a span).
+        """
+        span: Optional[dict] = _current_span.get()
+        if span is not None:
+            span["attributes"].update(attributes)
+
+    def write_trace(self, span: dict) -> None:
+        """
+        Appends a finished root span and its children to the trace file.
+        """
+        if self.trace_path is None:
+            return
+        line = json.dumps({"trace_id": uuid.uuid4().hex, **span}, default=str)
+        with self._trace_lock, self.trace_path.open("a", encoding="utf-8") as trace_file:
+            trace_file.write(line + "\n")
+
+    def price(self, model: str) -> tuple[float, float]:
+        """
+        Returns the USD per million (input, output) tokens of a model (0 if unknown).
+        """
+        return self.prices.get(model.split("/")[-1], (0.0, 0.0))
+
+    def llm(
+        self,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        path: str,
+        estimated: bool = False,
+    ) -> None:
+        """
+        Records one LLM request with its token counts and estimated cost.
+
+        :param model: Model name, e.g. "gpt-4o-mini" or "openai/gpt-4o-mini".
+        :param prompt_tokens: Input tokens.
+        :param completion_tokens: Output tokens.
+        :param path: Which caller made the request, e.g. "graph" or "batch".
+        :param estimated: True when the token counts are estimates, not API usage.
+        """
+        model = model.split("/")[-1]
+        input_price, output_price = self.price(model)
+        cost = (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+        self.count("llm_requests_total", model=model, path=path)
+        self.count("llm_tokens_total", prompt_tokens, model=model, kind="prompt")
+        self.count("llm_tokens_total", completion_tokens, model=model, kind="completion")
+        self.count("llm_cost_usd_total", cost, model=model)
+        self.annotate(
+            model=model,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cost_usd=round(cost, 6),
+            tokens_estimated=estimated,
+        )
+
+    def total(self, name: str, **labels) -> float:
+        """
+        Sums a counter over every series matching `labels`.
+        """
+        wanted = set(label_key(labels))
+        with self._lock:
+            series = dict(self.counters.get(name, {}))
+        return sum(value for key, value in series.items() if wanted <= set(key))
+
+    def summary(self) -> dict[str, dict]:
+        """
+        Returns count, total seconds, p50 and p95 of every span name.
+        """
+        with self._lock:
+            series = dict(self.histograms.get("span_seconds", {}))
+        stats: dict[str, dict] = {}
+        for key, histogram in series.items():
+            name = dict(key)["span"]
+            stats[name] = {
+                "count": histogram["count"],
+                "total_seconds": histogram["sum"],
+                "p50": self.quantile("span_seconds", 0.5, span=name),
+                "p95": self.quantile("span_seconds", 0.95, span=name),
+            }
+        return stats
+
+    def to_dict(self) -> dict:
+        """
+        Returns every counter and histogram (with p50/p95 estimates) as plain data.
+        """
+        with self._lock:
+            counters = {n: dict(s) for n, s in self.counters.items()}
+            histograms = {
+                n: {k: {**h, "buckets": list(h["buckets"])} for k, h in s.items()}
+                for n, s in self.histograms.items()
+            }
+        return {
+            "counters": {
+                name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                for name, series in counters.items()
+            },
+            "histograms": {
+                name: [
+                    {
+                        "labels": dict(key),
+                        "count": h["count"],
+                        "sum": round(h["sum"], 6),
+                        "p50": round(self.quantile(name, 0.5, **dict(key)), 6),
+                        "p95": round(self.quantile(name, 0.95, **dict(key)), 6),
+                        "buckets": dict(zip([*map(str, self.buckets), "+Inf"], h["buckets"])),
+                    }
+                    for key, h in series.items()
+                ]
+                for name, series in histograms.items()
+            },
+        }
+
+    def to_prometheus(self) -> str:
+        """
+        Renders every metric in the Prometheus text exposition format.
+        """
+        lines: list[str] = []
+        with self._lock:
+            for name, series in sorted(self.counters.items()):
+                metric = METRIC_PREFIX + name
+                lines.append(f"# TYPE {metric} counter")
+                for key, value in series.items():
+                    lines.append(f"{metric}{format_labels(key)} {value:g}")
+            for name, series in sorted(self.histograms.items()):
+                metric = METRIC_PREFIX + name
+                lines.append(f"# TYPE {metric} histogram")
+                for key, h in series.items():
+                    cumulative = 0
+                    for bound, bucket_count in zip([*map(str, self.buckets), "+Inf"], h["buckets"]):
+                        cumulative += bucket_count
+                        lines.append(
+                            f"{metric}_bucket{format_labels(key, (('le', bound),))} {cumulative}"
+                        )
+                    lines.append(f"{metric}_sum{format_labels(key)} {h['sum']:g}")
+                    lines.append(f"{metric}_count{format_labels(key)} {h['count']}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, directory: Union[str, pathlib.Path]) -> None:
+        """
+        Writes metrics.json and metrics.prom to `directory`.
+        """
+        directory = pathlib.Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / "metrics.json").write_text(
+            json.dumps(self.to_dict(), indent=2), encoding="utf-8"
+        )
+        (directory / "metrics.prom").write_text(self.to_prometheus(), encoding="utf-8")
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+import json
+import os
+import pathlib
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, Optional, Union
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS tasks (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (kind, key)
+);
+CREATE INDEX IF NOT EXISTS tasks_claim ON tasks (kind, status, lease_expires);
+"""
+
+STATUS_PENDING: str = "pending"
+STATUS_LEASED: str = "leased"
+STATUS_DONE: str = "done"
+STATUS_FAILED: str = "failed"
+
+
+class WorkQueue:
+    """
+    Lease-based task queue in a SQLite file shared by many worker processes.
+
+    Tasks are identified by (kind, key), e.g. ("discover", contact URL) or
+    ("extract", site key), so enqueueing the same work twice is harmless. A
+    worker claims tasks for `lease_seconds`, renews the lease with heartbeats
+    while it works, and completes or fails each task. Leases of workers that
+    died are simply allowed to expire, after which any worker may claim the
+    task again, up to `max_attempts` claims.
+
+    Claims run in IMMEDIATE transactions, so two workers never lease the same
+    task. The database uses SQLite's rollback journal rather than WAL, whose
+    shared-memory index only works on a single host, so workers on other
+    hosts can share the queue through a network file system with working
+    file locks.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, pathlib.Path] = "data/work_queue.sqlite",
+        lease_seconds: float = 300,
+        max_attempts: int = 3,
+        worker_id: Optional[str] = None,
+    ) -> None:
+        """
+        :param path: SQLite database file shared by all workers.
+        :param lease_seconds: How long a claim lasts without a heartbeat.
+        :param max_attempts: Claims after which a task that keeps failing is given up.
+        :param worker_id: Name of this worker (defaults to host, pid and a random suffix).
+        """
+        if str(path) != ":memory:":
+            pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds: float = lease_seconds
+        self.max_attempts: int = max(1, max_attempts)
+        self.worker_id: str = worker_id or (
+            f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        )
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(path), timeout=60, isolation_level=None, check_same_thread=False
+        )
+        self._conn.row_factory = sqlite3.Row
+        # WAL needs shared memory on one host; the rollback journal works over NFS/SMB.
+        self._conn.execute("PRAGMA journal_mode=DELETE")
+        self._conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def enqueue(self, kind: str, items: Iterable[tuple[str, Any]], requeue: bool = False) -> int:
+        """
+        Adds tasks that are not queued yet.
+
+        :param kind: Task kind, e.g. "discover" or "extract".
+        :param items: (key, JSON-serializable payload) pairs.
+        :param requeue: Also set tasks that are already done or failed back to
+                        pending, with a fresh payload and no attempts (e.g. sites
+                        to extract again after --refresh). Leased tasks are left alone.
+        :return: Number of new (or requeued) tasks.
+        """
+        now: float = time.time()
+        rows = [(kind, key, json.dumps(payload), STATUS_PENDING, now) for key, payload in items]
+        sql: str = (
+            "INSERT OR IGNORE INTO tasks (kind, key, payload, status, updated_at) "
+            "VALUES (?, ?, ?, ?, ?)"
+        )
+        if requeue:
+            sql = (
+                "INSERT INTO tasks (kind, key, payload, status, updated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (kind, key) DO UPDATE SET payload = excluded.payload, "
+                "status = excluded.status, attempts = 0, lease_owner = NULL, "
+                "lease_expires = NULL, result = NULL, error = NULL, "
+                "updated_at = excluded.updated_at "
+                f"WHERE tasks.status IN ('{STATUS_DONE}', '{STATUS_FAILED}')"
+            )
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(sql, rows)
+            return conn.total_changes - before
+
+    def claim(self, kind: str, limit: int = 1) -> list[dict]:
+        """
+        Leases up to `limit` pending tasks (or tasks whose lease expired).
+
+        :return: Dicts with kind, key, payload and attempts (including this one).
+        """
+        now: float = time.time()
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT key, payload, attempts FROM tasks WHERE kind = ? AND attempts < ? AND "
+                "(status = ? OR (status = ? AND lease_expires < ?)) ORDER BY rowid LIMIT ?",
+                (kind, self.max_attempts, STATUS_PENDING, STATUS_LEASED, now, limit),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE tasks SET status = ?, attempts = attempts + 1, lease_owner = ?, "
+                "lease_expires = ?, updated_at = ? WHERE kind = ? AND key = ?",
+                [
+                    (STATUS_LEASED, self.worker_id, now + self.lease_seconds, now, kind, r["key"])
+                    for r in rows
+                ],
+            )
+        return [
+            {"kind": kind, "key": r["key"], "payload": json.loads(r["payload"]), "attempts": r["attempts"] + 1}
+            for r in rows
+        ]
+
+    def _update_owned(self, kind: str, key: str, sql: str, params: tuple) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                f"UPDATE tasks SET {sql}, updated_at = ? "
+                "WHERE kind = ? AND key = ? AND status = ? AND lease_owner = ?",
+                params + (time.time(), kind, key, STATUS_LEASED, self.worker_id),
+            )
+            return cursor.rowcount == 1
+
+    def heartbeat(self, kind: str, key: str) -> bool:
+        """
+        Extends this worker's lease on a task.
+
+        :return: False if the lease was lost (expired and claimed by another worker).
+        """
+        return self._update_owned(
+            kind, key, "lease_expires = ?", (time.time() + self.lease_seconds,)
+        )
+
+    @contextmanager
+    def keep_alive(self, kind: str, keys: Iterable[str]) -> Iterator[None]:
+        """
+        Renews the leases of `keys` in the background while the block runs.
+        """
+        keys = list(keys)
+        stop = threading.Event()
+
+        def beat() -> None:
+            while not stop.wait(self.lease_seconds / 3):
+                for key in keys:
+                    self.heartbeat(kind, key)
+
+        thread = threading.Thread(target=beat, name="work-queue-heartbeat", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def complete(self, kind: str, key: str, result: Any = None) -> bool:
+        """
+        Marks a leased task done with its result.
+
+        :return: False if this worker no longer holds the lease.
+        """
+        return self._update_owned(
+            kind,
+            key,
+            "status = ?, result = ?, error = NULL, lease_owner = NULL, lease_expires = NULL",
+            (STATUS_DONE, json.dumps(result)),
+        )
+
+    def fail(self, kind: str, key: str, error: str, result: Any = None) -> bool:
+        """
+        Records a failed attempt. The task is queued again until it has used
+        `max_attempts` claims, and is then marked failed.
+
+        :return: False if this worker no longer holds the lease.
+        """
+        # Attempts are checked in the same UPDATE, so a concurrent claim cannot slip in
+        return self._update_owned(
+            kind,
+            key,
+            "status = CASE WHEN attempts >= ? THEN ? ELSE ? END, result = ?, error = ?, "
+            "lease_owner = NULL, lease_expires = NULL",
+            (self.max_attempts, STATUS_FAILED, STATUS_PENDING, json.dumps(result), error),
+        )
+
+    def counts(self, kind: str) -> dict[str, int]:
+        """
+        Returns the number of tasks of `kind` per status.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) AS n FROM tasks WHERE kind = ? GROUP BY status", (kind,)
+            ).fetchall()
+        counts = {STATUS_PENDING: 0, STATUS_LEASED: 0, STATUS_DONE: 0, STATUS_FAILED: 0}
+        counts.update({r["status"]: r["n"] for r in rows})
+        return counts
+
+    def drained(self, kind: str) -> bool:
+        """
+        Returns True when no task of `kind` is left to run (all done or failed).
+        Tasks that exhausted their attempts while leased count as finished once
+        the lease expires.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM tasks WHERE kind = ? AND "
+                "(status = ? OR (status = ? AND (lease_expires >= ? OR attempts < ?)))",
+                (kind, STATUS_PENDING, STATUS_LEASED, time.time(), self.max_attempts),
+            ).fetchone()
+        return row[0] == 0
+
+    def result(self, kind: str, key: str) -> Any:
+        """
+        Returns the latest result recorded for a task (None if none).
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM tasks WHERE kind = ? AND key = ?", (kind, key)
+            ).fetchone()
+        return json.loads(row["result"]) if row and row["result"] else None
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        with self._lock:
+            self._conn.close()
@@ -5,6 +5,7 @@ import tempfile
 
 # Import the classes to test.
 from scrapper.ABATherapyScraper import ABATherapyScraper
+from scrapper.driverPool import DriverPool
 
 
 # Define a fake WebElement that simulates Selenium's element.
@@ -152,6 +153,173 @@ class TestABATherapyScraper(unittest.TestCase):
                     content = f.read()
                     self.assertIn("Name,Url,Location", content)
 
+    def test_scrape_page_uses_backend_without_browser(self) -> None:
+        """
+        Test that a backend result is used directly and the browser is not touched.
+        """
+        backend = MagicMock()
+        backend.scrape_listing.return_value = [
+            {"Name": "Backend Name", "Url": "http://example.com", "Location": "City"}
+        ]
+        scraper = ABATherapyScraper(backend=backend)
+        self.assertTrue(scraper.scrape_page())
+        self.assertEqual(scraper.contacts[0]["Name"], "Backend Name")
+        self.assertIsNone(scraper.driver)
+
+    def test_scrape_page_backend_no_results_stops(self) -> None:
+        backend = MagicMock()
+        backend.scrape_listing.return_value = []
+        scraper = ABATherapyScraper(self.fake_manager, backend=backend)
+        self.assertFalse(scraper.scrape_page())
+        self.assertEqual(self.fake_manager.driver.calls, [])
+
+    @patch("time.sleep", return_value=None)
+    def test_scrape_page_falls_back_to_selenium(self, _mock_sleep) -> None:
+        """
+        Test that the browser is used when the backend cannot read the page.
+        """
+        backend = MagicMock(offline=False, archive=None)
+        backend.scrape_listing.return_value = None
+        scraper = ABATherapyScraper(self.fake_manager, backend=backend)
+        self.assertTrue(scraper.scrape_page())
+        self.assertIn(("get", scraper.BASE_URL), self.fake_manager.driver.calls)
+        self.assertEqual(scraper.contacts[0]["Name"], "Test Title")
+
+    def test_run_resumes_from_journal(self) -> None:
+        """
+        Test that listing pages recorded in the journal are replayed, not re-scraped.
+        """
+        from scrapper.discoveryJournal import DiscoveryJournal
+
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            journal = DiscoveryJournal(pathlib.Path(tmpdirname) / "journal.jsonl")
+            journal.record_success(
+                "page:1",
+                {"contacts": [{"Name": "A", "Url": "u1", "Location": "L"}], "more": True},
+            )
+            backend = MagicMock()
+            backend.scrape_listing.side_effect = [
+                [{"Name": "B", "Url": "u2", "Location": "L"}],
+                [],
+            ]
+            scraper = ABATherapyScraper(backend=backend)
+            contacts = list(scraper.iter_contacts(journal=journal))
+
+            self.assertEqual([c["Name"] for c in contacts], ["A", "B"])
+            self.assertEqual(backend.scrape_listing.call_count, 2)
+            self.assertTrue(journal.is_done("page:2"))
+            self.assertEqual(journal.result("page:3"), {"contacts": [], "more": False})
+            journal.close()
+
+    def test_iter_contacts_yields_each_listing_page_as_it_is_read(self) -> None:
+        """
+        Test that contacts are yielded page by page, before later pages are scraped.
+        """
+        backend = MagicMock()
+        backend.scrape_listing.side_effect = [
+            [{"Name": "A", "Url": "u1", "Location": "L"}],
+            [{"Name": "B", "Url": "u2", "Location": "L"}],
+            [],
+        ]
+        scraper = ABATherapyScraper(backend=backend)
+        contacts = scraper.iter_contacts()
+
+        self.assertEqual(next(contacts)["Name"], "A")
+        self.assertEqual(backend.scrape_listing.call_count, 1)
+        self.assertEqual([c["Name"] for c in contacts], ["B"])
+        self.assertEqual(backend.scrape_listing.call_count, 3)
+        # Only the page being read is kept, not the whole directory
+        self.assertEqual(scraper.contacts, [])
+
+    def test_offline_archive_miss_is_not_the_last_page(self) -> None:
+        """
+        Test that a listing page missing from the archive is journaled as a failure.
+        """
+        from scrapper.discoveryJournal import DiscoveryJournal
+
+        backend = MagicMock(offline=True)
+        backend.scrape_listing.side_effect = [[{"Name": "A", "Url": "u1", "Location": "L"}], None]
+        scraper = ABATherapyScraper(backend=backend)
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            journal = DiscoveryJournal(pathlib.Path(tmpdirname) / "journal.jsonl")
+            contacts = scraper.iter_contacts(journal=journal)
+
+            self.assertEqual(next(contacts)["Name"], "A")
+            with self.assertRaises(RuntimeError):
+                next(contacts)
+            self.assertTrue(journal.is_done("page:1"))
+            self.assertFalse(journal.is_done("page:2"))
+            journal.close()
+
+    def test_run_keeps_every_contact(self) -> None:
+        """
+        Test that run() collects the whole directory for save_contacts_to_csv().
+        """
+        backend = MagicMock()
+        backend.scrape_listing.side_effect = [
+            [{"Name": "A", "Url": "u1", "Location": "L"}],
+            [{"Name": "B", "Url": "u2", "Location": "L"}],
+            [],
+        ]
+        scraper = ABATherapyScraper(backend=backend)
+
+        self.assertEqual([c["Name"] for c in scraper.run()], ["A", "B"])
+        self.assertEqual([c["Name"] for c in scraper.contacts], ["A", "B"])
+
+    def test_save_contacts_to_csv_streams_through_a_part_file(self) -> None:
+        """
+        Test that contacts are written as they are listed and the CSV appears at the end.
+        """
+        backend = MagicMock()
+        backend.scrape_listing.side_effect = [
+            [{"Name": "A", "Url": "u1", "Location": "L"}],
+            [{"Name": "B", "Url": "u2", "Location": "L"}],
+            [],
+        ]
+        scraper = ABATherapyScraper(backend=backend)
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            csv_file = pathlib.Path(tmpdirname) / "contacts_list.csv"
+            part_file = pathlib.Path(tmpdirname) / "contacts_list.csv.part"
+            seen: list[bool] = []
+
+            def contacts():
+                for contact in scraper.iter_contacts():
+                    seen.append(part_file.exists() and not csv_file.exists())
+                    yield contact
+
+            scraper.save_contacts_to_csv(str(csv_file), contacts())
+
+            self.assertEqual(seen, [True, True])
+            self.assertFalse(part_file.exists())
+            with open(csv_file, "r", encoding="utf-8") as f:
+                self.assertEqual(f.read().split(), ["Name,Url,Location", "A,u1,L", "B,u2,L"])
+
+    def test_pooled_discovery_resolves_over_http_without_starting_a_browser(self) -> None:
+        """
+        Test that a lazily leased browser is only started when the backend misses.
+        """
+        backend = MagicMock(offline=False, archive=None)
+        backend.get_company_url.side_effect = ["https://acme.com", None]
+        started = []
+
+        def no_chrome():
+            started.append(True)
+            raise RuntimeError("Chrome is not installed")
+
+        def discover(browser, contact):
+            return ABATherapyScraper(backend=backend, driver_provider=browser).get_company_pages(
+                contact
+            )
+
+        contact = {"Name": "Acme", "Url": "https://dir/acme", "Location": "Austin, Texas"}
+        with DriverPool(size=2, factory=no_chrome) as pool:
+            self.assertEqual(pool.run(discover, contact, lazy=True)["Link"], "https://acme.com")
+            self.assertEqual(started, [])
+            # A page the backend cannot read needs the browser, whose failure surfaces.
+            with self.assertRaises(RuntimeError):
+                pool.run(discover, contact, lazy=True)
+        self.assertEqual(started, [True])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 from scrapper.TeamExtractor import TeamExtractor
@@ -94,3 +96,344 @@ def test_extract_empty_on_exception(monkeypatch, capsys):
     # Should catch exception and return empty list, printing the error
     assert result == []
     assert "Error: Initialization failed" in captured.out
+
+
+def test_extract_reuses_cached_results(monkeypatch):
+    from scrapper.llmCache import LLMCache
+
+    runs = []
+
+    class CountingGraph:
+        def __init__(self, prompt, source, config):
+            self.source = source
+
+        def run(self):
+            runs.append(("links", self.source))
+            return {"content": ["https://example.com/team"]}
+
+    class CountingMultiGraph:
+        def __init__(self, prompt, source, config):
+            self.source = source
+
+        def run(self):
+            runs.append(("team", self.source))
+            return {"team_members": [{"name": "Alice", "position": "BCBA"}]}
+
+    class FakeFetcher:
+        def __init__(self):
+            self.pages = {
+                "https://example.com": "<html>home</html>",
+                "https://example.com/team": "<html>Alice</html>",
+            }
+
+        def fetch(self, url, quiet=False):
+            return self.pages.get(url)
+
+    monkeypatch.setattr("scrapper.TeamExtractor.SmartScraperGraph", CountingGraph)
+    monkeypatch.setattr("scrapper.TeamExtractor.SmartScraperMultiGraph", CountingMultiGraph)
+
+    fetcher = FakeFetcher()
+    cache = LLMCache(":memory:")
+    extractor = TeamExtractor(cache=cache, fetcher=fetcher)
+
+    first = extractor.extract("example.com")
+    second = extractor.extract("example.com")
+    assert first == second == [{"Url": "example.com", "name": "Alice", "position": "BCBA"}]
+    assert len(runs) == 2
+    assert cache.stats()["hits"] == 2
+
+    # A changed team page invalidates only the second stage
+    fetcher.pages["https://example.com/team"] = "<html>Alice and Bob</html>"
+    extractor.extract("example.com")
+    assert runs[-1] == ("team", ["https://example.com/team"])
+    assert len(runs) == 3
+
+
+def test_extract_uses_heuristic_links_before_llm(monkeypatch):
+    sources = []
+
+    class FailingGraph:
+        def __init__(self, prompt, source, config):
+            raise AssertionError("LLM link listing should not run")
+
+    class RecordingMultiGraph:
+        def __init__(self, prompt, source, config):
+            sources.append(source)
+
+        def run(self):
+            return {"team_members": [{"name": "Alice", "position": "BCBA"}]}
+
+    class FakeFinder:
+        def find(self, url):
+            return ["https://example.com/our-team/"]
+
+    monkeypatch.setattr("scrapper.TeamExtractor.SmartScraperGraph", FailingGraph)
+    monkeypatch.setattr("scrapper.TeamExtractor.SmartScraperMultiGraph", RecordingMultiGraph)
+
+    extractor = TeamExtractor(finder=FakeFinder())
+    assert extractor.extract("example.com") == [
+        {"Url": "example.com", "name": "Alice", "position": "BCBA"}
+    ]
+    assert sources == [["https://example.com/our-team/"]]
+
+
+def test_extract_visits_ranked_links_until_roster_found(monkeypatch, capsys):
+    sources = []
+    rosters = {
+        "https://example.com/our-team/": [
+            {"name": "Alice", "position": "BCBA"},
+            {"name": "Bob", "position": "RBT"},
+        ],
+    }
+
+    class LinksGraph:
+        def __init__(self, prompt, source, config):
+            pass
+
+        def run(self):
+            return {
+                "content": [
+                    "https://example.com/blog/post-1",
+                    "https://other.com/team",
+                    "https://example.com/about",
+                    "https://example.com/our-team/",
+                    "https://example.com/our-team",
+                    "https://example.com/locations",
+                ]
+            }
+
+    class RecordingMultiGraph:
+        def __init__(self, prompt, source, config):
+            sources.append(source)
+            self.source = source
+
+        def run(self):
+            return {"team_members": rosters.get(self.source[0], [])}
+
+    monkeypatch.setattr("scrapper.TeamExtractor.SmartScraperGraph", LinksGraph)
+    monkeypatch.setattr("scrapper.TeamExtractor.SmartScraperMultiGraph", RecordingMultiGraph)
+
+    result = TeamExtractor().extract("example.com")
+    assert [m["name"] for m in result] == ["Alice", "Bob"]
+    # The team page ranks first, and the roster ends the search there
+    assert sources == [["https://example.com/our-team/"]]
+    assert "stopped: roster found" in capsys.readouterr().out
+
+
+def test_extract_respects_page_and_token_caps(monkeypatch):
+    sources = []
+
+    class FakeFinder:
+        def find(self, url):
+            return ["https://example.com/team", "https://example.com/staff", "https://example.com/about"]
+
+    class FakeFetcher:
+        def fetch(self, url, quiet=False):
+            return "x" * (400 if url.endswith("/about") else 40)
+
+    class OneMemberGraph:
+        def __init__(self, prompt, source, config):
+            sources.append(source[0])
+
+        def run(self):
+            return {"team_members": [{"name": sources[-1], "position": "BCBA"}]}
+
+    monkeypatch.setattr("scrapper.TeamExtractor.SmartScraperMultiGraph", OneMemberGraph)
+
+    capped = TeamExtractor(finder=FakeFinder(), fetcher=FakeFetcher(), max_pages=1, min_roster=5)
+    assert len(capped.extract("example.com")) == 1
+    assert sources == ["https://example.com/team"]
+
+    sources.clear()
+    budget = TeamExtractor(finder=FakeFinder(), fetcher=FakeFetcher(), max_tokens=50, min_roster=5)
+    assert len(budget.extract("example.com")) == 2
+    assert sources == ["https://example.com/team", "https://example.com/staff"]
+
+
+def test_extract_sends_reduced_page_text(monkeypatch):
+    sources = []
+    staff = "".join(f"<p>Member {i} - Behavior Technician</p>" for i in range(10))
+    page = (
+        "<html><head><script>var tracking = 1;</script></head><body>"
+        "<nav>Home Services Contact</nav>"
+        f"<main><h1>Our Team</h1>{staff}</main>"
+        "<footer>Copyright</footer></body></html>"
+    )
+
+    class FakeFinder:
+        def find(self, url):
+            return ["https://example.com/team"]
+
+    class FakeFetcher:
+        def fetch(self, url, quiet=False):
+            return page
+
+    class RecordingMultiGraph:
+        def __init__(self, prompt, source, config):
+            sources.append(source)
+
+        def run(self):
+            return {"team_members": [{"name": "Member 0", "position": "Behavior Technician"}]}
+
+    monkeypatch.setattr("scrapper.TeamExtractor.SmartScraperMultiGraph", RecordingMultiGraph)
+
+    extractor = TeamExtractor(finder=FakeFinder(), fetcher=FakeFetcher())
+    extractor.extract("example.com")
+
+    assert len(sources) == 1
+    text = "\n".join(sources[0])
+    assert text.startswith("# Our Team\nMember 0 - Behavior Technician")
+    assert "tracking" not in text and "Copyright" not in text
+    stats = extractor.reduction_stats[0]
+    assert stats["url"] == "https://example.com/team"
+    assert stats["tokens_after"] < stats["tokens_before"]
+
+
+def test_extract_skips_llm_for_structured_team_pages(monkeypatch):
+    people = [{"@type": "Person", "name": n, "jobTitle": t} for n, t in [("Jane Doe", "BCBA"), ("John Smith", "RBT")]]
+    page = f'<html><body><script type="application/ld+json">{json.dumps(people)}</script></body></html>'
+
+    class FakeFinder:
+        def find(self, url):
+            return ["https://example.com/team"]
+
+    class FakeFetcher:
+        def fetch(self, url, quiet=False):
+            return page
+
+    class FailingMultiGraph:
+        def __init__(self, prompt, source, config):
+            raise AssertionError("LLM extraction should not run")
+
+    monkeypatch.setattr("scrapper.TeamExtractor.SmartScraperMultiGraph", FailingMultiGraph)
+
+    extractor = TeamExtractor(finder=FakeFinder(), fetcher=FakeFetcher())
+    assert extractor.extract_members("example.com") == [
+        {"Url": "example.com", "name": "Jane Doe", "position": "BCBA"},
+        {"Url": "example.com", "name": "John Smith", "position": "RBT"},
+    ]
+
+
+def test_extract_many_streams_results_with_bounded_concurrency(monkeypatch):
+    import asyncio
+    import threading
+    import time
+
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def fake_extract_members(self, url, links=None):
+        with lock:
+            running.append(url)
+            peak.append(len(running))
+        time.sleep(0.3 if url == "slow.com" else 0.01)
+        with lock:
+            running.remove(url)
+        if url == "broken.com":
+            raise RuntimeError("boom")
+        return [{"Url": url, "name": "Alice", "position": "BCBA"}]
+
+    monkeypatch.setattr(TeamExtractor, "extract_members", fake_extract_members)
+    extractor = TeamExtractor()
+    links = ["slow.com", "a.com", "b.com", "broken.com", "c.com"]
+
+    async def collect():
+        return [outcome async for outcome in extractor.extract_many(links, concurrency=2)]
+
+    outcomes = asyncio.run(collect())
+
+    assert sorted(o["url"] for o in outcomes) == sorted(links)
+    # The slow site does not hold back the others
+    assert outcomes[-1]["url"] == "slow.com"
+    assert max(peak) <= 2
+    broken = next(o for o in outcomes if o["url"] == "broken.com")
+    assert broken["members"] == [] and broken["error"] == "boom"
+    assert all(o["seconds"] >= 0 for o in outcomes)
+
+
+def test_run_graph_retries_after_rate_limit(monkeypatch):
+    from scrapper.rateLimiter import RateLimiter
+
+    calls = []
+
+    class RateLimitError(Exception):
+        pass
+
+    class FlakyGraph:
+        def __init__(self, prompt, source, config):
+            pass
+
+        def run(self):
+            calls.append(1)
+            if len(calls) == 1:
+                raise RateLimitError("429 Too Many Requests")
+            return {"team_members": []}
+
+    pauses = []
+    limiter = RateLimiter(rpm=100, tpm=10**6)
+    monkeypatch.setattr(limiter, "pause", pauses.append)
+
+    extractor = TeamExtractor(limiter=limiter)
+    assert extractor.run_graph(FlakyGraph, "prompt", ["https://example.com"]) == {"team_members": []}
+    assert len(calls) == 2
+    assert pauses == [10.0]
+
+
+def test_plan_site_batches_small_pages_only():
+    staff = "".join(f"<p>Member {i} - Behavior Technician</p>" for i in range(10))
+    pages = {
+        "https://small.com/team": f"<html><body><main>{staff}</main></body></html>",
+        "https://large.com/team": f"<html><body><main>{staff * 50}</main></body></html>",
+    }
+
+    class FakeFinder:
+        def find(self, url):
+            return [f"{url}/team"]
+
+    class FakeFetcher:
+        def fetch(self, url, quiet=False):
+            return pages.get(url)
+
+    extractor = TeamExtractor(finder=FakeFinder(), fetcher=FakeFetcher())
+    plan = extractor.plan_site("small.com", max_page_tokens=1500)
+    assert plan["link"] == "https://small.com/team"
+    assert plan["text"].startswith("Member 0 - Behavior Technician")
+    assert plan["links"] == ["https://small.com/team"]
+    # Sites left to extract_members carry their candidate links along
+    assert extractor.plan_site("large.com", max_page_tokens=1500) == {
+        "links": ["https://large.com/team"]
+    }
+    assert extractor.plan_site("missing.com", max_page_tokens=1500) == {
+        "links": ["https://missing.com/team"]
+    }
+
+
+def test_extract_members_reuses_planned_links(monkeypatch):
+    staff = "".join(f"<p>Member {i} - Behavior Technician</p>" for i in range(10))
+
+    class FakeFetcher:
+        def fetch(self, url, quiet=False):
+            return f"<html><body><main>{staff * 50}</main></body></html>"
+
+    extractor = TeamExtractor(fetcher=FakeFetcher())
+    discovered = []
+
+    def discover_links(url):
+        discovered.append(url)
+        return ["https://large.com/team"]
+
+    monkeypatch.setattr(extractor, "discover_links", discover_links)
+    monkeypatch.setattr(
+        extractor,
+        "run_graph",
+        lambda *args: {"team_members": [{"name": "Jane Doe", "position": "BCBA"}]},
+    )
+
+    plan = extractor.plan_site("large.com", max_page_tokens=1500)
+    members = extractor.extract_members("large.com", plan["links"])
+
+    # The LLM link listing behind discover_links runs once per site
+    assert discovered == ["large.com"]
+    assert [m["name"] for m in members] == ["Jane Doe"]
+    assert extractor.sources["large.com"] == ["https://large.com/team"]
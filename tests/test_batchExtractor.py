@@ -0,0 +1,165 @@
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from scrapper.batchExtractor import BatchExtractor
+from scrapper.llmCache import LLMCache
+
+PAGE_PATTERN = re.compile(r'<page id="(\d+)" url="([^"]*)">\n(.*?)\n</page>', re.S)
+
+
+class FakeLLM(BaseHTTPRequestHandler):
+    """
+    OpenAI-compatible chat completions endpoint.
+
+    Every "Name - Title" line of a page becomes a team member. Pages whose URL
+    contains "garbled" get a malformed entry when they are part of a batch.
+    """
+
+    requests: list = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        pages = PAGE_PATTERN.findall(body["messages"][-1]["content"])
+        type(self).requests.append([url for _, url, _ in pages])
+
+        entries = []
+        for page_id, url, text in pages:
+            if "garbled" in url and len(pages) > 1:
+                entries.append({"id": page_id, "team_members": "see above"})
+                continue
+            members = [
+                {"name": name, "position": title}
+                for name, title in (line.split(" - ", 1) for line in text.splitlines() if " - " in line)
+            ]
+            entries.append({"id": page_id, "team_members": members})
+
+        payload = json.dumps(
+            {
+                "id": "chatcmpl-test",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": json.dumps({"pages": entries})},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+            }
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_llm():
+    FakeLLM.requests = []
+    server = HTTPServer(("127.0.0.1", 0), FakeLLM)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+def make_extractor(base_url, **kwargs):
+    from openai import OpenAI
+
+    client = OpenAI(api_key="test", base_url=base_url, max_retries=0)
+    return BatchExtractor(client=client, **kwargs)
+
+
+def page(key, text):
+    return {"key": key, "url": f"https://{key}/team", "text": text}
+
+
+def test_pack_respects_token_budget():
+    extractor = BatchExtractor(client=object(), max_tokens=300)
+    pages = [page(f"site{i}.com", "x" * 160) for i in range(5)]
+    batches = extractor.pack(pages)
+    # 200-token prompt reserve leaves room for one 60-token page per batch
+    assert [len(batch) for batch in batches] == [1, 1, 1, 1, 1]
+    assert [p for batch in batches for p in batch] == pages
+    assert [len(b) for b in BatchExtractor(client=object(), max_tokens=400).pack(pages)] == [3, 2]
+
+
+def test_extracts_many_pages_in_one_request(fake_llm):
+    extractor = make_extractor(fake_llm)
+    results = extractor.extract(
+        [
+            page("a.com", "# Our Team\nJane Doe - BCBA\nJohn Smith - RBT"),
+            page("b.com", "Mary Major - Clinical Director"),
+            page("c.com", "Nobody here"),
+        ]
+    )
+
+    assert FakeLLM.requests == [["https://a.com/team", "https://b.com/team", "https://c.com/team"]]
+    assert results == {
+        "a.com": {
+            "members": [
+                {"name": "Jane Doe", "position": "BCBA"},
+                {"name": "John Smith", "position": "RBT"},
+            ],
+            "error": None,
+        },
+        "b.com": {"members": [{"name": "Mary Major", "position": "Clinical Director"}], "error": None},
+        "c.com": {"members": [], "error": None},
+    }
+
+
+def test_invalid_entries_are_retried_alone(fake_llm):
+    extractor = make_extractor(fake_llm)
+    results = extractor.extract(
+        [page("a.com", "Jane Doe - BCBA"), page("garbled.com", "John Smith - RBT")]
+    )
+
+    assert FakeLLM.requests == [
+        ["https://a.com/team", "https://garbled.com/team"],
+        ["https://garbled.com/team"],
+    ]
+    assert results["garbled.com"] == {
+        "members": [{"name": "John Smith", "position": "RBT"}],
+        "error": None,
+    }
+    assert extractor.requests == 2
+
+
+def test_results_are_cached_per_page(fake_llm):
+    cache = LLMCache(":memory:")
+    extractor = make_extractor(fake_llm, cache=cache)
+    pages = [page("a.com", "Jane Doe - BCBA"), page("b.com", "John Smith - RBT")]
+
+    first = extractor.extract(pages)
+    second = extractor.extract(pages + [page("c.com", "Mary Major - CEO")])
+
+    assert second["a.com"] == first["a.com"]
+    assert FakeLLM.requests[-1] == ["https://c.com/team"]
+
+
+def test_request_errors_are_reported_per_page():
+    class FailingCompletions:
+        def create(self, **kwargs):
+            raise ConnectionError("LLM down")
+
+    class FailingClient:
+        chat = type("Chat", (), {"completions": FailingCompletions()})()
+
+    results = BatchExtractor(client=FailingClient()).extract(
+        [page("a.com", "Jane Doe - BCBA"), page("b.com", "John Smith - RBT")]
+    )
+    assert results == {
+        "a.com": {"members": [], "error": "LLM down"},
+        "b.com": {"members": [], "error": "LLM down"},
+    }
@@ -0,0 +1,70 @@
+import pytest
+
+from scrapper.columnarExport import state_of
+from scrapper.consolidation import Consolidator
+from scrapper.resultStore import ResultStore
+from scrapper.siteIndex import SiteIndex
+
+
+def test_state_of():
+    assert state_of("Riverside, California") == "California"
+    assert state_of("Washington, D.C., District of Columbia") == "District of Columbia"
+    assert state_of("") == "Unknown"
+
+
+@pytest.fixture
+def consolidated(tmp_path):
+    store = ResultStore(":memory:")
+    index = SiteIndex(
+        [
+            {"Name": "IE Clinic", "Link": "acme.com", "Location": "Riverside, California", "Url": "1"},
+            {"Name": "OC Clinic", "Link": "www.acme.com", "Location": "Irvine, California", "Url": "2"},
+            {"Name": "Beta", "Link": "beta.org", "Location": "Austin, Texas", "Url": "3"},
+        ]
+    )
+    store.save_site_members(
+        "acme.com",
+        "https://acme.com",
+        [{"name": "Alice", "position": "BCBA"}, {"name": "Ann", "position": "RBT"}],
+    )
+    store.save_site_members("beta.org", "https://beta.org", [{"name": "Bob", "position": "RBT"}])
+    Consolidator(store, tmp_path / "final_team_members.csv").build(index)
+    return store, index
+
+
+def test_export_partitions_parquet_by_state(tmp_path, consolidated):
+    pyarrow = pytest.importorskip("pyarrow")
+    from scrapper.columnarExport import ColumnarExporter, load_members
+
+    store, index = consolidated
+    parquet_dir = tmp_path / "final_team_members.parquet"
+    stats = ColumnarExporter(store, parquet_dir).export(index)
+
+    assert stats["rows"] == 5
+    assert stats["states"] == 2
+    assert sorted(p.name for p in parquet_dir.iterdir()) == ["State=California", "State=Texas"]
+
+    texas = load_members(parquet_dir, states=["Texas"])
+    assert texas.column("Name").to_pylist() == ["Bob"]
+    assert pyarrow.types.is_dictionary(texas.schema.field("Company").type)
+    names = load_members(parquet_dir, columns=["Name"]).column("Name").to_pylist()
+    assert sorted(names) == ["Alice", "Alice", "Ann", "Ann", "Bob"]
+
+
+def test_export_replaces_previous_outputs(tmp_path, consolidated):
+    pytest.importorskip("pyarrow")
+    from scrapper.columnarExport import ColumnarExporter, load_members
+
+    store, index = consolidated
+    exporter = ColumnarExporter(
+        store, tmp_path / "members.parquet", tmp_path / "members.arrow"
+    )
+    exporter.export(index)
+    store.save_site_members("beta.org", "https://beta.org", [])
+    Consolidator(store, tmp_path / "final_team_members.csv").build(index)
+    exporter.export(index)
+
+    assert sorted(p.name for p in (tmp_path / "members.parquet").iterdir()) == ["State=California"]
+    arrow = load_members(tmp_path / "members.arrow", states=["California"], columns=["Name"])
+    assert sorted(arrow.column("Name").to_pylist()) == ["Alice", "Alice", "Ann", "Ann"]
+    assert not [p for p in tmp_path.iterdir() if p.name.startswith(".")]
@@ -0,0 +1,71 @@
+import csv
+
+from scrapper.consolidation import Consolidator
+from scrapper.resultStore import ResultStore
+from scrapper.siteIndex import SiteIndex
+
+
+def make_index():
+    return SiteIndex(
+        [
+            {"Name": "IE Clinic", "Link": "acme.com", "Location": "Riverside, California", "Url": "1"},
+            {"Name": "OC Clinic", "Link": "www.acme.com", "Location": "Irvine, California", "Url": "2"},
+            {"Name": "Beta", "Link": "beta.org", "Location": "Austin, Texas", "Url": "3"},
+        ]
+    )
+
+
+def read_rows(path):
+    with open(path, encoding="utf-8", newline="") as csv_file:
+        return list(csv.reader(csv_file))
+
+
+def test_build_joins_members_to_every_clinic(tmp_path):
+    store = ResultStore(":memory:")
+    store.save_site_members("acme.com", "https://acme.com", [{"name": "Alice", "position": "BCBA"}])
+    store.save_site_members("beta.org", "https://beta.org", [{"name": "Bob", "position": "RBT"}])
+    output = tmp_path / "final_team_members.csv"
+
+    stats = Consolidator(store, output).build(make_index())
+
+    assert stats == {"sites": 2, "merged": 2, "rows": 3, "written": True}
+    assert read_rows(output) == [
+        ["Url", "Name", "Title", "Company", "Location"],
+        ["acme.com", "Alice", "BCBA", "IE Clinic", "Riverside, California"],
+        ["www.acme.com", "Alice", "BCBA", "OC Clinic", "Irvine, California"],
+        ["beta.org", "Bob", "RBT", "Beta", "Austin, Texas"],
+    ]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_rebuild_only_merges_changed_sites(tmp_path):
+    store = ResultStore(":memory:")
+    store.save_site_members("acme.com", "https://acme.com", [{"name": "Alice", "position": "BCBA"}])
+    store.save_site_members("beta.org", "https://beta.org", [{"name": "Bob", "position": "RBT"}])
+    output = tmp_path / "final_team_members.csv"
+    consolidator = Consolidator(store, output)
+    consolidator.build(make_index())
+
+    # Nothing changed: no merge and no rewrite
+    assert consolidator.build(make_index())["written"] is False
+
+    store.save_site_members("beta.org", "https://beta.org", [{"name": "Carol", "position": "BCBA"}])
+    stats = consolidator.build(make_index())
+    assert stats["merged"] == 1
+    assert read_rows(output)[-1] == ["beta.org", "Carol", "BCBA", "Beta", "Austin, Texas"]
+
+
+def test_output_is_rewritten_when_missing_or_sites_removed(tmp_path):
+    store = ResultStore(":memory:")
+    store.save_site_members("acme.com", "https://acme.com", [{"name": "Alice", "position": "BCBA"}])
+    store.save_site_members("beta.org", "https://beta.org", [{"name": "Bob", "position": "RBT"}])
+    output = tmp_path / "final_team_members.csv"
+    consolidator = Consolidator(store, output)
+    consolidator.build(make_index())
+
+    output.unlink()
+    assert consolidator.build(make_index())["written"] is True
+
+    smaller = SiteIndex([{"Name": "Beta", "Link": "beta.org", "Location": "Austin, Texas", "Url": "3"}])
+    stats = consolidator.build(smaller)
+    assert stats == {"sites": 1, "merged": 0, "rows": 1, "written": True}
@@ -0,0 +1,135 @@
+import csv
+import random
+import string
+import time
+
+import pytest
+
+from scrapper.consolidation import Consolidator
+from scrapper.deduplication import Deduplicator, normalize_name, person_id, same_person, soundex
+from scrapper.resultStore import ResultStore
+from scrapper.siteIndex import SiteIndex
+
+
+@pytest.mark.parametrize(
+    "name, tokens, credentials",
+    [
+        ("Dr. Jane M. Doe, M.Ed., BCBA", ["jane", "doe"], ["BCBA", "MED"]),
+        ("Jane Doe", ["jane", "doe"], []),
+        ("Doe, Jane", ["jane", "doe"], []),
+        ("Ms. Jane Doe", ["jane", "doe"], []),
+        ("Jane Doe BCBA-D", ["jane", "doe"], ["BCBAD"]),
+        ("Jane Doe, Clinical Director", ["jane", "doe"], []),
+        ("José Núñez (he/him)", ["jose", "nunez"], []),
+        ("John Smith Jr.", ["john", "smith"], []),
+        ("Anh Do", ["anh", "do"], []),
+    ],
+)
+def test_normalize_name(name, tokens, credentials):
+    assert normalize_name(name) == (tokens, credentials)
+
+
+def test_soundex():
+    assert soundex("Robert") == soundex("Rupert") == "R163"
+    assert soundex("Ashcraft") == "A261"
+    assert soundex("Tymczak") == "T522"
+    assert soundex("Lee") == "L000"
+
+
+def test_same_person():
+    assert same_person(["jon", "doe"], ["john", "doe"])
+    assert same_person(["jen", "smith"], ["jennifer", "smith"])
+    assert same_person(["mary", "jonson"], ["mary", "johnson"])
+    assert not same_person(["jane", "doe"], ["jake", "doe"])
+    assert not same_person(["doe"], ["jane", "doe"])
+
+
+def make_rows():
+    return [
+        ["acme.com", "Dr. Jane Doe, BCBA", "Clinical Director", "IE Clinic", "Riverside"],
+        ["www.acme.com", "Dr. Jane Doe, BCBA", "Clinical Director", "OC Clinic", "Irvine"],
+        ["acme.com", "Jane Doe", "BCBA", "IE Clinic", "Riverside"],
+        ["acme.com", "John Doe", "RBT", "IE Clinic", "Riverside"],
+        ["acme.com", "Jon Doe", "RBT", "IE Clinic", "Riverside"],
+        ["acme.com", "Jake Doe", "RBT", "IE Clinic", "Riverside"],
+    ]
+
+
+def test_link_merges_variants_and_clinics():
+    people = Deduplicator.link("acme.com", make_rows())
+
+    assert [p["name"] for p in people] == ["Jane Doe", "John Doe", "Jake Doe"]
+    jane = people[0]
+    assert jane["id"] == person_id("acme.com", ["jane", "doe"])
+    assert jane["title"] == "Clinical Director"
+    assert jane["credentials"] == ["BCBA"]
+    assert jane["clinics"] == [
+        ["acme.com", "IE Clinic", "Riverside"],
+        ["www.acme.com", "OC Clinic", "Irvine"],
+    ]
+    assert jane["variants"] == 2
+
+
+def test_person_ids_are_stable_and_scoped_to_the_site():
+    first = Deduplicator.link("acme.com", make_rows())
+    again = Deduplicator.link("acme.com", list(reversed(make_rows())))
+    assert {p["id"] for p in first} == {p["id"] for p in again}
+
+    other_site = Deduplicator.link("beta.org", make_rows())
+    assert not {p["id"] for p in first} & {p["id"] for p in other_site}
+
+
+def test_build_writes_people_and_their_clinics(tmp_path):
+    store = ResultStore(":memory:")
+    index = SiteIndex(
+        [
+            {"Name": "IE Clinic", "Link": "acme.com", "Location": "Riverside", "Url": "1"},
+            {"Name": "OC Clinic", "Link": "www.acme.com", "Location": "Irvine", "Url": "2"},
+        ]
+    )
+    store.save_site_members(
+        "acme.com",
+        "https://acme.com",
+        [{"name": "Dr. Jane Doe, BCBA", "position": "BCBA"}, {"name": "Jane Doe", "position": "BCBA"}],
+    )
+    Consolidator(store, tmp_path / "final_team_members.csv").build(index)
+
+    stats = Deduplicator(store, tmp_path / "people.csv", tmp_path / "person_clinics.csv").build(index)
+
+    assert stats == {"records": 4, "people": 1, "links": 2, "merged": 1}
+    with open(tmp_path / "people.csv", encoding="utf-8", newline="") as people_file:
+        people = list(csv.DictReader(people_file))
+    assert people == [
+        {
+            "PersonId": person_id("acme.com", ["jane", "doe"]),
+            "Name": "Jane Doe",
+            "Title": "BCBA",
+            "Credentials": "BCBA",
+            "Site": "acme.com",
+            "Clinics": "2",
+        }
+    ]
+    with open(tmp_path / "person_clinics.csv", encoding="utf-8", newline="") as links_file:
+        links = list(csv.reader(links_file))
+    assert [row[1:] for row in links[1:]] == [
+        ["acme.com", "IE Clinic", "Riverside"],
+        ["www.acme.com", "OC Clinic", "Irvine"],
+    ]
+
+
+def test_link_scales_linearly_with_blocking():
+    rng = random.Random(7)
+
+    def word():
+        return "".join(rng.choices(string.ascii_lowercase, k=7)).title()
+
+    names = list(dict.fromkeys(f"{word()} {word()}" for _ in range(5000)))
+    rows = [
+        ["site.com", f"Dr. {name}, BCBA", "BCBA", f"Clinic {c}", "City"]
+        for name in names
+        for c in range(4)
+    ]
+    started = time.perf_counter()
+    people = Deduplicator.link("site.com", rows)
+    assert time.perf_counter() - started < 5
+    assert len(people) == len(names)
@@ -0,0 +1,61 @@
+import json
+
+from scrapper.discoveryJournal import DiscoveryJournal
+
+
+CONTACTS = [{"Url": f"https://dir/{i}/", "Name": f"Clinic {i}"} for i in range(4)]
+
+
+def key(contact):
+    return contact["Url"]
+
+
+def test_completed_entries_are_skipped_after_restart(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = DiscoveryJournal(path)
+    journal.record_success("https://dir/0/", {"Link": "zero.com"})
+    journal.record_failure("https://dir/1/", "timeout")
+    journal.close()
+
+    resumed = DiscoveryJournal(path)
+    assert [c["Url"] for c in resumed.pending(CONTACTS, key)] == [
+        "https://dir/1/", "https://dir/2/", "https://dir/3/"
+    ]
+    assert resumed.result("https://dir/0/") == {"Link": "zero.com"}
+    assert resumed.attempts("https://dir/1/") == 1
+
+
+def test_failed_entries_stop_after_max_attempts(tmp_path):
+    journal = DiscoveryJournal(tmp_path / "journal.jsonl", max_attempts=2)
+    journal.record_failure("https://dir/0/", "timeout")
+    assert journal.pending(CONTACTS[:1], key) == CONTACTS[:1]
+    journal.record_failure("https://dir/0/", "timeout", result={"Link": ""})
+    assert journal.pending(CONTACTS[:1], key) == []
+    assert journal.result("https://dir/0/") == {"Link": ""}
+    assert not journal.is_done("https://dir/0/")
+
+
+def test_every_outcome_is_written_immediately(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = DiscoveryJournal(path)
+    journal.record_success("a", 1)
+    journal.record_failure("b", "boom")
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [(e["key"], e["status"], e["attempt"]) for e in lines] == [
+        ("a", "ok", 1), ("b", "failed", 1)
+    ]
+    journal.close()
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = DiscoveryJournal(path)
+    journal.record_success("a", 1)
+    journal.close()
+    with path.open("a") as f:
+        f.write('{"key": "b", "status": "o')
+
+    resumed = DiscoveryJournal(path)
+    assert resumed.is_done("a")
+    assert not resumed.is_done("b")
@@ -1,3 +1,4 @@
+import json
 import unittest
 from unittest.mock import patch, MagicMock
 from scrapper.driverManager import ChromeDriverManager
@@ -42,6 +43,55 @@ class TestChromeDriverManager(unittest.TestCase):
         # Verify that the driver's quit() method was called exactly once.
         fake_driver.quit.assert_called_once()
 
+    @patch("scrapper.driverManager.webdriver.Chrome")
+    def test_lean_profile(self, mock_chrome):
+        """
+        Test that the lean profile sets eager loading, a fixed viewport and URL blocking.
+        """
+        fake_driver = MagicMock()
+        mock_chrome.return_value = fake_driver
+
+        manager = ChromeDriverManager(headless=True, lean=True)
+
+        options = mock_chrome.call_args.kwargs["options"]
+        self.assertEqual(options.page_load_strategy, "eager")
+        self.assertIn("--window-size=1280,800", options.arguments)
+        fake_driver.maximize_window.assert_not_called()
+
+        blocked = fake_driver.execute_cdp_cmd.call_args_list[-1]
+        self.assertEqual(blocked.args[0], "Network.setBlockedURLs")
+        self.assertIn("*hs-banner.com*", blocked.args[1]["urls"])
+        self.assertIn("*.woff2", blocked.args[1]["urls"])
+        self.assertTrue(manager.lean)
+
+    @patch("scrapper.driverManager.webdriver.Chrome")
+    def test_collect_page_stats(self, mock_chrome):
+        """
+        Test that transferred bytes and blocked requests are read from the performance log.
+        """
+        def entry(method, **params):
+            return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+        fake_driver = MagicMock()
+        fake_driver.get_log.return_value = [
+            entry("Network.requestWillBeSent", requestId="1"),
+            entry("Network.loadingFinished", requestId="1", encodedDataLength=1200),
+            entry("Network.requestWillBeSent", requestId="2"),
+            entry("Network.loadingFailed", requestId="2", type="Image", blockedReason="inspector"),
+            entry("Network.requestWillBeSent", requestId="3"),
+            entry("Network.loadingFailed", requestId="3", type="Script", errorText="net::ERR_FAILED"),
+        ]
+        mock_chrome.return_value = fake_driver
+
+        manager = ChromeDriverManager(headless=True, lean=True)
+        stats = manager.collect_page_stats("https://example.com/")
+
+        self.assertEqual(stats["requests"], 3)
+        self.assertEqual(stats["bytes_transferred"], 1200)
+        self.assertEqual(stats["blocked_requests"], 1)
+        self.assertEqual(stats["bytes_saved"], 40_000)
+        self.assertEqual(manager.page_stats, [stats])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,148 @@
+import threading
+import time
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from scrapper.driverPool import BrowserlessPool, DriverPool
+
+
+class FakeManager:
+    created = 0
+
+    def __init__(self) -> None:
+        FakeManager.created += 1
+        self.name = f"driver-{FakeManager.created}"
+        self.quit_called = False
+
+    def quit(self) -> None:
+        self.quit_called = True
+
+
+@pytest.fixture(autouse=True)
+def reset_counter():
+    FakeManager.created = 0
+
+
+def test_map_preserves_input_order():
+    def work(manager, item):
+        # Later items finish first
+        time.sleep(0.01 * (5 - item))
+        return item * 10
+
+    with DriverPool(size=3, factory=FakeManager) as pool:
+        assert pool.map(work, range(5)) == [0, 10, 20, 30, 40]
+    assert FakeManager.created <= 3
+
+
+def test_map_runs_items_concurrently():
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def work(manager, item):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return item
+
+    with DriverPool(size=4, factory=FakeManager) as pool:
+        pool.map(work, range(8))
+    assert peak > 1
+
+
+def test_drivers_are_recycled_after_max_pages():
+    managers = []
+
+    def work(manager, item):
+        managers.append(manager)
+        return item
+
+    pool = DriverPool(size=1, max_pages=2, factory=FakeManager)
+    pool.map(work, range(5))
+    pool.close()
+
+    assert FakeManager.created == 3
+    assert managers[0] is managers[1]
+    assert managers[1] is not managers[2]
+    assert managers[0].quit_called
+    assert pool.recycled == 2
+
+
+def test_crashed_driver_is_replaced_and_item_retried():
+    crashed = []
+
+    def work(manager, item):
+        if not crashed:
+            crashed.append(manager)
+            raise WebDriverException("chrome not reachable")
+        return manager.name
+
+    with DriverPool(size=1, retries=1, factory=FakeManager) as pool:
+        assert pool.map(work, ["contact"]) == ["driver-2"]
+    assert crashed[0].quit_called
+
+
+def test_crash_is_raised_after_retries_exhausted():
+    def work(manager, item):
+        raise WebDriverException("tab crashed")
+
+    with DriverPool(size=1, retries=1, factory=FakeManager) as pool:
+        with pytest.raises(WebDriverException):
+            pool.map(work, ["contact"])
+    assert FakeManager.created == 2
+
+
+def test_lazy_run_only_starts_a_browser_when_asked():
+    with DriverPool(size=2, factory=FakeManager) as pool:
+        assert pool.run(lambda browser, item: item, "http-only", lazy=True) == "http-only"
+        assert FakeManager.created == 0
+        assert pool.run(lambda browser, item: browser().name, "needs-browser", lazy=True) == "driver-1"
+        # The leased browser went back to the pool
+        assert pool.map(lambda browser, item: browser().name, ["again"], lazy=True) == ["driver-1"]
+    assert FakeManager.created == 1
+
+
+def test_failing_factory_surfaces_from_run():
+    def no_chrome():
+        raise RuntimeError("Chrome is not installed")
+
+    with DriverPool(size=1, factory=no_chrome) as pool:
+        with pytest.raises(RuntimeError):
+            pool.run(lambda manager, item: item, "contact")
+        assert pool.run(lambda browser, item: item, "contact", lazy=True) == "contact"
+
+
+def test_waiting_for_a_browser_times_out():
+    with DriverPool(size=1, factory=FakeManager, acquire_timeout=0.2) as pool:
+        # A lease that is never released keeps the only browser busy
+        pool._acquire()
+        started = time.monotonic()
+        with pytest.raises(TimeoutError):
+            pool.run(lambda manager, item: item, "contact")
+        assert time.monotonic() - started < 2
+
+
+def test_discarded_browser_frees_its_slot_for_waiters(monkeypatch):
+    monkeypatch.setattr("scrapper.driverPool.ACQUIRE_POLL_SECONDS", 0.01)
+    with DriverPool(size=1, factory=FakeManager, acquire_timeout=5) as pool:
+        crashed = pool._acquire()
+        results = []
+        waiter = threading.Thread(
+            target=lambda: results.append(pool.run(lambda manager, item: manager.name, 0))
+        )
+        waiter.start()
+        time.sleep(0.05)
+        pool._discard(crashed)
+        waiter.join(timeout=2)
+        assert results == ["driver-2"]
+
+
+def test_browserless_pool_runs_without_drivers():
+    with BrowserlessPool(size=2) as pool:
+        assert pool.run(lambda manager, item: (manager, item), 1) == (None, 1)
+        assert pool.map(lambda manager, item: item * 2, [1, 2, 3]) == [2, 4, 6]
@@ -0,0 +1,194 @@
+import pytest
+import requests
+
+from scrapper.fetchBackend import HttpFetchBackend
+
+
+LISTING_HTML = """
+<html><body>
+  <div class="dp-dfg-items">
+    <article>
+      <h3 class="entry-title"><a href="/aba-therapy/acme-austin/">Acme ABA – Austin</a></h3>
+      <div class="city-state">Austin, Texas</div>
+    </article>
+    <article>
+      <h3 class="entry-title"><a href="https://www.bhcoe.org/aba-therapy/beta/">Beta Therapy</a></h3>
+      <div class="city-state">Dallas, Texas</div>
+    </article>
+  </div>
+</body></html>
+"""
+
+NO_RESULTS_HTML = """
+<html><body><div class="dp-dfg-no-results">No results found.</div></body></html>
+"""
+
+DETAIL_HTML = """
+<html><body><div id="main-content"><div><div>
+  <div>
+    <div></div><div></div>
+    <div>
+      <div><div></div><div></div>
+        <div><div><div></div><div><div> acme-aba.com </div></div></div></div>
+      </div>
+    </div>
+  </div>
+</div></div></div></body></html>
+"""
+
+
+class FakeResponse:
+    def __init__(self, text: str, status: int = 200) -> None:
+        self.text = text
+        self.status_code = status
+        self.headers = {}
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error")
+
+
+class FakeSession:
+    def __init__(self, pages: dict) -> None:
+        self.pages = pages
+        self.calls: list[str] = []
+
+    def get(self, url, timeout=None):
+        self.calls.append(url)
+        if url not in self.pages:
+            return FakeResponse("", status=404)
+        return FakeResponse(self.pages[url])
+
+    def close(self) -> None:
+        pass
+
+
+BASE = "https://www.bhcoe.org/aba-therapy-directory/"
+
+
+def test_scrape_listing_extracts_contacts():
+    backend = HttpFetchBackend(session=FakeSession({BASE: LISTING_HTML}))
+    contacts = backend.scrape_listing(BASE)
+    assert contacts == [
+        {
+            "Name": "Acme ABA - Austin",
+            "Url": "https://www.bhcoe.org/aba-therapy/acme-austin/",
+            "Location": "Austin, Texas",
+        },
+        {
+            "Name": "Beta Therapy",
+            "Url": "https://www.bhcoe.org/aba-therapy/beta/",
+            "Location": "Dallas, Texas",
+        },
+    ]
+
+
+def test_scrape_listing_no_results_returns_empty_list():
+    backend = HttpFetchBackend(session=FakeSession({BASE: NO_RESULTS_HTML}))
+    assert backend.scrape_listing(BASE) == []
+
+
+def test_scrape_listing_unreadable_page_returns_none(capsys):
+    backend = HttpFetchBackend(session=FakeSession({BASE: "<html><body></body></html>"}))
+    assert backend.scrape_listing(BASE) is None
+    # A failed request also signals a fallback
+    assert backend.scrape_listing(BASE + "page/2/") is None
+    assert "HTTP fetch failed" in capsys.readouterr().out
+
+
+def test_get_company_url_reads_contact_details():
+    url = "https://www.bhcoe.org/aba-therapy/acme-austin/"
+    backend = HttpFetchBackend(session=FakeSession({url: DETAIL_HTML}))
+    assert backend.get_company_url(url) == "acme-aba.com"
+    assert backend.get_company_url(url + "missing/") is None
+
+
+class ConditionalResponse(FakeResponse):
+    def __init__(self, text: str, status: int = 200, headers: dict = None) -> None:
+        super().__init__(text, status)
+        self.headers = headers or {}
+
+
+class ConditionalSession:
+    """Serves one page with an ETag and answers 304 to a matching If-None-Match."""
+
+    def __init__(self, body: str, etag: str) -> None:
+        self.body = body
+        self.etag = etag
+        self.sent_headers: list[dict] = []
+
+    def get(self, url, timeout=None, headers=None):
+        self.sent_headers.append(headers or {})
+        if headers and headers.get("If-None-Match") == self.etag:
+            return ConditionalResponse("", status=304)
+        return ConditionalResponse(self.body, headers={"ETag": self.etag, "Last-Modified": "Mon, 01 Jan 2024"})
+
+    def close(self) -> None:
+        pass
+
+
+def test_fetch_if_changed_uses_validators():
+    from scrapper.resultStore import ResultStore
+
+    store = ResultStore(":memory:")
+    session = ConditionalSession("<html><body><p>Jane Doe - BCBA</p></body></html>", '"v1"')
+    backend = HttpFetchBackend(session=session, validators=store)
+    url = "https://acme-aba.com/team"
+
+    # Never recorded: counts as changed
+    assert backend.fetch_if_changed("https://acme-aba.com/other") is True
+
+    backend.fetch(url)
+    assert store.page_validators(url)["etag"] == '"v1"'
+
+    # Matching ETag: 304, unchanged
+    assert backend.fetch_if_changed(url) is False
+    assert session.sent_headers[-1] == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Jan 2024",
+    }
+
+    # New ETag but the same normalized content (only a script changed): unchanged
+    session.etag = '"v2"'
+    session.body = "<html><body><script>var n = 2;</script><p>Jane  Doe - BCBA</p></body></html>"
+    assert backend.fetch_if_changed(url) is False
+
+    # Different content: changed
+    session.etag = '"v3"'
+    session.body = "<html><body><p>Jane Doe - BCBA</p><p>John Smith - RBT</p></body></html>"
+    assert backend.fetch_if_changed(url) is True
+    assert backend.fetch_if_changed(url) is False
+
+
+def test_archive_serves_pages_fetched_this_run(tmp_path):
+    from scrapper.pageArchive import PageArchive
+
+    archive = PageArchive(tmp_path)
+    session = FakeSession({"https://acme-aba.com/team": "<p>Jane Doe - BCBA</p>"})
+    backend = HttpFetchBackend(session=session, archive=archive)
+
+    assert backend.fetch("https://acme-aba.com/team") == "<p>Jane Doe - BCBA</p>"
+    assert backend.fetch("https://acme-aba.com/team") == "<p>Jane Doe - BCBA</p>"
+    assert session.calls == ["https://acme-aba.com/team"]
+    assert backend.telemetry.total("fetch_total", source="network") == 1
+    assert backend.telemetry.total("fetch_total", source="archive") == 1
+    assert backend.telemetry.summary()["http.get"]["count"] == 1
+    archive.close()
+
+
+def test_offline_replays_the_archive_only(tmp_path):
+    from scrapper.pageArchive import PageArchive
+
+    archive = PageArchive(tmp_path)
+    archive.put("https://acme-aba.com/team", "<p>Jane Doe - BCBA</p>")
+    session = FakeSession({"https://acme-aba.com/about": "<p>About</p>"})
+    backend = HttpFetchBackend(session=session, archive=archive, offline=True)
+
+    assert backend.fetch("https://acme-aba.com/team") == "<p>Jane Doe - BCBA</p>"
+    assert backend.fetch("https://acme-aba.com/about") is None
+    assert backend.fetch_if_changed("https://acme-aba.com/team") is False
+    assert session.calls == []
+    archive.close()
+
+    with pytest.raises(ValueError):
+        HttpFetchBackend(session=session, offline=True)
@@ -0,0 +1,74 @@
+from scrapper.htmlReducer import HtmlReducer, estimate_tokens
+
+
+PAGE = """
+<html>
+<head><title>Our Team</title><style>body { color: red; }</style>
+<script>window.dataLayer = [];</script></head>
+<body>
+  <header class="site-header"><a href="/">Logo</a></header>
+  <nav><ul><li><a href="/">Home</a></li><li><a href="/team">Team</a></li></ul></nav>
+  <div id="cookie-notice">We use cookies. <button>Accept</button></div>
+  <main>
+    <h1>Meet Our Team</h1>
+    <article class="team-member">
+      <header class="team-member-header"><h3>Jane Doe</h3></header>
+      <p>Clinical Director, BCBA</p>
+    </article>
+    <div class="team-card"><img src="john.jpg" alt="John Smith"><p>RBT</p></div>
+    <ul class="credentials"><li>BCBA</li><li>LBA</li></ul>
+    <div class="elementor-widget-nav-menu">Services Contact</div>
+  </main>
+  <footer>Copyright 2024 Example ABA</footer>
+</body>
+</html>
+"""
+
+
+def test_reduce_keeps_main_content_as_markdown():
+    reduced = HtmlReducer().reduce(PAGE, "https://example.com/team")
+
+    assert reduced["text"].splitlines() == [
+        "# Meet Our Team",
+        "### Jane Doe",
+        "Clinical Director, BCBA",
+        "John Smith",
+        "RBT",
+        "- BCBA",
+        "- LBA",
+    ]
+    assert reduced["chunks"] == [reduced["text"]]
+    assert reduced["url"] == "https://example.com/team"
+    assert reduced["tokens_before"] == estimate_tokens(PAGE)
+    assert reduced["tokens_after"] < reduced["tokens_before"] / 4
+
+
+def test_reduce_uses_body_when_main_region_is_small():
+    page = "<html><body><main>Hi</main><div><p>Alice - BCBA</p><p>Bob - RBT</p></div></body></html>"
+    assert HtmlReducer().reduce(page)["text"] == "Hi\nAlice - BCBA\nBob - RBT"
+
+
+def test_chunks_respect_token_budget():
+    lines = [f"Member {i} - Behavior Technician" for i in range(50)]
+    page = "<html><body>" + "".join(f"<p>{line}</p>" for line in lines) + "</body></html>"
+    reduced = HtmlReducer(max_tokens=40).reduce(page)
+
+    assert len(reduced["chunks"]) > 1
+    assert all(estimate_tokens(chunk) <= 40 for chunk in reduced["chunks"])
+    assert "\n".join(reduced["chunks"]).splitlines() == lines
+
+
+def test_reduce_handles_empty_pages():
+    reduced = HtmlReducer().reduce("   ")
+    assert reduced["text"] == "" and reduced["chunks"] == [] and reduced["tokens_after"] == 0
+
+
+def test_content_fingerprint_ignores_markup_noise():
+    from scrapper.htmlReducer import content_fingerprint
+
+    base = "<html><body><nav>Home</nav><p>Jane Doe - BCBA</p></body></html>"
+    noisy = "<html><body><script>var t = 9;</script><nav>Menu</nav><p>Jane   doe - BCBA</p></body></html>"
+    changed = "<html><body><p>Jane Doe - BCBA</p><p>John Smith - RBT</p></body></html>"
+
+    assert content_fingerprint(base) == content_fingerprint(noisy)
+    assert content_fingerprint(base) != content_fingerprint(changed)
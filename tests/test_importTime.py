@@ -0,0 +1,30 @@
+from benchmarks.importTime import format_report, measure
+
+# Generous against the ~0.1s it takes, but far below the seconds an eager
+# import of ScrapeGraphAI or Selenium costs.
+IMPORT_BUDGET_SECONDS: float = 1.0
+
+
+def test_main_imports_no_heavy_dependencies():
+    report = measure("main", runs=1)
+
+    assert report["heavy"] == []
+    assert report["min"] < IMPORT_BUDGET_SECONDS
+    assert format_report(report).startswith("import main: min ")
+
+
+def test_consolidate_command_loads_only_pyarrow(tmp_path):
+    report = measure("main", runs=1, argv=["consolidate"], cwd=tmp_path)
+
+    # pyarrow writes the Parquet export; nothing else heavy is needed.
+    assert set(report["heavy"]) <= {"pyarrow"}
+    assert (tmp_path / "data" / "final_team_members.csv").exists()
+    assert (tmp_path / "data" / "people.csv").exists()
+
+
+def test_scrapper_modules_defer_their_heavy_imports():
+    # Imported on first use: ScrapeGraphAI by the graph calls, OpenAI by the
+    # batch client and pyarrow by the columnar export.
+    assert "scrapegraphai" not in measure("scrapper.TeamExtractor", runs=1)["heavy"]
+    assert "openai" not in measure("scrapper.batchExtractor", runs=1)["heavy"]
+    assert "pyarrow" not in measure("scrapper.columnarExport", runs=1)["heavy"]
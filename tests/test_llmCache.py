@@ -0,0 +1,53 @@
+from scrapper.llmCache import LLMCache
+
+
+def test_hit_and_miss_counters():
+    cache = LLMCache(":memory:")
+    assert cache.get("prompt", "model", "<p>page</p>") is None
+    cache.set("prompt", "model", "<p>page</p>", {"content": ["a"]})
+    assert cache.get("prompt", "model", "<p>page</p>") == {"content": ["a"]}
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+
+def test_key_covers_prompt_model_and_normalized_content():
+    cache = LLMCache(":memory:")
+    cache.set("prompt", "model", "<p>page</p>\n", [1])
+
+    # Whitespace and comments do not change the content hash
+    assert cache.get("prompt", "model", "  <p>page</p> <!-- build 42 -->") == [1]
+    assert cache.get("other prompt", "model", "<p>page</p>") is None
+    assert cache.get("prompt", "other-model", "<p>page</p>") is None
+    assert cache.get("prompt", "model", "<p>changed</p>") is None
+
+
+def test_expired_entries_miss(monkeypatch):
+    cache = LLMCache(":memory:", ttl=10)
+    monkeypatch.setattr("scrapper.llmCache.time.time", lambda: 1000.0)
+    cache.set("p", "m", "c", "value")
+    monkeypatch.setattr("scrapper.llmCache.time.time", lambda: 1011.0)
+    assert cache.get("p", "m", "c") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entries_are_evicted(monkeypatch):
+    clock = iter(range(100, 200))
+    monkeypatch.setattr("scrapper.llmCache.time.time", lambda: float(next(clock)))
+    cache = LLMCache(":memory:", max_entries=2)
+    cache.set("p", "m", "a", "A")
+    cache.set("p", "m", "b", "B")
+    assert cache.get("p", "m", "a") == "A"  # "a" is now more recent than "b"
+    cache.set("p", "m", "c", "C")
+
+    assert len(cache) == 2
+    assert cache.get("p", "m", "b") is None
+    assert cache.get("p", "m", "a") == "A"
+
+
+def test_bypass_skips_reads_but_stores(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    cache = LLMCache(path, bypass=True)
+    cache.set("p", "m", "c", "fresh")
+    assert cache.get("p", "m", "c") is None
+    cache.close()
+
+    assert LLMCache(path).get("p", "m", "c") == "fresh"
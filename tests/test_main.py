@@ -0,0 +1,104 @@
+import csv
+import json
+from unittest.mock import MagicMock
+
+import main
+from scrapper.ABATherapyScraper import ABATherapyScraper
+from scrapper.resultStore import ResultStore
+from scrapper.telemetry import Telemetry
+
+
+def make_scraper(*pages):
+    backend = MagicMock()
+    backend.scrape_listing.side_effect = list(pages)
+    return ABATherapyScraper(backend=backend), backend
+
+
+def test_directory_can_be_listed_again_after_a_complete_listing(tmp_path):
+    store = ResultStore(":memory:")
+    scraper, backend = make_scraper([{"Name": "A", "Url": "u1", "Location": "L"}], [])
+    contacts = list(main.list_contacts(scraper, tmp_path, store, Telemetry(), rescrape=True))
+
+    assert [c["Name"] for c in contacts] == ["A"]
+    assert (tmp_path / "contacts_list.csv").exists()
+    assert not (tmp_path / "directory_journal.jsonl").exists()
+    assert (tmp_path / "directory_journal.previous.jsonl").exists()
+
+    # The second listing reads the directory instead of replaying the first one
+    scraper, backend = make_scraper([{"Name": "B", "Url": "u2", "Location": "L"}], [])
+    contacts = list(main.list_contacts(scraper, tmp_path, store, Telemetry(), rescrape=True))
+    assert [c["Name"] for c in contacts] == ["B"]
+    assert backend.scrape_listing.call_count == 2
+    assert main.load_contacts_from_csv(tmp_path / "contacts_list.csv") == contacts
+
+
+def test_existing_contacts_csv_is_reused(tmp_path):
+    store = ResultStore(":memory:")
+    scraper, _ = make_scraper([{"Name": "A", "Url": "u1", "Location": "L"}], [])
+    list(main.list_contacts(scraper, tmp_path, store, Telemetry()))
+
+    scraper, backend = make_scraper()
+    contacts = list(main.list_contacts(scraper, tmp_path, store, Telemetry()))
+    assert [c["Name"] for c in contacts] == ["A"]
+    assert backend.scrape_listing.call_count == 0
+    assert store.load_contacts() == contacts
+
+
+def test_listing_streams_contacts_into_a_part_file(tmp_path):
+    store = ResultStore(":memory:")
+    scraper, _ = make_scraper(
+        [{"Name": "A", "Url": "u1", "Location": "L"}],
+        [{"Name": "B", "Url": "u2", "Location": "L"}],
+        [],
+    )
+    contacts = main.list_contacts(scraper, tmp_path, store, Telemetry())
+
+    assert next(contacts)["Name"] == "A"
+    assert (tmp_path / "contacts_list.csv.part").exists()
+    assert not (tmp_path / "contacts_list.csv").exists()
+    assert [c["Name"] for c in contacts] == ["B"]
+    assert not (tmp_path / "contacts_list.csv.part").exists()
+    assert [c["Name"] for c in main.load_contacts_from_csv(tmp_path / "contacts_list.csv")] == [
+        "A",
+        "B",
+    ]
+    assert scraper.contacts == []
+
+
+def write_pages(data_dir):
+    data_dir.mkdir()
+    with (data_dir / "pages_list.csv").open("w", encoding="utf-8", newline="") as pages_file:
+        writer = csv.writer(pages_file)
+        writer.writerow(["Name", "Link", "Location", "Url"])
+        writer.writerow(["IE Clinic", "abaenhancement.com", "Riverside, California", "https://dir/ie/"])
+        writer.writerow(["OC Clinic", "abaenhancement.com", "Irvine, California", "https://dir/oc/"])
+
+
+def test_consolidate_imports_legacy_json(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data_dir = tmp_path / "data"
+    write_pages(data_dir)
+    members = [{"Url": "abaenhancement.com", "name": "Neil Miranda", "position": "BCBA"}]
+    (data_dir / "team_members_abaenhancement_com.json").write_text(json.dumps(members))
+
+    main.main(["consolidate"])
+
+    with (data_dir / "final_team_members.csv").open(encoding="utf-8", newline="") as final_file:
+        rows = list(csv.DictReader(final_file))
+    assert [(r["Name"], r["Company"]) for r in rows] == [
+        ("Neil Miranda", "IE Clinic"),
+        ("Neil Miranda", "OC Clinic"),
+    ]
+
+
+def test_consolidate_keeps_outputs_when_the_store_is_empty(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data_dir = tmp_path / "data"
+    write_pages(data_dir)
+    final_csv = data_dir / "final_team_members.csv"
+    final_csv.write_text("Url,Name,Title,Company,Location\nabaenhancement.com,A,B,C,D\n")
+
+    main.main(["consolidate"])
+
+    assert final_csv.read_text() == "Url,Name,Title,Company,Location\nabaenhancement.com,A,B,C,D\n"
+    assert not (data_dir / "people.csv").exists()
@@ -0,0 +1,82 @@
+import sqlite3
+import time
+
+from scrapper import pageArchive
+from scrapper.pageArchive import PageArchive
+
+
+def test_put_and_get_round_trip(tmp_path):
+    archive = PageArchive(tmp_path)
+    archive.put("https://acme-aba.com/team", "<p>Jane Doe – BCBA</p>", headers={"ETag": '"v1"'})
+
+    record = archive.get("https://acme-aba.com/team")
+    assert record["body"] == "<p>Jane Doe – BCBA</p>"
+    assert record["headers"] == {"ETag": '"v1"'}
+    assert record["status"] == 200
+    assert record["source"] == "http"
+    assert archive.codec == ("zstd" if pageArchive.zstandard is not None else "zlib")
+    assert archive.get("https://acme-aba.com/other") is None
+    assert "https://acme-aba.com/team" in archive
+    archive.close()
+
+
+def test_latest_copy_wins(tmp_path):
+    archive = PageArchive(tmp_path)
+    archive.put("https://acme-aba.com/team", "old")
+    archive.put("https://acme-aba.com/about", "about")
+    archive.put("https://acme-aba.com/team", "new", source="browser")
+
+    assert archive.get("https://acme-aba.com/team")["body"] == "new"
+    assert archive.get("https://acme-aba.com/team")["source"] == "browser"
+    assert archive.get("https://acme-aba.com/about")["body"] == "about"
+    assert len(archive) == 2
+    archive.close()
+
+
+def test_since_filters_older_copies(tmp_path):
+    archive = PageArchive(tmp_path)
+    archive.put("https://acme-aba.com/team", "body")
+    assert archive.get("https://acme-aba.com/team", since=time.time() + 60) is None
+    assert archive.get("https://acme-aba.com/team", since=archive.opened_at)["body"] == "body"
+    archive.close()
+
+
+def test_segments_roll_over_and_persist(tmp_path):
+    archive = PageArchive(tmp_path, segment_max_bytes=200)
+    pages = {f"https://site{i}.com/team": f"<p>Person {i}</p>" * 20 for i in range(5)}
+    for url, body in pages.items():
+        archive.put(url, body)
+    archive.close()
+
+    assert len(list(tmp_path.glob("segment-*.warc"))) > 1
+
+    reopened = PageArchive(tmp_path, segment_max_bytes=200)
+    for url, body in pages.items():
+        assert reopened.get(url)["body"] == body
+    reopened.put("https://site5.com/team", "latest")
+    assert reopened.get("https://site5.com/team")["body"] == "latest"
+    reopened.close()
+
+
+def test_two_writers_share_one_archive(tmp_path):
+    # Like two WORK_QUEUE workers: each instance appends to the same segments.
+    first = PageArchive(tmp_path, segment_max_bytes=400)
+    second = PageArchive(tmp_path, segment_max_bytes=400)
+    pages = {f"http://x/{i}": f"<p>Page {i}</p>" * (i + 5) for i in range(12)}
+    for i, (url, body) in enumerate(pages.items()):
+        (first if i % 2 else second).put(url, body)
+
+    for archive in (first, second):
+        for url, body in pages.items():
+            assert archive.get(url)["body"] == body
+    first.close()
+    second.close()
+    assert len(list(tmp_path.glob("segment-*.warc"))) > 1
+
+
+def test_index_uses_the_rollback_journal(tmp_path):
+    # WAL is unsafe on the network file systems the archive may be shared over
+    PageArchive(tmp_path).close()
+    conn = sqlite3.connect(str(tmp_path / "index.sqlite"))
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    conn.close()
@@ -0,0 +1,90 @@
+from unittest.mock import MagicMock
+
+from scrapper.pageReadiness import PageReadiness
+
+
+class ElementAppearsDriver:
+    """
+    Fake driver whose element shows up after a number of polls.
+    """
+
+    def __init__(self, appear_after: int, value: str = "dp-dfg-items") -> None:
+        self.appear_after = appear_after
+        self.value = value
+        self.polls = 0
+
+    def find_elements(self, by, value):
+        self.polls += 1
+        if value == self.value and self.polls > self.appear_after:
+            element = MagicMock()
+            element.is_displayed.return_value = True
+            return [element]
+        return []
+
+
+def test_wait_returns_as_soon_as_element_is_displayed():
+    readiness = PageReadiness(poll_frequency=0.01)
+    driver = ElementAppearsDriver(appear_after=0)
+
+    assert readiness.wait_for(
+        driver, "https://www.bhcoe.org/x/", [("class name", "dp-dfg-items")], label="listing"
+    )
+    record = readiness.records["www.bhcoe.org"][0]
+    assert record["ready"] is True
+    assert record["host"] == "www.bhcoe.org"
+    assert record["label"] == "listing"
+    assert record["seconds"] < 1
+
+
+def test_wait_matches_any_locator():
+    readiness = PageReadiness(poll_frequency=0.01)
+    driver = ElementAppearsDriver(appear_after=2, value="dp-dfg-no-results")
+    assert readiness.wait_for(
+        driver,
+        "https://www.bhcoe.org/x/",
+        [("class name", "dp-dfg-items"), ("class name", "dp-dfg-no-results")],
+    )
+
+
+def test_hidden_elements_do_not_count_and_timeout_is_recorded():
+    readiness = PageReadiness(default_timeout=0.1, poll_frequency=0.01)
+    hidden = MagicMock()
+    hidden.is_displayed.return_value = False
+    driver = MagicMock()
+    driver.find_elements.return_value = [hidden]
+
+    assert not readiness.wait_for(driver, "https://slow.example/", [("id", "x")])
+    assert readiness.summary()["timeouts"] == 1
+
+
+def test_timeout_is_learned_per_host():
+    readiness = PageReadiness(
+        default_timeout=20, min_timeout=1, max_timeout=30, safety_factor=3, smoothing=0.5
+    )
+    assert readiness.timeout_for("fast.example") == 20
+
+    readiness.observe("fast.example", 0.1)
+    assert readiness.timeout_for("fast.example") == 1  # clamped to min_timeout
+
+    readiness.observe("slow.example", 4)
+    readiness.observe("slow.example", 6)
+    assert readiness.timeout_for("slow.example") == 15  # (0.5 * 6 + 0.5 * 4) * 3
+
+    readiness.observe("huge.example", 100)
+    assert readiness.timeout_for("huge.example") == 30
+
+
+def test_records_keep_a_bounded_window_per_host():
+    readiness = PageReadiness(poll_frequency=0.01, history=3)
+    driver = ElementAppearsDriver(appear_after=0)
+    for page in range(5):
+        url = f"https://www.bhcoe.org/{page}/"
+        readiness.wait_for(driver, url, [("class name", "dp-dfg-items")])
+
+    assert [r["url"] for r in readiness.records["www.bhcoe.org"]] == [
+        "https://www.bhcoe.org/2/",
+        "https://www.bhcoe.org/3/",
+        "https://www.bhcoe.org/4/",
+    ]
+    # The summary still covers every wait
+    assert readiness.summary()["count"] == 5
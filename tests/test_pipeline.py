@@ -0,0 +1,128 @@
+import threading
+import time
+
+import pytest
+
+from scrapper.pipeline import StreamingPipeline
+from scrapper.telemetry import Telemetry
+
+
+def test_items_flow_through_every_stage():
+    pipeline = (
+        StreamingPipeline()
+        .stage("double", lambda x: [x * 2], workers=3)
+        .stage("split", lambda x: [x, x + 1] if x % 4 == 0 else [], workers=2)
+    )
+    assert sorted(pipeline.run(range(6))) == [0, 1, 4, 5, 8, 9]
+    stats = pipeline.stats()
+    assert (stats["double"]["in"], stats["double"]["out"], stats["double"]["errors"]) == (6, 6, 0)
+    assert (stats["split"]["in"], stats["split"]["out"]) == (6, 6)
+
+
+def test_later_stages_start_before_the_source_is_exhausted():
+    first_output = threading.Event()
+
+    def source():
+        yield 1
+        # The first item reaches the consumer while the source is still running
+        assert first_output.wait(2)
+        yield 2
+
+    outputs = []
+    for output in StreamingPipeline().stage("same", lambda x: [x]).run(source()):
+        outputs.append(output)
+        first_output.set()
+    assert outputs == [1, 2]
+
+
+def test_bounded_queues_hold_back_the_source():
+    fed = []
+    results = []
+    release = threading.Event()
+
+    def source():
+        for i in range(50):
+            fed.append(i)
+            yield i
+
+    def slow(item):
+        release.wait(2)
+        return [item]
+
+    pipeline = StreamingPipeline().stage("slow", slow, workers=1, capacity=2)
+    outputs = pipeline.run(source())
+    consumer = threading.Thread(target=lambda: results.extend(outputs))
+    consumer.start()
+    time.sleep(0.3)
+    # One item in the worker, two queued and one blocked in the feeder at most
+    assert len(fed) <= 4
+    release.set()
+    consumer.join(5)
+    assert results == list(range(50))
+
+
+def test_flush_emits_held_items_at_the_end():
+    held = []
+
+    def collect(item):
+        held.append(item)
+        if len(held) == 3:
+            batch = list(held)
+            held.clear()
+            return [batch]
+        return []
+
+    def flush():
+        return [list(held)] if held else []
+
+    pipeline = StreamingPipeline().stage("batch", collect, flush=flush).stage("size", lambda b: [len(b)])
+    assert list(pipeline.run(range(7))) == [3, 3, 1]
+
+
+def test_item_errors_are_reported_and_skipped():
+    errors = []
+    telemetry = Telemetry()
+
+    def check(item):
+        if item == 2:
+            raise ValueError("bad item")
+        return [item]
+
+    pipeline = StreamingPipeline(
+        on_error=lambda stage, item, e: errors.append((stage, item, str(e))), telemetry=telemetry
+    ).stage("check", check, workers=2)
+    assert sorted(pipeline.run(range(4))) == [0, 1, 3]
+    assert errors == [("check", 2, "bad item")]
+    assert pipeline.stats()["check"]["errors"] == 1
+    assert telemetry.total("pipeline_items_total", stage="check", result="error") == 1
+    assert telemetry.total("pipeline_items_total", stage="check", result="ok") == 3
+
+
+def test_source_errors_are_raised_after_the_fed_items():
+    def source():
+        yield 1
+        raise RuntimeError("directory unavailable")
+
+    outputs = []
+    with pytest.raises(RuntimeError, match="directory unavailable"):
+        for output in StreamingPipeline().stage("same", lambda x: [x]).run(source()):
+            outputs.append(output)
+    assert outputs == [1]
+
+
+def test_stopping_early_cancels_the_workers():
+    closed = threading.Event()
+
+    def source():
+        try:
+            for i in range(1000):
+                yield i
+        finally:
+            closed.set()
+
+    pipeline = StreamingPipeline(poll_seconds=0.01).stage("same", lambda x: [x], capacity=1)
+    outputs = pipeline.run(source())
+    assert next(outputs) == 0
+    outputs.close()
+    assert closed.wait(2)
+    assert not [t for t in threading.enumerate() if t.name.startswith("pipeline-")]
@@ -0,0 +1,66 @@
+from scrapper.rateLimiter import DEFAULT_RETRY_AFTER, RateLimiter, retry_after
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_limiter(rpm, tpm):
+    clock = FakeClock()
+    return RateLimiter(rpm=rpm, tpm=tpm, clock=clock, sleep=clock.sleep), clock
+
+
+def test_requests_per_minute():
+    limiter, clock = make_limiter(rpm=60, tpm=1_000_000)
+    for _ in range(60):
+        assert limiter.acquire() == 0
+    # The bucket is empty: the next request waits for one refill (1s at 60 rpm)
+    assert limiter.acquire() == 1.0
+    assert clock.now == 1.0
+
+
+def test_tokens_per_minute():
+    limiter, clock = make_limiter(rpm=1000, tpm=6000)
+    limiter.acquire(tokens=6000)
+    limiter.acquire(tokens=1500)
+    assert clock.now == 15.0
+    # Oversized calls are capped at the bucket size instead of waiting forever
+    assert limiter.acquire(tokens=10**9) > 0
+
+
+def test_pause_holds_back_callers():
+    limiter, clock = make_limiter(rpm=1000, tpm=10**6)
+    limiter.pause(30)
+    assert limiter.acquire() == 30
+    assert limiter.throttled == 1
+    assert limiter.waited == 30
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers):
+        self.status_code = status_code
+        self.headers = headers
+
+
+class FakeAPIError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__("error")
+        self.response = FakeResponse(status_code, headers or {})
+
+
+def test_retry_after():
+    assert retry_after(FakeAPIError(429, {"retry-after": "7"})) == 7.0
+    assert retry_after(FakeAPIError(429, {"retry-after-ms": "1500"})) == 1.5
+    assert retry_after(FakeAPIError(429)) == DEFAULT_RETRY_AFTER
+    assert retry_after(Exception("Rate limit reached for gpt-4o-mini")) == DEFAULT_RETRY_AFTER
+    assert retry_after(FakeAPIError(500)) is None
+    assert retry_after(ValueError("boom")) is None
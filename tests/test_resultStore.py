@@ -0,0 +1,106 @@
+import json
+import sqlite3
+
+from scrapper.resultStore import STATUS_DONE, STATUS_ERROR, ResultStore
+from scrapper.siteIndex import SiteIndex
+
+
+def test_contacts_and_pages_round_trip():
+    store = ResultStore(":memory:")
+    contact = {"Name": "Acme ABA", "Url": "https://dir/acme/", "Location": "Austin, Texas"}
+    store.save_contacts([contact, contact])
+    assert store.load_contacts() == [contact]
+
+    page = dict(contact, Link="acme.com")
+    store.save_pages([page])
+    assert store.load_pages() == [page]
+
+
+def test_site_members_are_replaced_with_status():
+    store = ResultStore(":memory:")
+    assert store.site_status("acme.com") is None
+
+    store.save_site_members(
+        "acme.com",
+        "https://acme.com",
+        [{"Url": "https://acme.com", "name": "Alice", "position": None}],
+        started_at=1.0,
+    )
+    store.save_site_members(
+        "acme.com",
+        "https://acme.com",
+        [{"Url": "https://acme.com", "name": "Bob", "position": "BCBA"}],
+    )
+
+    assert store.site_status("acme.com") == STATUS_DONE
+    assert store.members("acme.com") == [
+        {"Url": "https://acme.com", "name": "Bob", "position": "BCBA"}
+    ]
+    info = store.site_info("acme.com")
+    assert info["member_count"] == 1
+    assert info["finished_at"] >= info["started_at"]
+
+
+def test_errors_are_recorded():
+    store = ResultStore(":memory:")
+    store.save_site_members("acme.com", "https://acme.com", [], error="timeout")
+    assert store.site_status("acme.com") == STATUS_ERROR
+    assert store.site_info("acme.com")["error"] == "timeout"
+
+
+def test_store_persists_to_disk(tmp_path):
+    path = tmp_path / "results.sqlite"
+    store = ResultStore(path)
+    store.save_site_members("a.com", "https://a.com", [{"name": "A", "position": "P"}])
+    store.close()
+
+    reopened = ResultStore(path)
+    assert list(reopened.iter_members()) == [
+        ("a.com", {"Url": "https://a.com", "name": "A", "position": "P"})
+    ]
+
+
+def test_import_legacy_json(tmp_path):
+    legacy = [{"Url": "www.abaexperts.net", "name": "Jane", "position": "BCBA"}]
+    (tmp_path / "team_members_www_abaexperts_net.json").write_text(json.dumps(legacy))
+    (tmp_path / "team_members_abtcva_org.json").write_text("[]")
+    index = SiteIndex(
+        [
+            {"Name": "Experts", "Link": "www.abaexperts.net", "Location": "", "Url": "1"},
+            {"Name": "ABTC", "Link": "abtcva.org", "Location": "", "Url": "2"},
+            {"Name": "New", "Link": "new-site.com", "Location": "", "Url": "3"},
+        ]
+    )
+    store = ResultStore(":memory:")
+
+    assert store.import_legacy_json(tmp_path, index) == 2
+    assert store.members("abaexperts.net") == legacy
+    assert store.site_status("abtcva.org") == STATUS_DONE
+    assert store.site_status("new-site.com") is None
+    # Already imported sites are not imported again
+    assert store.import_legacy_json(tmp_path, index) == 0
+
+
+def test_site_sources_and_page_validators():
+    store = ResultStore(":memory:")
+    store.save_site_members("a.com", "https://a.com", [], sources=["https://a.com/team"])
+    assert store.site_sources("a.com") == ["https://a.com/team"]
+    # Sources are kept when a save does not pass them
+    store.save_site_members("a.com", "https://a.com", [], error="timeout")
+    assert store.site_sources("a.com") == ["https://a.com/team"]
+
+    assert store.page_validators("https://a.com") is None
+    assert store.save_page_validators("https://a.com", '"e1"', None, "hash1") is True
+    assert store.save_page_validators("https://a.com", '"e2"', None, "hash1") is False
+    validators = store.page_validators("https://a.com")
+    assert validators["etag"] == '"e2"' and validators["fingerprint"] == "hash1"
+    assert store.save_page_validators("https://a.com", '"e3"', None, "hash2") is True
+
+
+def test_store_uses_the_rollback_journal(tmp_path):
+    # WAL is unsafe on the network file systems the store may be shared over
+    store = ResultStore(tmp_path / "results.sqlite")
+    conn = sqlite3.connect(str(tmp_path / "results.sqlite"))
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    conn.close()
+    store.close()
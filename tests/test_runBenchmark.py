@@ -0,0 +1,52 @@
+import requests
+
+from benchmarks.fakeLLM import answer
+from benchmarks.runBenchmark import compare, percentile, run_benchmark
+from benchmarks.siteServer import SiteServer, SyntheticDirectory
+
+
+def test_percentile_uses_nearest_rank():
+    assert percentile([], 95) == 0.0
+    assert percentile([3, 1, 2, 4], 50) == 2
+    assert percentile(list(range(1, 101)), 95) == 95
+
+
+def test_fake_llm_answers_deterministically():
+    assert answer("Extract team members", "# Our Team\nJane Doe - BCBA\nSome bio text") == {
+        "team_members": [{"name": "Jane Doe", "position": "BCBA"}]
+    }
+    batch = '<page id="0" url="https://a.com">\nJohn Smith - RBT\n</page>'
+    assert answer("...", batch) == {
+        "pages": [{"id": "0", "team_members": [{"name": "John Smith", "position": "RBT"}]}]
+    }
+    assert answer("Extract all the links", "see https://a.com/team and https://a.com/about") == {
+        "content": ["https://a.com/team", "https://a.com/about"]
+    }
+
+
+def test_site_server_serves_the_directory(tmp_path):
+    (tmp_path / "recorded").mkdir()
+    (tmp_path / "recorded" / "index.html").write_text("<a href='{{BASE}}/x'>x</a>")
+    directory = SyntheticDirectory(providers=5, per_page=3)
+    with SiteServer(directory, recorded=tmp_path / "recorded") as server:
+        first = requests.get(server.directory_url).text
+        assert first.count("<article>") == 3
+        assert "dp-dfg-no-results" in requests.get(f"{server.directory_url}page/3/").text
+        assert requests.get(f"{server.base_url}/site-00000/our-team/").status_code == 200
+        assert requests.get(f"{server.base_url}/missing").status_code == 404
+        assert requests.get(f"{server.base_url}/").text == f"<a href='{server.base_url}/x'>x</a>"
+
+
+def test_benchmark_runs_the_whole_pipeline():
+    directory = SyntheticDirectory(providers=12, per_page=5, seed=3)
+    report = run_benchmark(directory, llm_latency=0.0, env={"EXTRACT_CONCURRENCY": 4})
+
+    assert report["rows"] == directory.expected_rows()
+    assert report["recall"] == 1.0
+    assert report["llm"]["requests"] >= 1
+    assert {"listing", "discovery", "fetch", "consolidate"} <= set(report["stages"])
+    assert report["stages"]["discovery"]["count"] == 12
+    assert compare(report, report) == []
+
+    slower = {**report, "seconds": report["seconds"] * 2 + 1}
+    assert compare(slower, report) == [f"total: {report['seconds']:.3f}s -> {slower['seconds']:.3f}s"]
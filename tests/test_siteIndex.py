@@ -0,0 +1,99 @@
+import pytest
+
+from scrapper.siteIndex import SiteIndex, canonicalize_site, site_slug
+
+
+@pytest.mark.parametrize(
+    "link, expected",
+    [
+        ("abaenhancement.com", "abaenhancement.com"),
+        ("https://www.ABAEnhancement.com/", "abaenhancement.com"),
+        ("http://abaenhancement.com:443?utm=1#team", "abaenhancement.com"),
+        ("https://abaenhancement.com:8443/team/", "abaenhancement.com"),
+        ("BehaviorWorksABA.com", "behaviorworksaba.com"),
+        ("abundantlifefamilyservices.org/contact/", "abundantlifefamilyservices.org"),
+        (
+            "www.cla.auburn.edu/psychology/aupsc/therapy-services/",
+            "cla.auburn.edu/psychology/aupsc/therapy-services",
+        ),
+        ("", None),
+        ("   ", None),
+        ("N/A", None),
+        ("not a website", None),
+        ("example.com:abc", None),
+        ("example.com:99999", None),
+        ("mailto:x@y.com", None),
+        ("ftp://example.com/", None),
+    ],
+)
+def test_canonicalize_site(link, expected):
+    assert canonicalize_site(link) == expected
+
+
+def test_site_slug_is_filesystem_safe():
+    assert site_slug("cla.auburn.edu/psychology/aupsc") == "cla_auburn_edu_psychology_aupsc"
+
+
+def make_page(name, link, location="Austin, Texas"):
+    return {"Name": name, "Link": link, "Location": location, "Url": f"https://dir/{name}/"}
+
+
+def test_index_groups_clinics_of_one_site():
+    index = SiteIndex(
+        [
+            make_page("ABA Enhancement - IE Clinic", "abaenhancement.com", "Riverside, California"),
+            make_page("ABA Enhancement - OC Clinic", "https://www.abaenhancement.com/"),
+            make_page("No Website", ""),
+            make_page("Abundant Life", "abundantlifefamilyservices.org/contact/"),
+        ]
+    )
+
+    assert len(index) == 2
+    assert [p["Name"] for p in index.rejected] == ["No Website"]
+    site = index.sites["abaenhancement.com"]
+    assert site.url == "https://abaenhancement.com"
+    assert site.links == ["abaenhancement.com", "https://www.abaenhancement.com/"]
+    assert index.sites["abundantlifefamilyservices.org"].url == (
+        "https://abundantlifefamilyservices.org"
+    )
+
+
+def test_site_url_keeps_the_port():
+    index = SiteIndex([make_page("Local", "http://127.0.0.1:8080/site-1/")])
+    assert index.sites["127.0.0.1/site-1"].url == "http://127.0.0.1:8080/site-1"
+
+
+def test_links_with_a_bad_port_or_scheme_are_rejected():
+    index = SiteIndex(
+        [
+            make_page("Bad Port", "example.com:abc"),
+            make_page("Out Of Range", "example.com:99999"),
+            make_page("Mail", "mailto:x@y.com"),
+            make_page("Good", "example.com:8080"),
+        ]
+    )
+
+    assert [p["Name"] for p in index.rejected] == ["Bad Port", "Out Of Range", "Mail"]
+    assert index.sites["example.com"].url == "https://example.com:8080"
+
+
+def test_fan_out_emits_one_row_per_clinic_and_member():
+    index = SiteIndex(
+        [
+            make_page("IE Clinic", "abaenhancement.com", "Riverside, California"),
+            make_page("OC Clinic", "abaenhancement.com", "Fountain Valley, California"),
+        ]
+    )
+    members = [
+        {"Url": "https://abaenhancement.com", "name": "Megan Price", "position": "Owner"},
+        {"Url": "https://abaenhancement.com", "name": "Neil Miranda", "position": "BCBA"},
+    ]
+
+    rows = list(index.fan_out("abaenhancement.com", members))
+
+    assert rows == [
+        ["abaenhancement.com", "Megan Price", "Owner", "IE Clinic", "Riverside, California"],
+        ["abaenhancement.com", "Neil Miranda", "BCBA", "IE Clinic", "Riverside, California"],
+        ["abaenhancement.com", "Megan Price", "Owner", "OC Clinic", "Fountain Valley, California"],
+        ["abaenhancement.com", "Neil Miranda", "BCBA", "OC Clinic", "Fountain Valley, California"],
+    ]
@@ -0,0 +1,92 @@
+import json
+
+from scrapper.structuredExtractor import StructuredExtractor, looks_like_name
+
+
+def wrap(body: str) -> str:
+    return f"<html><body>{body}</body></html>"
+
+
+def test_looks_like_name():
+    assert looks_like_name("Jane Doe")
+    assert looks_like_name("Jane Doe, M.A., BCBA")
+    assert looks_like_name("Dr. John A. Smith")
+    assert not looks_like_name("jane doe")
+    assert not looks_like_name("Madonna")
+
+
+def test_extracts_json_ld_people():
+    data = {
+        "@context": "https://schema.org",
+        "@graph": [
+            {"@type": "Organization", "name": "Example ABA", "founder": {
+                "@type": "Person", "name": "Jane Doe", "jobTitle": "Founder, BCBA"}},
+            {"@type": ["Person"], "name": "John Smith", "jobTitle": "Clinical Director"},
+        ],
+    }
+    page = wrap(f'<script type="application/ld+json">{json.dumps(data)}</script>')
+
+    result = StructuredExtractor().extract(page, "https://example.com/team")
+    assert result["method"] == "json-ld"
+    assert result["confidence"] >= 0.9
+    assert result["members"] == [
+        {"Url": "https://example.com/team", "name": "Jane Doe", "position": "Founder, BCBA"},
+        {"Url": "https://example.com/team", "name": "John Smith", "position": "Clinical Director"},
+    ]
+
+
+def test_extracts_microdata_people():
+    people = "".join(
+        f'<div itemscope itemtype="https://schema.org/Person">'
+        f'<span itemprop="name">{name}</span><span itemprop="jobTitle">{title}</span></div>'
+        for name, title in [("Jane Doe", "BCBA"), ("John Smith", "RBT")]
+    )
+    result = StructuredExtractor().extract(wrap(people))
+    assert result["method"] == "microdata"
+    assert [(m["name"], m["position"]) for m in result["members"]] == [
+        ("Jane Doe", "BCBA"),
+        ("John Smith", "RBT"),
+    ]
+
+
+def test_extracts_repeated_cards():
+    cards = "".join(
+        f'<div class="team-card elementor-element-{i}">'
+        f'<img src="{i}.jpg" alt=""><h3>{name}</h3><p>{title}</p></div>'
+        for i, (name, title) in enumerate(
+            [
+                ("Jane Doe", "Clinical Director, BCBA"),
+                ("John Smith", "Registered Behavior Technician"),
+                ("Mary-Ann O'Neil", "Office Manager"),
+                ("Luis Garcia", "RBT"),
+            ]
+        )
+    )
+    page = wrap(
+        '<ul class="menu"><li><a>Home</a></li><li><a>About Us</a></li><li><a>Contact Us</a></li></ul>'
+        f'<div class="team-grid">{cards}</div>'
+    )
+    result = StructuredExtractor().extract(page)
+
+    assert result["method"] == "cards"
+    assert result["confidence"] >= 0.8
+    assert [m["name"] for m in result["members"]] == [
+        "Jane Doe", "John Smith", "Mary-Ann O'Neil", "Luis Garcia",
+    ]
+    assert result["members"][0]["position"] == "Clinical Director, BCBA"
+
+
+def test_blog_cards_are_not_confident():
+    posts = "".join(
+        f"<article class='post'><h3>{title}</h3><p>April {i}, 2024</p></article>"
+        for i, title in enumerate(["Autism Awareness Month", "Summer Social Skills", "New Clinic Opening"])
+    )
+    result = StructuredExtractor().extract(wrap(posts))
+    assert result["confidence"] < 0.8
+
+
+def test_no_structured_data():
+    assert StructuredExtractor().extract(wrap("<p>Hello</p>")) == {
+        "members": [], "confidence": 0.0, "method": None,
+    }
+    assert StructuredExtractor().extract("")["members"] == []
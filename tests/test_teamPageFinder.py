@@ -0,0 +1,80 @@
+from scrapper.teamPageFinder import TeamPageFinder
+
+
+HOME = """
+<html><body>
+  <nav>
+    <a href="/">Home</a>
+    <a href="/services/">Services</a>
+    <a href="/about-us/">About Us</a>
+    <a href="/our-team">Meet Our Team</a>
+    <a href="/blog/our-team-grows/">Our team grows</a>
+    <a href="/careers/">Join the team</a>
+    <a href="#contact">Contact</a>
+    <a href="mailto:info@example.com">Email</a>
+    <a href="https://facebook.com/team">Facebook</a>
+  </nav>
+</body></html>
+"""
+
+SITEMAP_INDEX = """<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://www.example.com/post-sitemap.xml</loc></sitemap>
+  <sitemap><loc>https://www.example.com/page-sitemap.xml</loc></sitemap>
+</sitemapindex>
+"""
+
+PAGE_SITEMAP = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://www.example.com/leadership/</loc></url>
+  <url><loc>https://www.example.com/our-team/</loc></url>
+  <url><loc>https://www.example.com/locations/</loc></url>
+</urlset>
+"""
+
+
+class FakeFetcher:
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    def fetch(self, url, quiet=False):
+        self.calls.append(url)
+        return self.pages.get(url)
+
+
+def test_score_prefers_team_pages():
+    score = TeamPageFinder.score
+    assert score("https://x.com/our-team/") > score("https://x.com/about/")
+    assert score("https://x.com/team/") > score("https://x.com/team/jane-doe/")
+    assert score("https://x.com/services/") == 0
+    assert score("https://x.com/blog/meet-the-team/") == 0
+    assert score("https://x.com/wp-content/uploads/team.jpg") == 0
+    assert score("https://x.com/who/", "Our Staff") > 0
+
+
+def test_find_ranks_homepage_and_sitemap_candidates():
+    fetcher = FakeFetcher(
+        {
+            "https://www.example.com": HOME,
+            "https://www.example.com/sitemap.xml": SITEMAP_INDEX,
+            "https://www.example.com/page-sitemap.xml": PAGE_SITEMAP,
+        }
+    )
+    finder = TeamPageFinder(fetcher, top_k=3)
+
+    assert finder.find("https://www.example.com") == [
+        "https://www.example.com/our-team",
+        "https://www.example.com/about-us/",
+        "https://www.example.com/leadership/",
+    ]
+    # The page sitemap is read before the post sitemap
+    assert fetcher.calls.index("https://www.example.com/page-sitemap.xml") < fetcher.calls.index(
+        "https://www.example.com/post-sitemap.xml"
+    )
+
+
+def test_find_returns_nothing_without_candidates():
+    fetcher = FakeFetcher({"https://example.com": '<a href="/services/">Services</a>'})
+    assert TeamPageFinder(fetcher).find("https://example.com") == []
+    assert TeamPageFinder(FakeFetcher({})).find("https://example.com") == []
@@ -0,0 +1,86 @@
+import json
+import threading
+
+import pytest
+
+from scrapper.telemetry import Telemetry
+
+
+def test_counters_and_histograms():
+    telemetry = Telemetry(buckets=(0.1, 1, 10))
+    telemetry.count("fetch_total", source="network")
+    telemetry.count("fetch_total", 2, source="network")
+    telemetry.count("fetch_total", source="archive")
+    for seconds in (0.05, 0.5, 0.5, 5):
+        telemetry.observe("span_seconds", seconds, span="http.get")
+
+    assert telemetry.total("fetch_total") == 4
+    assert telemetry.total("fetch_total", source="network") == 3
+    # Two of four observations are at or below 1s: the median lies in the (0.1, 1] bucket
+    assert 0.1 < telemetry.quantile("span_seconds", 0.5, span="http.get") <= 1
+    assert telemetry.quantile("span_seconds", 0.95, span="http.get") == pytest.approx(8.2)
+    assert telemetry.quantile("span_seconds", 0.5, span="missing") == 0.0
+
+
+def test_spans_build_one_trace_per_root(tmp_path):
+    telemetry = Telemetry(tmp_path / "traces.jsonl")
+    with telemetry.span("discover", provider="https://acme.org"):
+        with telemetry.span("http.get", url="https://acme.org"):
+            telemetry.annotate(status=200)
+        telemetry.annotate(link="acme-aba.com")
+
+    def other_thread():
+        with telemetry.span("extract", site="acme-aba.com"):
+            pass
+
+    thread = threading.Thread(target=other_thread)
+    thread.start()
+    thread.join()
+
+    with pytest.raises(ValueError):
+        with telemetry.span("extract", site="broken.com"):
+            raise ValueError("boom")
+
+    traces = [json.loads(line) for line in (tmp_path / "traces.jsonl").read_text().splitlines()]
+    assert [t["name"] for t in traces] == ["discover", "extract", "extract"]
+    root = traces[0]
+    assert root["attributes"] == {"provider": "https://acme.org", "link": "acme-aba.com"}
+    assert root["children"][0]["name"] == "http.get"
+    assert root["children"][0]["attributes"]["status"] == 200
+    assert traces[2]["error"] == "ValueError: boom"
+    assert telemetry.total("span_errors_total", span="extract") == 1
+    assert telemetry.summary()["extract"]["count"] == 2
+
+
+def test_llm_tokens_and_cost():
+    telemetry = Telemetry()
+    with telemetry.span("llm.request") as span:
+        telemetry.llm("openai/gpt-4o-mini", 1_000_000, 100_000, path="graph", estimated=True)
+    telemetry.llm("unknown-model", 10, 5, path="batch")
+
+    assert telemetry.total("llm_cost_usd_total", model="gpt-4o-mini") == pytest.approx(0.21)
+    assert telemetry.total("llm_cost_usd_total", model="unknown-model") == 0
+    assert telemetry.total("llm_tokens_total", kind="prompt") == 1_000_010
+    assert telemetry.total("llm_requests_total") == 2
+    assert span["attributes"]["tokens_estimated"] is True
+
+
+def test_exports_json_and_prometheus(tmp_path):
+    telemetry = Telemetry(buckets=(0.1, 1))
+    telemetry.count("fetch_total", source='we"ird')
+    telemetry.observe("span_seconds", 0.5, span="http.get")
+    telemetry.export(tmp_path)
+
+    prom = (tmp_path / "metrics.prom").read_text()
+    assert "# TYPE aba_fetch_total counter" in prom
+    assert 'aba_fetch_total{source="we\\"ird"} 1' in prom
+    assert 'aba_span_seconds_bucket{span="http.get",le="0.1"} 0' in prom
+    assert 'aba_span_seconds_bucket{span="http.get",le="1"} 1' in prom
+    assert 'aba_span_seconds_bucket{span="http.get",le="+Inf"} 1' in prom
+    assert 'aba_span_seconds_count{span="http.get"} 1' in prom
+
+    data = json.loads((tmp_path / "metrics.json").read_text())
+    histogram = data["histograms"]["span_seconds"][0]
+    assert histogram["labels"] == {"span": "http.get"}
+    assert histogram["buckets"] == {"0.1": 0, "1": 1, "+Inf": 0}
+    assert data["counters"]["fetch_total"] == [{"labels": {"source": 'we"ird'}, "value": 1}]
@@ -0,0 +1,149 @@
+import multiprocessing
+import sqlite3
+import time
+
+from scrapper.workQueue import STATUS_DONE, STATUS_FAILED, STATUS_PENDING, WorkQueue
+
+
+def make_queue(tmp_path, worker_id, **kwargs):
+    return WorkQueue(tmp_path / "queue.sqlite", worker_id=worker_id, **kwargs)
+
+
+def test_enqueue_is_idempotent(tmp_path):
+    queue = make_queue(tmp_path, "a")
+    assert queue.enqueue("discover", [("u1", {"Url": "u1"}), ("u2", {"Url": "u2"})]) == 2
+    assert queue.enqueue("discover", [("u1", {"Url": "u1"}), ("u3", {"Url": "u3"})]) == 1
+    assert queue.counts("discover")[STATUS_PENDING] == 3
+
+
+def test_workers_never_claim_the_same_task(tmp_path):
+    first = make_queue(tmp_path, "a")
+    second = make_queue(tmp_path, "b")
+    first.enqueue("extract", [(f"site{i}", {}) for i in range(5)])
+
+    claimed_a = first.claim("extract", limit=3)
+    claimed_b = second.claim("extract", limit=3)
+    assert [t["key"] for t in claimed_a] == ["site0", "site1", "site2"]
+    assert [t["key"] for t in claimed_b] == ["site3", "site4"]
+    assert second.claim("extract") == []
+
+    # Only the lease owner can complete a task
+    assert not second.complete("extract", "site0", 1)
+    assert first.complete("extract", "site0", {"members": 4})
+    assert first.result("extract", "site0") == {"members": 4}
+
+
+def test_expired_leases_are_requeued(tmp_path):
+    crashed = make_queue(tmp_path, "crashed", lease_seconds=0.05)
+    survivor = make_queue(tmp_path, "survivor", lease_seconds=0.05)
+    crashed.enqueue("discover", [("u1", {"Url": "u1"})])
+
+    assert crashed.claim("discover")[0]["attempts"] == 1
+    assert survivor.claim("discover") == []
+    assert not survivor.drained("discover")
+    time.sleep(0.1)
+
+    task = survivor.claim("discover")[0]
+    assert task["attempts"] == 2 and task["payload"] == {"Url": "u1"}
+    # The crashed worker lost its lease
+    assert not crashed.heartbeat("discover", "u1")
+    assert survivor.complete("discover", "u1", "ok")
+    assert survivor.drained("discover")
+
+
+def test_keep_alive_holds_the_lease(tmp_path):
+    worker = make_queue(tmp_path, "a", lease_seconds=0.15)
+    other = make_queue(tmp_path, "b", lease_seconds=0.15)
+    worker.enqueue("extract", [("site", {})])
+    worker.claim("extract")
+    with worker.keep_alive("extract", ["site"]):
+        time.sleep(0.4)
+        assert other.claim("extract") == []
+    assert worker.complete("extract", "site")
+
+
+def test_failures_are_retried_up_to_max_attempts(tmp_path):
+    queue = make_queue(tmp_path, "a", max_attempts=2)
+    queue.enqueue("discover", [("u1", {})])
+
+    queue.claim("discover")
+    assert queue.fail("discover", "u1", "timeout")
+    assert queue.counts("discover")[STATUS_PENDING] == 1
+
+    queue.claim("discover")
+    assert queue.fail("discover", "u1", "no website found", {"Link": ""})
+    assert queue.counts("discover")[STATUS_FAILED] == 1
+    assert queue.claim("discover") == []
+    assert queue.drained("discover")
+    assert queue.result("discover", "u1") == {"Link": ""}
+
+
+def test_fail_counts_the_attempts_of_the_current_lease(tmp_path):
+    stale = make_queue(tmp_path, "stale", lease_seconds=0.05, max_attempts=2)
+    current = make_queue(tmp_path, "current", lease_seconds=0.05, max_attempts=2)
+    stale.enqueue("discover", [("u1", {})])
+    stale.claim("discover")
+    time.sleep(0.1)
+    current.claim("discover")
+
+    # The expired lease cannot fail the task; its new owner exhausts the attempts
+    assert not stale.fail("discover", "u1", "timeout")
+    assert current.fail("discover", "u1", "timeout")
+    assert current.counts("discover")[STATUS_FAILED] == 1
+
+
+def test_queue_uses_the_rollback_journal(tmp_path):
+    # WAL only works on one host; a shared queue file must not switch to it
+    make_queue(tmp_path, "a").close()
+    with sqlite3.connect(tmp_path / "queue.sqlite") as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+
+
+def test_requeue_reopens_finished_tasks(tmp_path):
+    queue = make_queue(tmp_path, "a", max_attempts=1)
+    queue.enqueue("extract", [("done.com", {}), ("failed.com", {}), ("busy.com", {})])
+    queue.claim("extract", limit=3)
+    queue.complete("extract", "done.com", 4)
+    queue.fail("extract", "failed.com", "timeout")
+
+    # A plain enqueue keeps finished tasks finished
+    assert queue.enqueue("extract", [("done.com", {})]) == 0
+    keys = [("done.com", {"url": "https://done.com"}), ("failed.com", {}), ("busy.com", {})]
+    assert queue.enqueue("extract", keys, requeue=True) == 2
+
+    claimed = queue.claim("extract", limit=3)
+    assert sorted(task["key"] for task in claimed) == ["done.com", "failed.com"]
+    assert claimed[0]["attempts"] == 1
+    assert {task["key"]: task["payload"] for task in claimed}["done.com"] == {"url": "https://done.com"}
+
+
+def claim_all(path, worker_id, results):
+    queue = WorkQueue(path, worker_id=worker_id)
+    while True:
+        tasks = queue.claim("work", limit=2)
+        if not tasks:
+            break
+        for task in tasks:
+            queue.complete("work", task["key"], worker_id)
+            results.put(task["key"])
+    queue.close()
+
+
+def test_processes_share_a_queue(tmp_path):
+    path = tmp_path / "queue.sqlite"
+    queue = WorkQueue(path, worker_id="main")
+    queue.enqueue("work", [(str(i), i) for i in range(40)])
+
+    results = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(target=claim_all, args=(str(path), f"w{i}", results))
+        for i in range(3)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=30)
+
+    keys = [results.get(timeout=5) for _ in range(40)]
+    assert sorted(keys, key=int) == [str(i) for i in range(40)]
+    assert queue.counts("work")[STATUS_DONE] == 40